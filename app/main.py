@@ -1,20 +1,32 @@
 import logging
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from app.routers import (
     cities_router,
     datasets_router,
+    debug_router,
     indicators_router,
+    internal_router,
     interventions_router,
     layers_router,
     projects_router,
     scenarios_router,
 )
+from app.services.readiness_service import prewarm
+from app.utils.airtable_clients import close_airtable_clients, get_airtable_clients
+from app.utils.executor import upstream_executor
+from app.utils.flight_recorder import flight_recorder
+from app.utils.metrics import HTTP_REQUEST_DURATION, mark_process_dead, render_metrics
 from app.utils.settings import Settings
+from app.utils.snapshot import snapshot_cache
+from app.utils.snapshot_store import load_latest_snapshot
+from app.utils.telemetry import start_request_timings
 
 # ----------------------------------------
 # Load settings
@@ -52,6 +64,28 @@ logger.debug(
 # Application Initialization
 # ----------------------------------------
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Open the shared Airtable clients before serving so the first request does
+    # not pay for building them.
+    get_airtable_clients()
+    # Serve from the newest on-disk snapshot while the cache refreshes from
+    # Airtable in the background.
+    if snapshot_cache.enabled and settings.airtable_snapshot_dir:
+        load_latest_snapshot(settings.airtable_snapshot_dir)
+    # Load every snapshot and view in the background; /health/ready reports
+    # when it is done.
+    if snapshot_cache.enabled:
+        prewarm.start()
+    yield
+    await prewarm.stop()
+    # Let in-flight fetches finish before their clients are closed.
+    upstream_executor.shutdown()
+    await close_airtable_clients()
+    mark_process_dead()
+
+
 app = FastAPI(
     title="WRI Cities Indicators API",
     description="You can use this API to get the value of various indicators for a number of cities at multiple admin levels.",
@@ -67,6 +101,7 @@ app = FastAPI(
         "name": "License TBD",
         "url": "https://opensource.org/licenses/",
     },
+    lifespan=lifespan,
 )
 
 # ----------------------------------------
@@ -82,8 +117,17 @@ app.add_middleware(
 @app.middleware("http")
 async def timing_middleware(request, call_next):
     start = time.perf_counter()
+    timings = start_request_timings()
     response = await call_next(request)
-    duration_ms = (time.perf_counter() - start) * 1000
+    duration = time.perf_counter() - start
+    duration_ms = duration * 1000
+    # Label by route template, so path parameters do not multiply the series.
+    route = request.scope.get("route")
+    HTTP_REQUEST_DURATION.labels(
+        request.method,
+        getattr(route, "path", "unmatched"),
+        str(getattr(response, "status_code", "-")),
+    ).observe(duration)
     logger.debug(
         "HTTP %s %s -> %s in %.2f ms",
         request.method,
@@ -93,8 +137,20 @@ async def timing_middleware(request, call_next):
     )
     try:
         response.headers["X-Process-Time-ms"] = f"{duration_ms:.2f}"
+        if settings.server_timing_enabled:
+            timings.add("total", duration_ms)
+            response.headers["Server-Timing"] = timings.server_timing()
     except Exception:
         pass
+    if settings.debug_endpoints_enabled:
+        flight_recorder.observe(
+            request.method,
+            request.url.path,
+            request.url.query,
+            getattr(response, "status_code", 0),
+            duration_ms,
+            timings,
+        )
     return response
 
 
@@ -113,6 +169,9 @@ app.include_router(
     tags=["Interventions"],
 )
 app.include_router(scenarios_router.router, prefix="/scenarios", tags=["Scenarios"])
+app.include_router(internal_router.router, prefix="/internal", include_in_schema=False)
+if settings.debug_endpoints_enabled:
+    app.include_router(debug_router.router, prefix="/debug", include_in_schema=False)
 
 
 @app.get(
@@ -132,6 +191,53 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get(
+    "/health/ready",
+    tags=["Default"],
+    responses={
+        200: {
+            "description": "The data is loaded and recent enough to serve",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "ready",
+                        "max_age_seconds": 3600.0,
+                        "tables": {
+                            "Cities": {
+                                "records": 120,
+                                "entries": 2,
+                                "age_seconds": 42.5,
+                            }
+                        },
+                    }
+                }
+            },
+        },
+        503: {"description": "The instance is warming up or its data is stale"},
+    },
+)
+async def readiness_check():
+    """
+    Readiness probe: succeeds only once the startup warm-up loaded the data and
+    every loaded table is younger than the configured max age.
+    """
+    readiness = prewarm.readiness()
+    if readiness["status"] in {"failed", "stale"}:
+        # Warm up again, so an instance that fell behind recovers on its own.
+        prewarm.start()
+    return JSONResponse(
+        readiness, status_code=200 if readiness["status"] == "ready" else 503
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus metrics of every worker process.
+    """
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/", include_in_schema=False)
 async def docs_redirect():
     return RedirectResponse(url="/docs")
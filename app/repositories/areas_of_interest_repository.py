@@ -1,32 +1,50 @@
-from typing import Optional
+from typing import List, Optional
 
-from pyairtable import Api
-from ratelimit import limits, sleep_and_retry
-
-from app.utils.settings import Settings
+from app.utils.airtable_clients import airtable_async_client, airtable_table
+from app.utils.singleflight import coalesce
+from app.utils.snapshot import snapshot
 from app.utils.telemetry import timed
 
-# Load settings
-settings = Settings()
 
-# Airtable tables
-airtable_api = Api(settings.cities_api_airtable_key)
-aoi_table = airtable_api.table(settings.airtable_base_id, "Areas_of_interest")
+@snapshot("Areas_of_interest")
+@coalesce("Areas_of_interest")
+@timed
+def fetch_areas_of_interest(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Areas_of_interest").all(
+        view="all", formula=filter_formula, fields=fields
+    )
+
+
+@snapshot("Areas_of_interest", op="first")
+@coalesce("Areas_of_interest", op="first")
+@timed
+def fetch_first_area_of_interest(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Areas_of_interest").first(
+        view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Areas_of_interest")
+@coalesce("Areas_of_interest")
 @timed
-def fetch_areas_of_interest(filter_formula: Optional[str] = None):
-    return aoi_table.all(view="all", formula=filter_formula)
+async def fetch_areas_of_interest_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().all(
+        "Areas_of_interest", view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Areas_of_interest", op="first")
+@coalesce("Areas_of_interest", op="first")
 @timed
-def fetch_first_area_of_interest(filter_formula: Optional[str] = None):
-    return aoi_table.first(view="all", formula=filter_formula)
+async def fetch_first_area_of_interest_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().first(
+        "Areas_of_interest", view="all", formula=filter_formula, fields=fields
+    )
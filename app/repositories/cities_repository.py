@@ -1,32 +1,50 @@
-from typing import Optional
+from typing import List, Optional
 
-from pyairtable import Api
-from ratelimit import limits, sleep_and_retry
-
-from app.utils.settings import Settings
+from app.utils.airtable_clients import airtable_async_client, airtable_table
+from app.utils.singleflight import coalesce
+from app.utils.snapshot import snapshot
 from app.utils.telemetry import timed
 
-# Load settings
-settings = Settings()
 
-# Airtable tables
-airtable_api = Api(settings.cities_api_airtable_key)
-cities_table = airtable_api.table(settings.airtable_base_id, "Cities")
+@snapshot("Cities")
+@coalesce("Cities")
+@timed
+def fetch_cities(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Cities").all(
+        view="all", formula=filter_formula, fields=fields
+    )
+
+
+@snapshot("Cities", op="first")
+@coalesce("Cities", op="first")
+@timed
+def fetch_first_city(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Cities").first(
+        view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Cities")
+@coalesce("Cities")
 @timed
-def fetch_cities(filter_formula: Optional[str] = None):
-    return cities_table.all(view="all", formula=filter_formula)
+async def fetch_cities_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().all(
+        "Cities", view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Cities", op="first")
+@coalesce("Cities", op="first")
 @timed
-def fetch_first_city(filter_formula: Optional[str] = None):
-    return cities_table.first(view="all", formula=filter_formula)
+async def fetch_first_city_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().first(
+        "Cities", view="all", formula=filter_formula, fields=fields
+    )
@@ -1,32 +1,50 @@
-from typing import Optional
+from typing import List, Optional
 
-from pyairtable import Api
-from ratelimit import limits, sleep_and_retry
-
-from app.utils.settings import Settings
+from app.utils.airtable_clients import airtable_async_client, airtable_table
+from app.utils.singleflight import coalesce
+from app.utils.snapshot import snapshot
 from app.utils.telemetry import timed
 
-# Load settings
-settings = Settings()
 
-# Airtable tables
-airtable_api = Api(settings.cities_api_airtable_key)
-indicators_table = airtable_api.table(settings.airtable_base_id, "Indicators")
+@snapshot("Indicators")
+@coalesce("Indicators")
+@timed
+def fetch_indicators(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Indicators").all(
+        view="all", formula=filter_formula, fields=fields
+    )
+
+
+@snapshot("Indicators", op="first")
+@coalesce("Indicators", op="first")
+@timed
+def fetch_first_indicator(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Indicators").first(
+        view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Indicators")
+@coalesce("Indicators")
 @timed
-def fetch_indicators(filter_formula: Optional[str] = None):
-    return indicators_table.all(view="all", formula=filter_formula)
+async def fetch_indicators_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().all(
+        "Indicators", view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Indicators", op="first")
+@coalesce("Indicators", op="first")
 @timed
-def fetch_first_indicator(filter_formula: Optional[str] = None):
-    return indicators_table.first(view="all", formula=filter_formula)
+async def fetch_first_indicator_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().first(
+        "Indicators", view="all", formula=filter_formula, fields=fields
+    )
@@ -1,32 +1,50 @@
-from typing import Optional
+from typing import List, Optional
 
-from pyairtable import Api
-from ratelimit import limits, sleep_and_retry
-
-from app.utils.settings import Settings
+from app.utils.airtable_clients import airtable_async_client, airtable_table
+from app.utils.singleflight import coalesce
+from app.utils.snapshot import snapshot
 from app.utils.telemetry import timed
 
-# Load settings
-settings = Settings()
 
-# Airtable tables
-airtable_api = Api(settings.cities_api_airtable_key)
-interventions_table = airtable_api.table(settings.airtable_base_id, "Interventions")
+@snapshot("Interventions")
+@coalesce("Interventions")
+@timed
+def fetch_interventions(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Interventions").all(
+        view="all", formula=filter_formula, fields=fields
+    )
+
+
+@snapshot("Interventions", op="first")
+@coalesce("Interventions", op="first")
+@timed
+def fetch_first_intervention(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Interventions").first(
+        view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Interventions")
+@coalesce("Interventions")
 @timed
-def fetch_interventions(filter_formula: Optional[str] = None):
-    return interventions_table.all(view="all", formula=filter_formula)
+async def fetch_interventions_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().all(
+        "Interventions", view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Interventions", op="first")
+@coalesce("Interventions", op="first")
 @timed
-def fetch_first_intervention(filter_formula: Optional[str] = None):
-    return interventions_table.first(view="all", formula=filter_formula)
+async def fetch_first_intervention_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().first(
+        "Interventions", view="all", formula=filter_formula, fields=fields
+    )
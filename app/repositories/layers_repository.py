@@ -1,32 +1,50 @@
-from typing import Optional
+from typing import List, Optional
 
-from pyairtable import Api
-from ratelimit import limits, sleep_and_retry
-
-from app.utils.settings import Settings
+from app.utils.airtable_clients import airtable_async_client, airtable_table
+from app.utils.singleflight import coalesce
+from app.utils.snapshot import snapshot
 from app.utils.telemetry import timed
 
-# Load settings
-settings = Settings()
 
-# Airtable tables
-airtable_api = Api(settings.cities_api_airtable_key)
-layers_table = airtable_api.table(settings.airtable_base_id, "Layers")
+@snapshot("Layers")
+@coalesce("Layers")
+@timed
+def fetch_layers(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Layers").all(
+        view="all", formula=filter_formula, fields=fields
+    )
+
+
+@snapshot("Layers", op="first")
+@coalesce("Layers", op="first")
+@timed
+def fetch_first_layer(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Layers").first(
+        view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Layers")
+@coalesce("Layers")
 @timed
-def fetch_layers(filter_formula: Optional[str] = None):
-    return layers_table.all(view="all", formula=filter_formula)
+async def fetch_layers_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().all(
+        "Layers", view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Layers", op="first")
+@coalesce("Layers", op="first")
 @timed
-def fetch_first_layer(filter_formula: Optional[str] = None):
-    return layers_table.first(view="all", formula=filter_formula)
+async def fetch_first_layer_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().first(
+        "Layers", view="all", formula=filter_formula, fields=fields
+    )
@@ -1,23 +1,28 @@
-from typing import Optional
+from typing import List, Optional
 
-from pyairtable import Api
-from ratelimit import limits, sleep_and_retry
-
-from app.utils.settings import Settings
+from app.utils.airtable_clients import airtable_async_client, airtable_table
+from app.utils.singleflight import coalesce
+from app.utils.snapshot import snapshot
 from app.utils.telemetry import timed
 
-# Load settings
-settings = Settings()
 
-# Airtable tables
-airtable_api = Api(settings.cities_api_airtable_key)
-projects_table = airtable_api.table(settings.airtable_base_id, "Projects")
+@snapshot("Projects")
+@coalesce("Projects")
+@timed
+def fetch_projects(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Projects").all(
+        view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Projects")
+@coalesce("Projects")
 @timed
-def fetch_projects(filter_formula: Optional[str] = None):
-    return projects_table.all(view="all", formula=filter_formula)
+async def fetch_projects_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().all(
+        "Projects", view="all", formula=filter_formula, fields=fields
+    )
@@ -1,44 +1,72 @@
-from typing import Optional
+from typing import List, Optional
 
-from pyairtable import Api
-from ratelimit import limits, sleep_and_retry
-
-from app.utils.settings import Settings
+from app.utils.airtable_clients import airtable_async_client, airtable_table
+from app.utils.singleflight import coalesce
+from app.utils.snapshot import snapshot
 from app.utils.telemetry import timed
 
-# Load settings
-settings = Settings()
 
-# Airtable tables
-airtable_api = Api(settings.cities_api_airtable_key)
-scenarios_table = airtable_api.table(settings.airtable_base_id, "Scenarios")
-indicator_values_table = airtable_api.table(
-    settings.airtable_base_id, "Indicators_values"
-)
+@snapshot("Scenarios")
+@coalesce("Scenarios")
+@timed
+def fetch_scenarios(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Scenarios").all(
+        view="all", formula=filter_formula, fields=fields
+    )
+
+
+@snapshot("Scenarios", op="first")
+@coalesce("Scenarios", op="first")
+@timed
+def fetch_first_scenario(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Scenarios").first(
+        view="all", formula=filter_formula, fields=fields
+    )
+
+
+@snapshot("Indicators_values")
+@coalesce("Indicators_values")
+@timed
+def fetch_indicator_values(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return airtable_table("Indicators_values").all(
+        view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Scenarios")
+@coalesce("Scenarios")
 @timed
-def fetch_scenarios(filter_formula: Optional[str] = None):
-    return scenarios_table.all(view="all", formula=filter_formula)
+async def fetch_scenarios_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().all(
+        "Scenarios", view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Scenarios", op="first")
+@coalesce("Scenarios", op="first")
 @timed
-def fetch_first_scenario(filter_formula: Optional[str] = None):
-    return scenarios_table.first(view="all", formula=filter_formula)
+async def fetch_first_scenario_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().first(
+        "Scenarios", view="all", formula=filter_formula, fields=fields
+    )
 
 
-@sleep_and_retry
-@limits(
-    calls=settings.airtable_rate_limit_calls, period=settings.airtable_rate_limit_period
-)
+@snapshot("Indicators_values")
+@coalesce("Indicators_values")
 @timed
-def fetch_indicator_values(filter_formula: Optional[str] = None):
-    return indicator_values_table.all(view="all", formula=filter_formula)
+async def fetch_indicator_values_async(
+    filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+):
+    return await airtable_async_client().all(
+        "Indicators_values", view="all", formula=filter_formula, fields=fields
+    )
@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import Depends, HTTPException, Path, Query, Response
 
 from app.const import (
     COMMON_200_SUCCESSFUL_RESPONSE,
@@ -13,12 +13,14 @@ from app.schemas.cities_schema import City, CityList
 from app.schemas.common_schema import ApplicationIdParam
 from app.services import cities_service
 from app.utils.dependencies import validate_query_params
-from app.utils.utilities import cleanup_spaces_in_response
+from app.utils.http_cache import cached_router
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = cached_router(
+    "cities", "Cities", "Projects", "Indicators_values", "Areas_of_interest"
+)
 
 
 @router.get(
@@ -34,7 +36,7 @@ router = APIRouter()
         500: COMMON_500_ERROR_RESPONSE,
     },
 )
-def list_cities(
+async def list_cities(
     application_id: ApplicationIdParam = Query(None),
     projects: Optional[List[str]] = Query(None),
     country_code_iso3: Optional[str] = Query(None),
@@ -56,7 +58,7 @@ def list_cities(
         - 500: If an error occurs during the retrieval process.
     """
     try:
-        cities_list = cities_service.list_cities(
+        cities_list = await cities_service.get_city_list_document_async(
             application_id, projects, country_code_iso3
         )
     except Exception as e:
@@ -68,8 +70,8 @@ def list_cities(
     if not cities_list:
         raise HTTPException(status_code=404, detail="No cities found")
 
-    return_dict = cleanup_spaces_in_response({"cities": cities_list})
-    return return_dict
+    # The city lists are serialized when they are materialized.
+    return Response(content=cities_list, media_type="application/json")
 
 
 @router.get(
@@ -83,7 +85,7 @@ def list_cities(
         500: COMMON_500_ERROR_RESPONSE,
     },
 )
-def get_city_by_city_id(
+async def get_city_by_city_id(
     application_id: ApplicationIdParam = Query(None),
     city_id: str = Path(),
 ):
@@ -102,7 +104,7 @@ def get_city_by_city_id(
         - 500: If an error occurs during the retrieval process.
     """
     try:
-        city = cities_service.get_city_by_city_id(application_id, city_id)
+        city = await cities_service.get_city_document_async(application_id, city_id)
     except Exception as e:
         logger.exception("An error occurred: %s", e, exc_info=True)
         raise HTTPException(
@@ -113,4 +115,5 @@ def get_city_by_city_id(
     if not city:
         raise HTTPException(status_code=404, detail="No city found")
 
-    return cleanup_spaces_in_response(city)
+    # The document is serialized when it is materialized.
+    return Response(content=city, media_type="application/json")
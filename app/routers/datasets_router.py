@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import Depends, HTTPException, Query
 
 from app.const import (
     COMMON_200_SUCCESSFUL_RESPONSE,
@@ -12,12 +12,13 @@ from app.schemas.common_schema import ApplicationIdParam
 from app.schemas.datasets_schema import DatasetsResponse
 from app.services import datasets_service
 from app.utils.dependencies import validate_query_params
-from app.utils.utilities import cleanup_spaces_in_response
+from app.utils.http_cache import cached_router
+from app.utils.utilities import ORJSONResponse
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = cached_router("datasets", "Datasets", "Cities", "Indicators", "Layers")
 
 
 @router.get(
@@ -31,7 +32,7 @@ router = APIRouter()
         500: COMMON_500_ERROR_RESPONSE,
     },
 )
-def list_datasets(
+async def list_datasets(
     application_id: ApplicationIdParam = Query(None),
     city_id: Optional[str] = Query(None),
     layer_id: Optional[List[str]] = Query(None),
@@ -56,7 +57,9 @@ def list_datasets(
         - 500: If an error occurs during the retrieval process.
     """
     try:
-        datasets = datasets_service.list_datasets(application_id, city_id, layer_id)
+        datasets = await datasets_service.list_datasets_async(
+            application_id, city_id, layer_id
+        )
     except Exception as e:
         logger.exception("An error occurred: %s", e, exc_info=True)
         raise HTTPException(
@@ -64,5 +67,4 @@ def list_datasets(
             detail="An error occurred: Retrieving the list of datasets failed.",
         ) from e
 
-    return_dict = cleanup_spaces_in_response({"datasets": datasets})
-    return return_dict
+    return ORJSONResponse({"datasets": datasets})
@@ -0,0 +1,57 @@
+import logging
+
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from app.utils.flight_recorder import flight_recorder
+from app.utils.telemetry import function_timings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/timings")
+def get_timings(reset: bool = Query(False)):
+    """
+    Latency percentiles of every ``@timed`` function since the last reset.
+
+    ### Args:
+    - **reset** (`bool`): Clear the histograms after reading them, so the next
+      call covers a fresh interval.
+
+    ### Returns:
+    - Count, sum, mean, p50, p90, p99 and max in milliseconds per function,
+      keyed by qualified name, and the time the interval started.
+    """
+    return function_timings.stats(reset=reset)
+
+
+@router.delete("/timings", status_code=204)
+def reset_timings():
+    """
+    Clear the latency histograms of the ``@timed`` functions.
+    """
+    function_timings.reset()
+
+
+@router.get("/slow-requests")
+def get_slow_requests(limit: Optional[int] = Query(None, ge=1)):
+    """
+    Traces of the last requests slower than the configured threshold.
+
+    ### Args:
+    - **limit** (`Optional[int]`): Return at most this many traces.
+
+    ### Returns:
+    - The traces, newest first: the request, its status and duration, the time
+      summed per span, and every span in start order with its offset. Airtable
+      spans carry the table, formula, status, bytes and rate limiter wait of
+      each page; repository spans the table and formula of each fetch call.
+    """
+    return {
+        "threshold_ms": flight_recorder.threshold_ms,
+        "traces": flight_recorder.traces(limit),
+    }
@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import Depends, HTTPException, Path, Query
 
 from app.const import (
     COMMON_200_SUCCESSFUL_RESPONSE,
@@ -17,12 +17,15 @@ from app.schemas.indicators_schema import (
 )
 from app.services import indicators_service
 from app.utils.dependencies import validate_query_params
-from app.utils.utilities import cleanup_spaces_in_response
+from app.utils.http_cache import cached_router
+from app.utils.utilities import ORJSONResponse
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = cached_router(
+    "indicators", "Indicators", "Cities", "Datasets", "Layers", "Projects"
+)
 
 
 @router.get(
@@ -42,7 +45,7 @@ router = APIRouter()
         500: COMMON_500_ERROR_RESPONSE,
     },
 )
-def list_indicators(
+async def list_indicators(
     application_id: ApplicationIdParam = Query(None),
     project: Optional[str] = Query(None),
     city_id: Optional[List[str]] = Query(None),
@@ -68,7 +71,7 @@ def list_indicators(
         - 500: If an error occurs during the retrieval process.
     """
     try:
-        indicators_list = indicators_service.list_indicators(
+        indicators_list = await indicators_service.list_indicators_async(
             application_id, project, city_id
         )
     except Exception as e:
@@ -81,8 +84,7 @@ def list_indicators(
     if not indicators_list:
         raise HTTPException(status_code=404, detail="No indicators found")
 
-    return_dict = cleanup_spaces_in_response({"indicators": indicators_list})
-    return return_dict
+    return ORJSONResponse({"indicators": indicators_list})
 
 
 @router.get(
@@ -113,8 +115,7 @@ def list_indicators_themes():
             detail="An error occurred: Retrieving the list of indicator themes failed.",
         ) from e
 
-    return_dict = cleanup_spaces_in_response({"themes": themes})
-    return return_dict
+    return ORJSONResponse({"themes": sorted(themes)})
 
 
 @router.get(
@@ -164,5 +165,4 @@ def get_metadata_by_indicator_id(
     if not indicators_metadata_list:
         raise HTTPException(status_code=404, detail="No indicators metadata found")
 
-    return_dict = cleanup_spaces_in_response(indicators_metadata_list)
-    return return_dict
+    return ORJSONResponse(indicators_metadata_list)
@@ -0,0 +1,61 @@
+import logging
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from pyairtable.models import WebhookNotification
+
+from app.utils.airtable_webhooks import airtable_webhooks
+from app.utils.settings import Settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+router = APIRouter()
+
+
+def _process_webhook(webhook_id: str) -> None:
+    try:
+        airtable_webhooks.process(webhook_id)
+    except Exception as e:
+        # The cursor did not move, so the next notification retries the payloads.
+        logger.exception("Processing webhook %s failed: %s", webhook_id, e)
+
+
+@router.post("/airtable/webhook", status_code=200)
+async def airtable_webhook(request: Request, background_tasks: BackgroundTasks):
+    """
+    Receive an Airtable webhook notification and refresh the changed tables.
+
+    The notification is authenticated with the webhook's MAC secret and
+    acknowledged right away; its payloads are read and applied to the snapshot
+    cache in the background.
+
+    Returns:
+        dict: An acknowledgement of the notification.
+
+    Raises:
+        HTTPException:
+        - 404: If no webhook MAC secret is configured.
+        - 401: If the notification fails MAC validation.
+    """
+    if not settings.airtable_webhook_mac_secret:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    body = await request.body()
+    try:
+        notification = WebhookNotification.from_request(
+            body.decode("utf-8"),
+            request.headers.get("X-Airtable-Content-MAC", ""),
+            settings.airtable_webhook_mac_secret,
+        )
+    except ValueError as e:
+        logger.warning("Rejected Airtable webhook notification: %s", e)
+        raise HTTPException(status_code=401, detail="Invalid notification") from e
+
+    if notification.base.id != settings.airtable_base_id:
+        logger.warning("Ignored webhook notification for base %s", notification.base.id)
+        return {"status": "ignored"}
+
+    background_tasks.add_task(_process_webhook, notification.webhook.id)
+    return {"status": "accepted"}
@@ -1,6 +1,6 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import HTTPException, Path
 
 from app.const import (
     COMMON_200_SUCCESSFUL_RESPONSE,
@@ -10,12 +10,13 @@ from app.const import (
 )
 from app.schemas.interventions_schema import InterventionList
 from app.services import interventions_service
-from app.utils.utilities import cleanup_spaces_in_response
+from app.utils.http_cache import cached_router
+from app.utils.utilities import ORJSONResponse
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = cached_router("interventions", "Interventions", "Scenarios", "Cities")
 
 
 @router.get(
@@ -50,8 +51,7 @@ def list_interventions():
     if not interventions_list:
         raise HTTPException(status_code=404, detail="No interventions found")
 
-    return_dict = cleanup_spaces_in_response({"interventions": interventions_list})
-    return return_dict
+    return ORJSONResponse({"interventions": interventions_list})
 
 
 @router.get(
@@ -95,5 +95,4 @@ def get_city_by_city_id(
     if not interventions_list:
         raise HTTPException(status_code=404, detail="No interventions found")
 
-    return_dict = cleanup_spaces_in_response({"interventions": interventions_list})
-    return return_dict
+    return ORJSONResponse({"interventions": interventions_list})
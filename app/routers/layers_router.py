@@ -1,7 +1,7 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import Depends, HTTPException, Path, Query
 
 from app.const import (
     COMMON_200_SUCCESSFUL_RESPONSE,
@@ -11,12 +11,13 @@ from app.const import (
 from app.schemas.layers_schema import LayerResponse
 from app.services import layers_service
 from app.utils.dependencies import validate_query_params
-from app.utils.utilities import cleanup_spaces_in_response
+from app.utils.http_cache import cached_router
+from app.utils.utilities import ORJSONResponse
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = cached_router("layers", "Layers", "Cities")
 
 
 @router.get(
@@ -80,5 +81,4 @@ def get_layer(
     if not layer:
         raise HTTPException(status_code=404, detail="No layer found")
 
-    return_dict = cleanup_spaces_in_response(layer)
-    return return_dict
+    return ORJSONResponse(layer)
@@ -1,6 +1,6 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import HTTPException, Query
 
 from app.const import (
     COMMON_200_SUCCESSFUL_RESPONSE,
@@ -11,12 +11,13 @@ from app.const import (
 from app.schemas.common_schema import ApplicationIdParam
 from app.schemas.projects_schema import ListProjectsResponse
 from app.services import projects_service
-from app.utils.utilities import cleanup_spaces_in_response
+from app.utils.http_cache import cached_router
+from app.utils.utilities import ORJSONResponse
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = cached_router("projects", "Projects")
 
 
 @router.get(
@@ -60,5 +61,4 @@ def list_projects(
     if not projects_list:
         raise HTTPException(status_code=404, detail="No projects found")
 
-    return_dict = cleanup_spaces_in_response({"projects": projects_list})
-    return return_dict
+    return ORJSONResponse({"projects": projects_list})
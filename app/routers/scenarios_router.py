@@ -1,20 +1,29 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import HTTPException, Path
 
 from app.services import scenarios_service
-from app.utils.utilities import cleanup_spaces_in_response
+from app.utils.http_cache import cached_router
+from app.utils.utilities import ORJSONResponse
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = cached_router(
+    "scenarios",
+    "Scenarios",
+    "Interventions",
+    "Indicators",
+    "Indicators_values",
+    "Layers",
+    "Cities",
+)
 
 
 @router.get(
     "/{city_id}/{aoi_id}/{intervention_category}",
 )
-def get_scenario_by_city_id_aoi_id_intervention_category(
+async def get_scenario_by_city_id_aoi_id_intervention_category(
     city_id: str = Path(),
     aoi_id: str = Path(),
     intervention_category: str = Path(),
@@ -35,10 +44,8 @@ def get_scenario_by_city_id_aoi_id_intervention_category(
     """
 
     try:
-        scenarios_list = (
-            scenarios_service.get_scenario_by_city_id_aoi_id_intervention_category(
-                city_id, aoi_id, intervention_category
-            )
+        scenarios_list = await scenarios_service.get_scenario_by_city_id_aoi_id_intervention_category_async(
+            city_id, aoi_id, intervention_category
         )
     except Exception as e:
         logger.exception("An error occurred: %s", e, exc_info=True)
@@ -50,5 +57,4 @@ def get_scenario_by_city_id_aoi_id_intervention_category(
     if not scenarios_list:
         raise HTTPException(status_code=404, detail="No scenarios found")
 
-    return_dict = cleanup_spaces_in_response(scenarios_list)
-    return return_dict
+    return ORJSONResponse(scenarios_list)
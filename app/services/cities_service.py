@@ -1,18 +1,89 @@
-import itertools
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+from dataclasses import dataclass
+from concurrent.futures import as_completed
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from app.const import CITY_RESPONSE_KEYS
-from app.repositories.areas_of_interest_repository import fetch_areas_of_interest
-from app.repositories.cities_repository import fetch_cities
-from app.repositories.projects_repository import fetch_projects
-from app.repositories.scenarios_repository import fetch_indicator_values
+from app.repositories.areas_of_interest_repository import (
+    fetch_areas_of_interest,
+    fetch_areas_of_interest_async,
+)
+from app.repositories.cities_repository import fetch_cities, fetch_cities_async
+from app.repositories.projects_repository import fetch_projects, fetch_projects_async
+from app.repositories.scenarios_repository import (
+    fetch_indicator_values,
+    fetch_indicator_values_async,
+)
 from app.schemas.common_schema import ApplicationIdParam
-from app.utils.filters import construct_filter_formula, construct_filter_formula_v2
+from app.utils.executor import upstream_executor
+from app.utils.filters import (
+    construct_filter_formula,
+    construct_filter_formula_v2,
+    record_matches_equals,
+    record_matches_search,
+)
+from app.utils.indexes import index_for, index_scope
+from app.utils.materialized import MaterializedView
 from app.utils.settings import Settings
+from app.utils.snapshot import snapshot_cache
 from app.utils.telemetry import timed
+from app.utils.utilities import json_bytes
 
 settings = Settings()
+logger = logging.getLogger(__name__)
+
+# Airtable fields read by this service: the response keys plus the join keys.
+PROJECT_FIELDS = ["id"]
+CITY_FIELDS = CITY_RESPONSE_KEYS
+INDICATOR_VALUE_FIELDS = ["id", "value", "cities_id", "areas_of_interest_id"]
+AOI_FIELDS = ["id", "cities", "bounding_box"]
+# The materialized city views read whole tables and filter by application
+# in memory, so they also need the application columns.
+DOCUMENT_PROJECT_FIELDS = [*PROJECT_FIELDS, "application_id"]
+DOCUMENT_INDICATOR_VALUE_FIELDS = [*INDICATOR_VALUE_FIELDS, "application_id"]
+DOCUMENT_AOI_FIELDS = [*AOI_FIELDS, "application_id"]
+
+CityDocumentKey = Tuple[str, Optional[str]]
+
+
+def _projects_filter_formula(
+    application_id: Optional[ApplicationIdParam], projects: Optional[List[str]]
+) -> str:
+    projects_filters = {}
+    if application_id:
+        projects_filters["application_id"] = application_id.value
+    if projects:
+        projects_filters["id"] = projects
+    return construct_filter_formula(projects_filters)
+
+
+def _city_list_filter_formulas(
+    application_id: Optional[ApplicationIdParam],
+    country_code_iso3: Optional[str],
+    fetched_projects: List[Dict[str, Any]],
+) -> Dict[str, Optional[str]]:
+    # Filter cities based on retrieved projects and country code
+    cities_filters = {}
+    if fetched_projects:
+        cities_filters["projects"] = [
+            project["fields"]["id"] for project in fetched_projects
+        ]
+    if country_code_iso3:
+        cities_filters["country_code_iso3"] = country_code_iso3
+    aoi_filters = {}
+    if application_id:
+        aoi_filters["application_id"] = application_id.value
+
+    return {
+        "cities": construct_filter_formula(cities_filters),
+        "indicator_values": (
+            construct_filter_formula_v2({"application_id": application_id.value})
+            if application_id
+            else None
+        ),
+        "aoi_data": construct_filter_formula_v2(aoi_filters),
+    }
 
 
 @timed
@@ -33,132 +104,173 @@ def list_cities(
         List[Dict[str, Any]]: A list of dictionaries containing the filtered cities' data.
     """
     # Fetch projects based on provided project IDs/application ID if provided
-    projects_filters = {}
-    if application_id:
-        projects_filters["application_id"] = application_id.value
-    if projects:
-        projects_filters["id"] = projects
-    projects_filter_formula = construct_filter_formula(projects_filters)
-    fetched_projects = fetch_projects(projects_filter_formula)
+    fetched_projects = fetch_projects(
+        _projects_filter_formula(application_id, projects), PROJECT_FIELDS
+    )
     if not fetched_projects:
         return None
-    fetched_project_ids = {
-        project["id"]: project["fields"]["id"] for project in fetched_projects
+    formulas = _city_list_filter_formulas(
+        application_id, country_code_iso3, fetched_projects
+    )
+
+    futures = {
+        upstream_executor.submit(
+            fetch_cities, formulas["cities"], CITY_FIELDS
+        ): "cities",
+        upstream_executor.submit(
+            fetch_indicator_values,
+            formulas["indicator_values"],
+            INDICATOR_VALUE_FIELDS,
+        ): "indicator_values",
+        upstream_executor.submit(
+            fetch_areas_of_interest, formulas["aoi_data"], AOI_FIELDS
+        ): "aoi_data",
     }
 
-    # Filter cities based on retrieved projects and country code
-    cities_filters = {}
-    if fetched_project_ids:
-        cities_filters["projects"] = list(fetched_project_ids.values())
-    if country_code_iso3:
-        cities_filters["country_code_iso3"] = country_code_iso3
-    aoi_filters = {}
-    if application_id:
-        aoi_filters["application_id"] = application_id.value
+    results = {}
+    for future in as_completed(futures):
+        func_name = futures[future]
+        results[func_name] = future.result()
 
-    with ThreadPoolExecutor() as executor:
-        futures = {
-            executor.submit(
-                lambda: fetch_cities(construct_filter_formula(cities_filters))
-            ): "cities",
-            executor.submit(
-                lambda: fetch_indicator_values(
-                    construct_filter_formula_v2(
-                        {"application_id": application_id.value}
-                    )
-                    if application_id
-                    else None
-                )
-            ): "indicator_values",
-            executor.submit(
-                lambda: fetch_areas_of_interest(
-                    construct_filter_formula_v2(aoi_filters)
-                )
-            ): "aoi_data",
-        }
+    return _build_city_list(
+        fetched_projects,
+        results["cities"],
+        results["indicator_values"],
+        results["aoi_data"],
+    )
 
-        results = {}
-        for future in as_completed(futures):
-            func_name = futures[future]
-            results[func_name] = future.result()
 
-    cities_list = results["cities"]
-    sorted_indicator_values = sorted(
-        results["indicator_values"],
-        key=lambda x: (x["fields"].get("cities_id", [""])[0]),
+@timed
+async def list_cities_async(
+    application_id: Optional[ApplicationIdParam],
+    projects: Optional[List[str]],
+    country_code_iso3: Optional[str],
+) -> List[Dict[str, Any]]:
+    """
+    Async version of :func:`list_cities` that fetches from Airtable concurrently
+    on the event loop.
+    """
+    fetched_projects = await fetch_projects_async(
+        _projects_filter_formula(application_id, projects), PROJECT_FIELDS
     )
-    grouped_indicator_values = {
-        key: list(group)
-        for key, group in itertools.groupby(
-            sorted_indicator_values, lambda x: x["fields"].get("cities_id", [""])[0]
+    if not fetched_projects:
+        return None
+    formulas = _city_list_filter_formulas(
+        application_id, country_code_iso3, fetched_projects
+    )
+
+    cities, indicator_values, aoi_data = await asyncio.gather(
+        fetch_cities_async(formulas["cities"], CITY_FIELDS),
+        fetch_indicator_values_async(
+            formulas["indicator_values"], INDICATOR_VALUE_FIELDS
+        ),
+        fetch_areas_of_interest_async(formulas["aoi_data"], AOI_FIELDS),
+    )
+    return _build_city_list(fetched_projects, cities, indicator_values, aoi_data)
+
+
+def _indicator_values_by_city(
+    indicator_values: Sequence[Dict[str, Any]],
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Group indicator values as ``{city_id: {aoi_id: {indicator_id: value}}}``.
+
+    AOIs are ordered by id within each city.
+    """
+    grouped: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    with_aoi = (i for i in indicator_values if i["fields"].get("areas_of_interest_id"))
+    for i in sorted(with_aoi, key=lambda x: x["fields"]["areas_of_interest_id"][0]):
+        city_values = grouped.setdefault(i["fields"].get("cities_id", [""])[0], {})
+        aoi_values = city_values.setdefault(i["fields"]["areas_of_interest_id"][0], {})
+        aoi_values[f'{i["fields"]["id"]}'] = (
+            i["fields"]["value"]
+            if i["fields"].get("id") and i["fields"].get("value")
+            else None
         )
+    return grouped
+
+
+def _city_areas_of_interest(
+    city_record_id: str, areas_of_interest_list: List[Dict[str, Any]]
+) -> Tuple[List[str], Dict[str, Any]]:
+    """Return the AOI ids linked to a city record and their bounding boxes."""
+    if not areas_of_interest_list:
+        return [], {}
+    city_aois = (
+        index_for(areas_of_interest_list).group("cities").get(city_record_id, [])
+    )
+    area_of_interests = [aoi["fields"]["id"] for aoi in city_aois]
+    bbox_dict = {
+        aoi["fields"]["id"]: aoi["fields"]["bounding_box"]
+        for aoi in city_aois
+        if "bounding_box" in aoi["fields"]
     }
-    areas_of_interest_list = results["aoi_data"]
+    return area_of_interests, bbox_dict
 
+
+def _project_ids(city_fields: Dict[str, Any], projects: List[Dict[str, Any]]) -> List:
+    """Map a city's linked project records to the ids of the given projects."""
+    return index_for(projects).resolve(city_fields.get("projects", []))
+
+
+def _build_city_list(
+    fetched_projects: List[Dict[str, Any]],
+    cities_list: List[Dict[str, Any]],
+    indicator_values: List[Dict[str, Any]],
+    areas_of_interest_list: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
     # Return empty list if no cities found
     if not cities_list:
         return []
 
-    # Update project IDs in each city to reflect  projects
-    for city in cities_list:
-        city_projects = [
-            fetched_project_ids[project]
-            for project in city["fields"]["projects"]
-            if project in fetched_project_ids.keys()
-        ]
-        city["fields"]["projects"] = city_projects
+    values_by_city = index_for(indicator_values).derive(
+        "indicator_values_by_city", _indicator_values_by_city
+    )
 
     # Return the filtered cities data
     city_res_list = []
-    for city in cities_list:
-        bbox_dict = {}
-        area_of_interests = []
-        if areas_of_interest_list:
-            for aoi in areas_of_interest_list:
-                if city["id"] in aoi["fields"].get("cities", []):
-                    if "bounding_box" in aoi["fields"]:
-                        bbox_dict[aoi["fields"]["id"]] = aoi["fields"]["bounding_box"]
-                    area_of_interests.append(aoi["fields"]["id"])
-
-        city_response = {key: city["fields"].get(key) for key in CITY_RESPONSE_KEYS}
-        city_id = city_response["id"]
-        indicator_values = grouped_indicator_values.get(city_id)
-        city_response["indicator_values"] = {}
-        if area_of_interests:
-            city_response["area_of_interests"] = area_of_interests
-            city_response["admin_levels"] = area_of_interests
-
-        if indicator_values:
-            sorted_selected_indicator_values = sorted(
-                indicator_values if indicator_values else [],
-                key=lambda x: (x["fields"]["areas_of_interest_id"][0]),
+    # The AOI and project lists are indexed once, not once per city.
+    with index_scope():
+        for city in cities_list:
+            area_of_interests, bbox_dict = _city_areas_of_interest(
+                city["id"], areas_of_interest_list
             )
-            grouped_selected_indicator_values = {
-                key: list(group)
-                for key, group in itertools.groupby(
-                    sorted_selected_indicator_values,
-                    lambda x: x["fields"]["areas_of_interest_id"][0],
-                )
-            }
-            for aoi, value in grouped_selected_indicator_values.items():
-                city_response["indicator_values"][aoi] = {
-                    f'{i["fields"]["id"]}': (
-                        i["fields"]["value"]
-                        if i["fields"].get("id") and i["fields"].get("value")
-                        else None
-                    )
-                    for i in value
-                }
-        city_response["bounding_box"] = bbox_dict
 
-        city_response["layers_url"] = {
-            "pmtiles": f"https://wri-cities-data-api.s3.us-east-1.amazonaws.com/data/{settings.env}/boundaries/pmtiles/{city_id}.pmtiles",
-            "geojson": f"https://wri-cities-data-api.s3.us-east-1.amazonaws.com/data/{settings.env}/boundaries/geojson/{city_id}.geojson",
-        }
-        city_res_list.append(city_response)
+            city_response = {key: city["fields"].get(key) for key in CITY_RESPONSE_KEYS}
+            city_response["projects"] = _project_ids(city["fields"], fetched_projects)
+            city_id = city_response["id"]
+            city_response["indicator_values"] = dict(values_by_city.get(city_id, {}))
+            if area_of_interests:
+                city_response["area_of_interests"] = area_of_interests
+                city_response["admin_levels"] = area_of_interests
+            city_response["bounding_box"] = bbox_dict
+
+            city_response["layers_url"] = {
+                "pmtiles": f"https://wri-cities-data-api.s3.us-east-1.amazonaws.com/data/{settings.env}/boundaries/pmtiles/{city_id}.pmtiles",
+                "geojson": f"https://wri-cities-data-api.s3.us-east-1.amazonaws.com/data/{settings.env}/boundaries/geojson/{city_id}.geojson",
+            }
+            city_res_list.append(city_response)
     return city_res_list
 
 
+def _city_detail_filter_formulas(
+    application_id: Optional[ApplicationIdParam], city_id: str
+) -> Dict[str, Optional[str]]:
+    projects_filter = {"application_id": application_id.value} if application_id else {}
+    return {
+        "projects": construct_filter_formula(projects_filter),
+        "indicator_values": (
+            construct_filter_formula_v2({"cities_id": city_id}) if city_id else None
+        ),
+        # For AOIs, filter by application_id only; we'll filter by the city record id
+        # in memory
+        "aoi_data": (
+            construct_filter_formula_v2({"application_id": application_id.value})
+            if application_id
+            else None
+        ),
+    }
+
+
 @timed
 def get_city_by_city_id(
     application_id: Optional[ApplicationIdParam], city_id: str
@@ -173,80 +285,79 @@ def get_city_by_city_id(
         dict: A dictionary containing the city's data based on CITY_RESPONSE_KEYS.
     """
     # Fetch the city record first to get its Airtable record id (rec...)
-    city_records = fetch_cities(f'"{city_id}" = {{id}}') if city_id else []
+    city_records = fetch_cities(f'"{city_id}" = {{id}}', CITY_FIELDS) if city_id else []
     if not city_records:
         return None
-    city_record_id = city_records[0]["id"]
-
-    # Build filters
-    projects_filter = {"application_id": application_id.value} if application_id else {}
-    indicator_values_filter = (
-        construct_filter_formula_v2({"cities_id": city_id}) if city_id else None
-    )
-    # For AOIs, filter by application_id only; we'll filter by the city record id in memory
-    aoi_filter = (
-        construct_filter_formula_v2({"application_id": application_id.value})
-        if application_id
-        else None
-    )
+    formulas = _city_detail_filter_formulas(application_id, city_id)
 
     # Define the tasks to be executed asynchronously (after city is known)
-    future_to_func = {
-        lambda: fetch_projects(construct_filter_formula(projects_filter)): "projects",
-        lambda: fetch_indicator_values(indicator_values_filter): "indicator_values",
-        lambda: fetch_areas_of_interest(aoi_filter): "aoi_data",
+    results = {}
+    futures = {
+        upstream_executor.submit(
+            fetch_projects, formulas["projects"], PROJECT_FIELDS
+        ): "projects",
+        upstream_executor.submit(
+            fetch_indicator_values,
+            formulas["indicator_values"],
+            INDICATOR_VALUE_FIELDS,
+        ): "indicator_values",
+        upstream_executor.submit(
+            fetch_areas_of_interest, formulas["aoi_data"], AOI_FIELDS
+        ): "aoi_data",
     }
-    city_data = city_records
-    indicator_values = []
-    all_projects = []
-    aoi_list = []
-
-    with ThreadPoolExecutor() as executor:
-        futures = {executor.submit(func): name for func, name in future_to_func.items()}
-        for future in as_completed(futures):
-            func_name = futures[future]
-            if func_name == "projects":
-                all_projects = future.result()
-            if func_name == "city_data":
-                city_data = future.result()
-            if func_name == "indicator_values":
-                indicator_values = future.result()
-            if func_name == "aoi_data":
-                aoi_list = future.result()
-    if not city_data:
+    for future in as_completed(futures):
+        results[futures[future]] = future.result()
+
+    return _build_city_detail(
+        city_id,
+        city_records,
+        results["projects"],
+        results["indicator_values"],
+        results["aoi_data"],
+    )
+
+
+@timed
+async def get_city_by_city_id_async(
+    application_id: Optional[ApplicationIdParam], city_id: str
+) -> Optional[Dict]:
+    """
+    Async version of :func:`get_city_by_city_id` that fetches from Airtable
+    concurrently on the event loop.
+    """
+    city_records = (
+        await fetch_cities_async(f'"{city_id}" = {{id}}', CITY_FIELDS)
+        if city_id
+        else []
+    )
+    if not city_records:
         return None
-    sorted_indicator_values = sorted(
-        indicator_values if indicator_values else [],
-        key=lambda x: (x["fields"].get("cities_id", [""])[0]),
+    formulas = _city_detail_filter_formulas(application_id, city_id)
+
+    all_projects, indicator_values, aoi_list = await asyncio.gather(
+        fetch_projects_async(formulas["projects"], PROJECT_FIELDS),
+        fetch_indicator_values_async(
+            formulas["indicator_values"], INDICATOR_VALUE_FIELDS
+        ),
+        fetch_areas_of_interest_async(formulas["aoi_data"], AOI_FIELDS),
+    )
+    return _build_city_detail(
+        city_id, city_records, all_projects, indicator_values, aoi_list
     )
-    grouped_indicator_values = {
-        key: list(group)
-        for key, group in itertools.groupby(
-            sorted_indicator_values, lambda x: x["fields"].get("cities_id", [""])[0]
-        )
-    }
 
-    project_id_map = {
-        project["id"]: project["fields"]["id"] for project in all_projects
-    }
-    city = city_data[0]["fields"]
-
-    city["projects"] = [
-        project_id_map.get(project)
-        for project in city["projects"]
-        if project in project_id_map.keys()
-    ]
-
-    city_response = {key: city.get(key) for key in CITY_RESPONSE_KEYS}
-
-    bbox_dict = {}
-    area_of_interests = []
-    if aoi_list:
-        for aoi in aoi_list:
-            if city_data[0]["id"] in aoi["fields"].get("cities", []):
-                if "bounding_box" in aoi["fields"]:
-                    bbox_dict[aoi["fields"]["id"]] = aoi["fields"]["bounding_box"]
-                area_of_interests.append(aoi["fields"]["id"])
+
+def _build_city_detail(
+    city_id: str,
+    city_data: List[Dict[str, Any]],
+    all_projects: List[Dict[str, Any]],
+    indicator_values: List[Dict[str, Any]],
+    aoi_list: List[Dict[str, Any]],
+) -> Dict:
+    city = city_data[0]
+    city_response = {key: city["fields"].get(key) for key in CITY_RESPONSE_KEYS}
+    city_response["projects"] = _project_ids(city["fields"], all_projects)
+
+    area_of_interests, bbox_dict = _city_areas_of_interest(city["id"], aoi_list)
     city_response["bounding_box"] = bbox_dict
     if area_of_interests:
         city_response["area_of_interests"] = area_of_interests
@@ -268,33 +379,251 @@ def get_city_by_city_id(
     # if s3_base_path.endswith("/"):
     #     s3_base_path = s3_base_path[:-1]
 
-    city_response["indicator_values"] = []
-    selected_city_indicator_values = grouped_indicator_values.get(city_id)
-
-    sorted_selected_indicator_values = sorted(
-        selected_city_indicator_values if selected_city_indicator_values else [],
-        key=lambda x: (x["fields"]["areas_of_interest_id"][0]),
+    values_by_city = index_for(indicator_values or []).derive(
+        "indicator_values_by_city", _indicator_values_by_city
     )
-    grouped_selected_indicator_values = {
-        key: list(group)
-        for key, group in itertools.groupby(
-            sorted_selected_indicator_values,
-            lambda x: x["fields"]["areas_of_interest_id"][0],
-        )
-    }
-    city_response["indicator_values"] = {}
-    for aoi, value in grouped_selected_indicator_values.items():
-        city_response["indicator_values"][aoi] = {
-            f'{i["fields"]["id"]}': (
-                i["fields"]["value"]
-                if i["fields"].get("id") and i["fields"].get("value")
-                else None
-            )
-            for i in value
-        }
+    city_response["indicator_values"] = dict(values_by_city.get(city_id, {}))
 
     city_response["layers_url"] = {
         "pmtiles": f"https://wri-cities-data-api.s3.us-east-1.amazonaws.com/data/{settings.env}/boundaries/pmtiles/{city_id}.pmtiles",
         "geojson": f"https://wri-cities-data-api.s3.us-east-1.amazonaws.com/data/{settings.env}/boundaries/geojson/{city_id}.geojson",
     }
     return city_response
+
+
+@dataclass
+class CityList:
+    """The ``/cities`` documents of one application, ready to be filtered.
+
+    Documents follow the Cities table order and are kept serialized. Posting
+    lists map a project id or country code to the positions of its cities.
+    """
+
+    projects: List[Dict[str, Any]]
+    documents: List[Dict[str, Any]]
+    serialized: List[bytes]
+    by_project: Dict[str, Set[int]]
+    by_country: Dict[str, Set[int]]
+
+    def select(
+        self, projects: Optional[List[str]], country_code_iso3: Optional[str]
+    ) -> Optional[List[bytes]]:
+        """Return the serialized documents matching the filters, as ``list_cities``
+        would, or None if no project matches."""
+        selected_projects = [
+            project["fields"]["id"]
+            for project in self.projects
+            if record_matches_search(project, "id", projects)
+        ]
+        if not selected_projects:
+            return None
+
+        positions = set().union(
+            *(self.by_project.get(project, ()) for project in selected_projects)
+        )
+        if country_code_iso3:
+            positions &= set().union(
+                *(
+                    cities
+                    for country, cities in self.by_country.items()
+                    if country_code_iso3 in country
+                )
+            )
+        if not projects:
+            return [self.serialized[position] for position in sorted(positions)]
+
+        # Cities only list the requested projects, so those documents change.
+        keep = set(selected_projects)
+        return [
+            json_bytes(
+                {
+                    **self.documents[position],
+                    "projects": [
+                        project
+                        for project in self.documents[position]["projects"]
+                        if project in keep
+                    ],
+                }
+            )
+            for position in sorted(positions)
+        ]
+
+
+@dataclass
+class CityViews:
+    """Materialized ``/cities`` responses: detail documents by ``(city_id,
+    application_id)`` and the city list of each application."""
+
+    documents: Dict[CityDocumentKey, bytes]
+    lists: Dict[Optional[str], CityList]
+
+
+def _application_scope(
+    app: Optional[str],
+    projects: List[Dict[str, Any]],
+    indicator_values: List[Dict[str, Any]],
+    areas_of_interest: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # Filter in memory the way the query formulas filter by application.
+    if not app:
+        return projects, indicator_values, areas_of_interest
+    return (
+        [p for p in projects if record_matches_search(p, "application_id", app)],
+        [
+            v
+            for v in indicator_values
+            if record_matches_equals(v, "application_id", app)
+        ],
+        [
+            a
+            for a in areas_of_interest
+            if record_matches_equals(a, "application_id", app)
+        ],
+    )
+
+
+def _build_city_list_view(
+    projects: List[Dict[str, Any]],
+    cities: List[Dict[str, Any]],
+    indicator_values: List[Dict[str, Any]],
+    areas_of_interest: List[Dict[str, Any]],
+) -> CityList:
+    documents = _build_city_list(projects, cities, indicator_values, areas_of_interest)
+    by_project: Dict[str, Set[int]] = {}
+    by_country: Dict[str, Set[int]] = {}
+    for position, (city, document) in enumerate(zip(cities, documents)):
+        for project in document["projects"]:
+            by_project.setdefault(project, set()).add(position)
+        country = city["fields"].get("country_code_iso3")
+        if country:
+            by_country.setdefault(country, set()).add(position)
+    return CityList(
+        projects=projects,
+        documents=documents,
+        serialized=[json_bytes(document) for document in documents],
+        by_project=by_project,
+        by_country=by_country,
+    )
+
+
+def _build_city_views(
+    cities: List[Dict[str, Any]],
+    projects: List[Dict[str, Any]],
+    indicator_values: List[Dict[str, Any]],
+    areas_of_interest: List[Dict[str, Any]],
+) -> CityViews:
+    """Build every ``/cities`` response from whole-table snapshots.
+
+    Each application, and no application (keyed by ``None``), gets its own city
+    list and city documents, scoped the way the query formulas scope them. A
+    city whose document cannot be built is logged and left out.
+    """
+    views = CityViews(documents={}, lists={})
+    # The per-application lists are indexed once, not once per city.
+    with index_scope():
+        for application_id in [None, *ApplicationIdParam]:
+            app = application_id.value if application_id else None
+            app_projects, app_values, app_aois = _application_scope(
+                app, projects, indicator_values, areas_of_interest
+            )
+            views.lists[app] = _build_city_list_view(
+                app_projects, cities, app_values, app_aois
+            )
+            for city in cities:
+                city_id = city["fields"].get("id")
+                if not city_id or (city_id, app) in views.documents:
+                    continue
+                # The detail query filters indicator values by city only.
+                try:
+                    city_response = _build_city_detail(
+                        city_id, [city], app_projects, indicator_values, app_aois
+                    )
+                except Exception as e:
+                    # One malformed record only takes its own document down.
+                    logger.exception(
+                        "Building the document of %s failed: %s", city_id, e
+                    )
+                    continue
+                views.documents[(city_id, app)] = json_bytes(city_response)
+    return views
+
+
+city_views = MaterializedView("cities", _build_city_views)
+
+
+async def _city_views_async() -> CityViews:
+    sources = await asyncio.gather(
+        fetch_cities_async(None, CITY_FIELDS),
+        fetch_projects_async(None, DOCUMENT_PROJECT_FIELDS),
+        fetch_indicator_values_async(None, DOCUMENT_INDICATOR_VALUE_FIELDS),
+        fetch_areas_of_interest_async(None, DOCUMENT_AOI_FIELDS),
+    )
+    return await city_views.aget(*sources)
+
+
+@timed
+async def get_city_list_document_async(
+    application_id: Optional[ApplicationIdParam],
+    projects: Optional[List[str]],
+    country_code_iso3: Optional[str],
+) -> Optional[bytes]:
+    """
+    Retrieve the serialized ``/cities`` response body for the given filters.
+
+    The city list of each application is materialized with posting lists by
+    project and country, so filtering is a set intersection over ready
+    documents. Without the snapshot cache the list is built for the request.
+
+    Args:
+        application_id (Optional[ApplicationIdParam]): A WRI application ID to filter by.
+        projects (Optional[List[str]]): List of Project IDs to filter by.
+        country_code_iso3 (Optional[str]): ISO 3166-1 alpha-3 country code to filter by.
+
+    Returns:
+        Optional[bytes]: The JSON document, or None if no city matches.
+    """
+    if not snapshot_cache.enabled:
+        cities_list = await list_cities_async(
+            application_id, projects, country_code_iso3
+        )
+        if not cities_list:
+            return None
+        return json_bytes({"cities": cities_list})
+
+    views = await _city_views_async()
+    app = application_id.value if application_id else None
+    serialized = views.lists[app].select(projects, country_code_iso3)
+    if not serialized:
+        return None
+    return b'{"cities":[' + b",".join(serialized) + b"]}"
+
+
+@timed
+async def get_city_document_async(
+    application_id: Optional[ApplicationIdParam], city_id: str
+) -> Optional[bytes]:
+    """
+    Retrieve the serialized response body for a specific city ID.
+
+    The documents of all cities are materialized together from the cached
+    Cities, Projects, Indicators_values and Areas_of_interest snapshots and
+    rebuilt on a worker thread after any of them refreshes, so a request is a
+    dictionary lookup; the previous documents are served until the rebuild
+    is done. Without the snapshot cache the document is built for the request
+    instead.
+
+    Args:
+        application_id (Optional[ApplicationIdParam]): The application to scope
+            projects and areas of interest to.
+        city_id (str): The ID of the city to retrieve.
+
+    Returns:
+        Optional[bytes]: The JSON document, or None if the city does not exist.
+    """
+    if not snapshot_cache.enabled:
+        city = await get_city_by_city_id_async(application_id, city_id)
+        return json_bytes(city) if city else None
+
+    views = await _city_views_async()
+    app = application_id.value if application_id else None
+    return views.documents.get((city_id, app))
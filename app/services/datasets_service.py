@@ -1,14 +1,48 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+from concurrent.futures import as_completed
 from typing import Any, Dict, List, Optional
 
 from app.const import DATASETS_LIST_RESPONSE_KEYS
-from app.repositories.cities_repository import fetch_cities
-from app.repositories.datasets_repository import fetch_datasets
-from app.repositories.indicators_repository import fetch_indicators
-from app.repositories.layers_repository import fetch_layers
+from app.repositories.cities_repository import fetch_cities, fetch_cities_async
+from app.repositories.datasets_repository import fetch_datasets, fetch_datasets_async
+from app.repositories.indicators_repository import (
+    fetch_indicators,
+    fetch_indicators_async,
+)
+from app.repositories.layers_repository import fetch_layers, fetch_layers_async
+from app.utils.executor import upstream_executor
 from app.utils.telemetry import timed
 from app.schemas.common_schema import ApplicationIdParam
 from app.utils.filters import construct_filter_formula
+from app.utils.indexes import index_for
+
+# Airtable fields read by this service: the response keys plus the join keys.
+# "city_ids" is derived from the comma separated "cities" column.
+DATASET_FIELDS = [
+    *(key for key in DATASETS_LIST_RESPONSE_KEYS if key != "city_ids"),
+    "cities",
+]
+CITY_FIELDS = ["id"]
+INDICATOR_FIELDS = ["id"]
+LAYER_FIELDS = ["id"]
+
+
+def _datasets_filter_formulas(
+    application_id: Optional[ApplicationIdParam], layer_id: Optional[List[str]]
+) -> Dict[str, str]:
+    filters = {}
+    app_filter = {}
+
+    if layer_id:
+        filters["layers"] = layer_id
+    if application_id:
+        app_filter["application_id"] = application_id.value
+        filters["application_id"] = application_id.value
+
+    return {
+        "layers": construct_filter_formula(app_filter),
+        "datasets": construct_filter_formula(filters),
+    }
 
 
 @timed
@@ -34,64 +68,89 @@ def list_datasets(
         List[Dict[str, Any]]: A list of dictionaries containing the filtered datasets,
             each enriched with selected fields like indicators, city IDs, and layers.
     """
-    filters = {}
-    app_filter = {}
-
-    if layer_id:
-        filters["layers"] = layer_id
-    if application_id:
-        app_filter["application_id"] = application_id.value
-        filters["application_id"] = application_id.value
-
+    formulas = _datasets_filter_formulas(application_id, layer_id)
     future_to_func = {
-        lambda: fetch_layers(
-            filter_formula=construct_filter_formula(app_filter)
-        ): "layers",
-        fetch_cities: "cities",
-        fetch_indicators: "indicators",
-        lambda: fetch_datasets(
-            filter_formula=construct_filter_formula(filters)
-        ): "datasets",
+        lambda: fetch_layers(formulas["layers"], LAYER_FIELDS): "layers",
+        lambda: fetch_cities(fields=CITY_FIELDS): "cities",
+        lambda: fetch_indicators(fields=INDICATOR_FIELDS): "indicators",
+        lambda: fetch_datasets(formulas["datasets"], DATASET_FIELDS): "datasets",
     }
 
     results = {}
-    with ThreadPoolExecutor() as executor:
-        futures = {executor.submit(func): name for func, name in future_to_func.items()}
-        for future in as_completed(futures):
-            func_name = futures[future]
-            results[func_name] = future.result()
-
-    # Create dictionaries for quick lookup
-    layers_dict = {layer["id"]: layer["fields"] for layer in results["layers"]}
-    cities_dict = {city["fields"]["id"]: city["fields"] for city in results["cities"]}
-    datasets_dict = {
-        dataset["id"]: dataset["fields"] for dataset in results["datasets"]
+    futures = {
+        upstream_executor.submit(func): name for func, name in future_to_func.items()
     }
-    indicators_dict = {
-        indicator["id"]: indicator["fields"]["id"]
-        for indicator in results["indicators"]
-        if "id" in indicator and "fields" in indicator and "id" in indicator["fields"]
-    }
-    # Update indicators and cities for each dataset
-    for dataset in datasets_dict.values():
-        dataset["indicators"] = [
-            indicators_dict[indicator_id]
-            for indicator_id in dataset.get("indicators", [])
-            if indicator_id in indicators_dict.keys()
-        ]
+    for future in as_completed(futures):
+        func_name = futures[future]
+        results[func_name] = future.result()
+
+    return _build_dataset_list(
+        city_id,
+        results["layers"],
+        results["cities"],
+        results["indicators"],
+        results["datasets"],
+    )
+
+
+@timed
+async def list_datasets_async(
+    application_id: Optional[ApplicationIdParam],
+    city_id: Optional[str],
+    layer_id: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of :func:`list_datasets` that fetches from Airtable concurrently
+    on the event loop.
+    """
+    formulas = _datasets_filter_formulas(application_id, layer_id)
+    layers, cities, indicators, datasets = await asyncio.gather(
+        fetch_layers_async(formulas["layers"], LAYER_FIELDS),
+        fetch_cities_async(fields=CITY_FIELDS),
+        fetch_indicators_async(fields=INDICATOR_FIELDS),
+        fetch_datasets_async(formulas["datasets"], DATASET_FIELDS),
+    )
+    return _build_dataset_list(city_id, layers, cities, indicators, datasets)
+
+
+def _dataset_city_ids(dataset: Dict[str, Any]) -> List[str]:
+    # Datasets list their cities as a comma separated string, not linked records.
+    return dataset["fields"].get("cities", "").replace(" ", "").split(",")
+
+
+def _build_dataset_list(
+    city_id: Optional[str],
+    layers: List[Dict[str, Any]],
+    cities: List[Dict[str, Any]],
+    indicators: List[Dict[str, Any]],
+    datasets: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    # Lookup maps, built once per snapshot
+    layers_index = index_for(layers)
+    cities_by_id = index_for(cities).unique("id")
+    indicators_index = index_for(indicators)
+    datasets_index = index_for(datasets)
+
+    if city_id:
+        if city_id not in cities_by_id:
+            return []
+        datasets = datasets_index.group_by("city_ids", _dataset_city_ids).get(
+            city_id, []
+        )
+
+    # Update indicators, cities and layers for each dataset
+    result = []
+    for dataset_record in datasets:
+        dataset = dict(dataset_record["fields"])
+        dataset["indicators"] = indicators_index.resolve(dataset.get("indicators", []))
         dataset["city_ids"] = [
-            cities_dict[city_id]["id"]
-            for city_id in dataset.get("cities", "").replace(" ", "").split(",")
-            if city_id in cities_dict.keys()
-        ]
-        dataset["layers"] = [
-            layers_dict[layer_id]["id"]
-            for layer_id in dataset.get("layers", [])
-            if layer_id in layers_dict.keys()
+            dataset_city_id
+            for dataset_city_id in _dataset_city_ids(dataset_record)
+            if dataset_city_id in cities_by_id
         ]
-    # Reorder and select dataset fields
-    return [
-        {key: dataset[key] for key in DATASETS_LIST_RESPONSE_KEYS if key in dataset}
-        for dataset in datasets_dict.values()
-        if not city_id or city_id in dataset["city_ids"]
-    ]
+        dataset["layers"] = layers_index.resolve(dataset.get("layers", []))
+        # Reorder and select dataset fields
+        result.append(
+            {key: dataset[key] for key in DATASETS_LIST_RESPONSE_KEYS if key in dataset}
+        )
+    return result
@@ -1,23 +1,40 @@
+import asyncio
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from typing import Dict, List, Optional, Set
 
 from app.const import INDICATORS_LIST_RESPONSE_KEYS, INDICATORS_METADATA_RESPONSE_KEYS
-from app.repositories.cities_repository import fetch_cities
-from app.repositories.datasets_repository import fetch_datasets
+from app.repositories.cities_repository import fetch_cities, fetch_cities_async
+from app.repositories.datasets_repository import fetch_datasets, fetch_datasets_async
 from app.repositories.indicators_repository import (
     fetch_first_indicator,
     fetch_indicators,
+    fetch_indicators_async,
 )
-from app.repositories.layers_repository import fetch_layers
-from app.repositories.projects_repository import fetch_projects
+from app.repositories.layers_repository import fetch_layers, fetch_layers_async
+from app.repositories.projects_repository import fetch_projects, fetch_projects_async
 from app.schemas.common_schema import ApplicationIdParam
+from app.utils.executor import upstream_executor
 from app.utils.filters import construct_filter_formula, generate_search_query
+from app.utils.indexes import index_for
 from app.utils.telemetry import timed
 from app.utils.settings import Settings
 
 settings = Settings()
 
+# Airtable fields read by this service: the response keys plus the join keys.
+# "city_ids" is derived from the linked "cities" records.
+INDICATOR_LIST_FIELDS = [
+    *(key for key in dict.fromkeys(INDICATORS_LIST_RESPONSE_KEYS) if key != "city_ids"),
+    "cities",
+]
+INDICATOR_METADATA_FIELDS = INDICATORS_METADATA_RESPONSE_KEYS
+INDICATOR_THEME_FIELDS = ["themes"]
+PROJECT_FIELDS = ["id"]
+CITY_FIELDS = ["id"]
+DATASET_FIELDS = ["name"]
+LAYER_FIELDS = ["id", "layer_legend", "layer_name"]
+
 SPECIAL_INDICATOR_TABLES = {
     "AQ_1_airPollution": "indicators_aq_1",
     "AQ_2_exceedancedays_atleastone": "indicators_aq_2",
@@ -25,6 +42,19 @@ SPECIAL_INDICATOR_TABLES = {
 }
 
 
+def _indicators_filter_formula(
+    projects: List[Dict], city_id: Optional[List[str]]
+) -> str:
+    indicators_filters = {}
+    if projects:
+        indicators_filters["projects"] = [
+            project["fields"]["id"] for project in projects
+        ]
+    if city_id:
+        indicators_filters["cities"] = city_id
+    return construct_filter_formula(indicators_filters)
+
+
 @timed
 def list_indicators(
     application_id: Optional[ApplicationIdParam] = None,
@@ -44,43 +74,74 @@ def list_indicators(
 
     """
     # Create filters
-    indicators_filters = {}
     project_filter = {"application_id": application_id.value} if application_id else {}
-    projects = fetch_projects(construct_filter_formula(project_filter))
-    projects_dict = {}
-    if projects:
-        projects_dict = {project["id"]: project["fields"]["id"] for project in projects}
-        indicators_filters["projects"] = [
-            project["fields"]["id"] for project in projects
-        ]
-    if city_id:
-        indicators_filters["cities"] = city_id
-    indicators_filter_formula = construct_filter_formula(indicators_filters)
+    projects = fetch_projects(construct_filter_formula(project_filter), PROJECT_FIELDS)
+    indicators_filter_formula = _indicators_filter_formula(projects, city_id)
 
     # Fetch all necessary data in parallel
-    with ThreadPoolExecutor() as executor:
-        futures = {
-            executor.submit(fetch_cities): "cities",
-            executor.submit(fetch_datasets): "datasets",
-            executor.submit(fetch_layers): "layers",
-            executor.submit(fetch_indicators, indicators_filter_formula): "indicators",
-        }
-
-        results = {}
-        for future in as_completed(futures):
-            func_name = futures[future]
-            results[func_name] = future.result()
-
-    # Create dictionaries for quick lookup
-    cities_dict = {city["id"]: city["fields"]["id"] for city in results["cities"]}
-    indicators_dict = {
-        indicator["id"]: indicator["fields"] for indicator in results["indicators"]
-    }
-    datasets_dict = {
-        dataset["id"]: dataset["fields"]["name"] for dataset in results["datasets"]
+    futures = {
+        upstream_executor.submit(fetch_cities, None, CITY_FIELDS): "cities",
+        upstream_executor.submit(fetch_datasets, None, DATASET_FIELDS): "datasets",
+        upstream_executor.submit(fetch_layers, None, LAYER_FIELDS): "layers",
+        upstream_executor.submit(
+            fetch_indicators, indicators_filter_formula, INDICATOR_LIST_FIELDS
+        ): "indicators",
     }
 
-    layers_dict = {layer["id"]: layer["fields"] for layer in results["layers"]}
+    results = {}
+    for future in as_completed(futures):
+        func_name = futures[future]
+        results[func_name] = future.result()
+
+    return _build_indicator_list(
+        projects,
+        results["cities"],
+        results["datasets"],
+        results["layers"],
+        results["indicators"],
+    )
+
+
+@timed
+async def list_indicators_async(
+    application_id: Optional[ApplicationIdParam] = None,
+    project: Optional[str] = None,
+    city_id: Optional[List[str]] = None,
+) -> List[Dict]:
+    """
+    Async version of :func:`list_indicators` that fetches from Airtable
+    concurrently on the event loop.
+    """
+    project_filter = {"application_id": application_id.value} if application_id else {}
+    projects = await fetch_projects_async(
+        construct_filter_formula(project_filter), PROJECT_FIELDS
+    )
+    indicators_filter_formula = _indicators_filter_formula(projects, city_id)
+
+    cities, datasets, layers, indicators = await asyncio.gather(
+        fetch_cities_async(fields=CITY_FIELDS),
+        fetch_datasets_async(fields=DATASET_FIELDS),
+        fetch_layers_async(fields=LAYER_FIELDS),
+        fetch_indicators_async(indicators_filter_formula, INDICATOR_LIST_FIELDS),
+    )
+    return _build_indicator_list(projects, cities, datasets, layers, indicators)
+
+
+def _build_indicator_list(
+    projects: List[Dict],
+    cities: List[Dict],
+    datasets: List[Dict],
+    layers: List[Dict],
+    indicators_records: List[Dict],
+) -> List[Dict]:
+    # Lookup maps, built once per snapshot
+    projects_index = index_for(projects or [])
+    cities_index = index_for(cities)
+    datasets_dict = index_for(datasets).field_map("name")
+    layers_index = index_for(layers)
+    indicators_dict = {
+        indicator["id"]: dict(indicator["fields"]) for indicator in indicators_records
+    }
 
     # Format the output
     indicators = []
@@ -90,26 +151,20 @@ def list_indicators(
             datasets_dict.get(data_source, data_source)
             for data_source in data_sources_link
         ]
-        indicator["projects"] = [
-            projects_dict.get(project)
-            for project in indicator.get("projects", [])
-            if project in projects_dict
-        ]
+        indicator["projects"] = projects_index.resolve(indicator.get("projects", []))
+        layer_ids = indicator.get("layers", [])
         indicator["layers"] = [
             {
-                "id": layers_dict[layer_id]["id"],
-                "legend": layers_dict[layer_id].get("layer_legend", ""),
-                "name": layers_dict[layer_id].get("layer_name", ""),
+                "id": layer["fields"]["id"],
+                "legend": layer["fields"].get("layer_legend", ""),
+                "name": layer["fields"].get("layer_name", ""),
             }
-            for layer_id in indicator.get("layers", [])
-            if isinstance(indicator.get("layers"), list)
-            and layer_id in layers_dict.keys()
-        ]
-        indicator["city_ids"] = [
-            cities_dict[city_id]
-            for city_id in cities_dict.keys()
-            if city_id in indicator.get("cities", [])
+            for layer in map(
+                layers_index.get, layer_ids if isinstance(layer_ids, list) else []
+            )
+            if layer
         ]
+        indicator["city_ids"] = cities_index.resolve(indicator.get("cities", []))
         indicators.append(
             {
                 key: (
@@ -133,7 +188,7 @@ def list_indicators_themes() -> Set[str]:
     Returns:
         Set[str]: A set of unique themes.
     """
-    indicators = fetch_indicators()
+    indicators = fetch_indicators(fields=INDICATOR_THEME_FIELDS)
     themes_set = set()
 
     if indicators:
@@ -159,7 +214,9 @@ def get_metadata_by_indicator_id(indicator_id: str) -> Dict:
 
     """
     filter_formula = generate_search_query("id", indicator_id)
-    filtered_indicator = fetch_first_indicator(filter_formula)
+    filtered_indicator = fetch_first_indicator(
+        filter_formula, INDICATOR_METADATA_FIELDS
+    )
 
     if not filtered_indicator:
         return {}
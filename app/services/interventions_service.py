@@ -1,15 +1,22 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from typing import Any, Dict, List, Optional
 
 from app.const import INTERVENTIONS_RESPONSE_KEYS
 from app.repositories.cities_repository import fetch_cities
 from app.repositories.interventions_repository import fetch_interventions
+from app.utils.executor import upstream_executor
+from app.utils.indexes import index_for
 from app.utils.telemetry import timed
 from app.repositories.scenarios_repository import fetch_scenarios
 from app.utils.settings import Settings
 
 settings = Settings()
 
+# Airtable fields read by this service: the response keys plus the join keys.
+INTERVENTION_FIELDS = INTERVENTIONS_RESPONSE_KEYS
+SCENARIO_FIELDS = ["id"]
+CITY_FIELDS = ["id"]
+
 
 @timed
 def list_interventions() -> List[Dict[str, Any]]:
@@ -21,46 +28,22 @@ def list_interventions() -> List[Dict[str, Any]]:
     """
 
     # Fetch all necessary data in parallel
-    with ThreadPoolExecutor() as executor:
-        futures = {
-            executor.submit(fetch_scenarios): "scenarios",
-            executor.submit(fetch_interventions): "interventions",
-            executor.submit(fetch_cities): "cities",
-        }
-
-        results = {}
-        for future in as_completed(futures):
-            func_name = futures[future]
-            results[func_name] = future.result()
-
-    scenarios_dict = {
-        scenario["id"]: scenario["fields"]["id"] for scenario in results["scenarios"]
-    }
-    interventions_dict = {
-        intervention["id"]: intervention["fields"]
-        for intervention in results["interventions"]
+    futures = {
+        upstream_executor.submit(fetch_scenarios, None, SCENARIO_FIELDS): "scenarios",
+        upstream_executor.submit(
+            fetch_interventions, None, INTERVENTION_FIELDS
+        ): "interventions",
+        upstream_executor.submit(fetch_cities, None, CITY_FIELDS): "cities",
     }
-    cities_dict = {city["id"]: city["fields"]["id"] for city in results["cities"]}
-    interventions = []
-    for intervention in interventions_dict.values():
-        intervention["cities"] = [
-            cities_dict[city_id]
-            for city_id in cities_dict.keys()
-            if city_id in intervention.get("cities", [])
-        ]
-        intervention["scenarios"] = [
-            scenarios_dict[scenario_id]
-            for scenario_id in scenarios_dict.keys()
-            if scenario_id in intervention.get("scenarios", [])
-        ]
-        interventions.append(
-            {
-                key: intervention[key]
-                for key in INTERVENTIONS_RESPONSE_KEYS
-                if key in intervention
-            }
-        )
-    return interventions
+
+    results = {}
+    for future in as_completed(futures):
+        func_name = futures[future]
+        results[func_name] = future.result()
+
+    return _build_intervention_list(
+        results["scenarios"], results["interventions"], results["cities"]
+    )
 
 
 @timed
@@ -76,48 +59,49 @@ def get_intervention_by_city_id(city_id: str) -> Optional[Dict]:
     """
 
     # Fetch all necessary data in parallel
-    with ThreadPoolExecutor() as executor:
-        futures = {
-            executor.submit(
-                lambda: fetch_scenarios(f'"{city_id}" = {{cities}}')
-            ): "scenarios",
-            executor.submit(
-                lambda: fetch_interventions(f'"{city_id}" = {{cities}}')
-            ): "interventions",
-            executor.submit(lambda: fetch_cities(f'"{city_id}" = {{id}}')): "cities",
-        }
-
-        results = {}
-        for future in as_completed(futures):
-            func_name = futures[future]
-            results[func_name] = future.result()
-
-    scenarios_dict = {
-        scenario["id"]: scenario["fields"]["id"] for scenario in results["scenarios"]
+    futures = {
+        upstream_executor.submit(
+            lambda: fetch_scenarios(f'"{city_id}" = {{cities}}', SCENARIO_FIELDS)
+        ): "scenarios",
+        upstream_executor.submit(
+            lambda: fetch_interventions(
+                f'"{city_id}" = {{cities}}', INTERVENTION_FIELDS
+            )
+        ): "interventions",
+        upstream_executor.submit(
+            lambda: fetch_cities(f'"{city_id}" = {{id}}', CITY_FIELDS)
+        ): "cities",
     }
-    interventions_dict = {
-        intervention["id"]: intervention["fields"]
-        for intervention in results["interventions"]
-    }
-    cities_dict = {city["id"]: city["fields"]["id"] for city in results["cities"]}
-    interventions = []
-    for intervention in interventions_dict.values():
-        intervention["cities"] = [
-            cities_dict[city_id]
-            for city_id in cities_dict.keys()
-            if city_id in intervention.get("cities", [])
-        ]
-
-        intervention["scenarios"] = [
-            scenarios_dict[scenario_id]
-            for scenario_id in scenarios_dict.keys()
-            if scenario_id in intervention.get("scenarios", [])
-        ]
-        interventions.append(
+
+    results = {}
+    for future in as_completed(futures):
+        func_name = futures[future]
+        results[func_name] = future.result()
+
+    return _build_intervention_list(
+        results["scenarios"], results["interventions"], results["cities"]
+    )
+
+
+def _build_intervention_list(
+    scenarios: List[Dict[str, Any]],
+    interventions: List[Dict[str, Any]],
+    cities: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    scenarios_index = index_for(scenarios)
+    cities_index = index_for(cities)
+    intervention_list = []
+    for record in interventions:
+        intervention = dict(record["fields"])
+        intervention["cities"] = cities_index.resolve(intervention.get("cities"))
+        intervention["scenarios"] = scenarios_index.resolve(
+            intervention.get("scenarios")
+        )
+        intervention_list.append(
             {
                 key: intervention[key]
                 for key in INTERVENTIONS_RESPONSE_KEYS
                 if key in intervention
             }
         )
-    return interventions
+    return intervention_list
@@ -1,17 +1,35 @@
 import json
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from typing import Union
 from urllib.parse import urljoin
 
 from app.repositories.cities_repository import fetch_first_city
 from app.repositories.layers_repository import fetch_first_layer
+from app.utils.executor import upstream_executor
 from app.utils.filters import construct_filter_formula, generate_search_query
 from app.utils.telemetry import timed
 from app.utils.settings import Settings
 
 settings = Settings()
 
+# Airtable fields read by generate_layer_response, which scenarios also use.
+LAYER_FIELDS = [
+    "id",
+    "s3_path",
+    "layer_file_name",
+    "version",
+    "file_type",
+    "layer_type",
+    "cif_class_name",
+    "datasets_id",
+    "source_layer_id",
+    "layers_group_mask",
+    "map_styling",
+    "legend_styling",
+]
+LAYER_CITY_FIELDS = ["city_admin_level"]
+
 
 def generate_layer_response(
     city_id: str,
@@ -106,13 +124,16 @@ def get_city_layer(
     city_filter = generate_search_query("id", city_id)
 
     results = {}
-    with ThreadPoolExecutor() as executor:
-        futures = {
-            executor.submit(lambda: fetch_first_layer(layers_filter_formula)): "layer",
-            executor.submit(lambda: fetch_first_city(city_filter)): "city",
-        }
-        for future in as_completed(futures):
-            results[futures[future]] = future.result()
+    futures = {
+        upstream_executor.submit(
+            fetch_first_layer, layers_filter_formula, LAYER_FIELDS
+        ): "layer",
+        upstream_executor.submit(
+            fetch_first_city, city_filter, LAYER_CITY_FIELDS
+        ): "city",
+    }
+    for future in as_completed(futures):
+        results[futures[future]] = future.result()
 
     # Extract necessary fields from the results
     if not results["layer"] or not results["city"]:
@@ -4,6 +4,9 @@ from app.repositories.projects_repository import fetch_projects
 from app.utils.filters import generate_search_query
 from app.utils.telemetry import timed
 
+# Airtable fields read by this service.
+PROJECT_FIELDS = ["id", "name", "about_text"]
+
 
 @timed
 def list_projects(application_id) -> List[Dict]:
@@ -19,7 +22,7 @@ def list_projects(application_id) -> List[Dict]:
         if application_id
         else {}
     )
-    projects = fetch_projects(filter_formula)
+    projects = fetch_projects(filter_formula, PROJECT_FIELDS)
     projects_list = [
         {
             "id": project["fields"]["id"],
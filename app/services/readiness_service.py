@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.services import (
+    cities_service,
+    datasets_service,
+    indicators_service,
+    interventions_service,
+    projects_service,
+)
+from app.utils.settings import Settings
+from app.utils.snapshot import snapshot_cache
+from app.utils.telemetry import timed
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+
+class Prewarm:
+    """Loads the snapshots, indexes and materialized views the endpoints read.
+
+    The run happens in the background, so the app keeps answering ``/health``
+    while it warms up; :meth:`readiness` reports when it is done and the data it
+    loaded is recent enough to serve.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start a warm-up run on the event loop unless one is running."""
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    @timed
+    async def run(self) -> None:
+        self.started_at, self.finished_at, self.error = time.time(), None, None
+        try:
+            await asyncio.gather(
+                cities_service.get_city_list_document_async(None, None, None),
+                datasets_service.list_datasets_async(None, None),
+                indicators_service.list_indicators_async(),
+                asyncio.to_thread(indicators_service.list_indicators_themes),
+                asyncio.to_thread(interventions_service.list_interventions),
+                asyncio.to_thread(projects_service.list_projects, None),
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception("Prewarm failed: %s", e)
+            self.error = str(e) or type(e).__name__
+            return
+        self.finished_at = time.time()
+        logger.info("Prewarm finished in %.2f s", self.finished_at - self.started_at)
+
+    def readiness(self) -> Dict[str, Any]:
+        """Report whether the instance should receive traffic, and why.
+
+        An instance is ready once a warm-up run finished and every table it
+        loaded was fetched less than ``max_age`` seconds ago. Tables expired by a
+        webhook notification count by their last fetch, since they are served
+        while they refresh. Without the snapshot cache there is nothing to warm
+        up and it is always ready.
+        """
+        tables = snapshot_cache.table_stats() if snapshot_cache.enabled else {}
+        if not snapshot_cache.enabled:
+            status = "ready"
+        elif self.error is not None:
+            status = "failed"
+        elif self.finished_at is None:
+            status = "warming"
+        elif any(stats.age > self.max_age for stats in tables.values()):
+            status = "stale"
+        else:
+            status = "ready"
+        return {
+            "status": status,
+            "max_age_seconds": self.max_age,
+            "tables": {
+                table: {
+                    "records": stats.records,
+                    "entries": stats.entries,
+                    "age_seconds": round(stats.age, 3),
+                }
+                for table, stats in sorted(tables.items())
+            },
+        }
+
+
+prewarm = Prewarm(settings.readiness_max_age_seconds)
@@ -1,25 +1,77 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List
+import asyncio
+from concurrent.futures import as_completed
+from typing import Any, Dict, List, Optional
 
 from app.const import SCENARIOS_INDICATOR_VALUES_RESPONSE_KEYS, SCENARIOS_RESPONSE_KEYS
-from app.repositories.cities_repository import fetch_first_city
-from app.repositories.indicators_repository import fetch_indicators
-from app.repositories.interventions_repository import fetch_interventions
-from app.repositories.layers_repository import fetch_layers
+from app.repositories.cities_repository import (
+    fetch_first_city,
+    fetch_first_city_async,
+)
+from app.repositories.indicators_repository import (
+    fetch_indicators,
+    fetch_indicators_async,
+)
+from app.repositories.interventions_repository import (
+    fetch_interventions,
+    fetch_interventions_async,
+)
+from app.repositories.layers_repository import fetch_layers, fetch_layers_async
 from app.repositories.scenarios_repository import (
     fetch_indicator_values,
+    fetch_indicator_values_async,
     fetch_scenarios,
+    fetch_scenarios_async,
 )
 from app.services import layers_service
+from app.utils.executor import upstream_executor
 from app.utils.filters import (
     construct_filter_formula,
     construct_filter_formula_v2,
     generate_search_query,
 )
+from app.utils.indexes import index_for
 from app.utils.settings import Settings
 
 settings = Settings()
 
+# Airtable fields read by this service: the response keys plus the join keys.
+# Interventions are only matched by record id, so any single field will do.
+INTERVENTION_FIELDS = ["id"]
+SCENARIO_FIELDS = [*SCENARIOS_RESPONSE_KEYS, "Interventions"]
+INDICATOR_VALUE_FIELDS = [
+    *(key for key in SCENARIOS_INDICATOR_VALUES_RESPONSE_KEYS if key != "name"),
+    "indicators",
+    "scenarios_ids",
+]
+INDICATOR_FIELDS = ["name"]
+
+
+def _scenario_filter_formulas(
+    city_id: str, aoi_id: str, intervention_category: str
+) -> Dict[str, Optional[str]]:
+    filters = {}
+
+    if intervention_category:
+        filters["category"] = f"{intervention_category}"
+    if aoi_id:
+        filters["areas_of_interest"] = f"{aoi_id}"
+    if city_id:
+        filters["cities"] = f"{city_id}"
+
+    return {
+        "interventions": construct_filter_formula_v2(filters),
+        "scenarios": (
+            construct_filter_formula({"cities": city_id}) if city_id else None
+        ),
+        "indicator_values": (
+            construct_filter_formula_v2({"cities": city_id}) if city_id else None
+        ),
+        "indicators": (
+            construct_filter_formula_v2({"cities": city_id}) if city_id else None
+        ),
+        "city": generate_search_query("id", city_id),
+    }
+
 
 def get_scenario_by_city_id_aoi_id_intervention_category(
     city_id: str, aoi_id: str, intervention_category: str
@@ -35,69 +87,87 @@ def get_scenario_by_city_id_aoi_id_intervention_category(
     Returns:
         List[Dict[str, Any]]: A list of interventions for the specified city_id.
     """
-    filters = {}
-
-    if intervention_category:
-        filters["category"] = f"{intervention_category}"
-    if aoi_id:
-        filters["areas_of_interest"] = f"{aoi_id}"
-    if city_id:
-        filters["cities"] = f"{city_id}"
+    formulas = _scenario_filter_formulas(city_id, aoi_id, intervention_category)
 
     # Fetch all necessary data in parallel
-    with ThreadPoolExecutor() as executor:
-        futures = {
-            executor.submit(
-                lambda: fetch_interventions(construct_filter_formula_v2(filters))
-            ): "interventions",
-            executor.submit(
-                lambda: fetch_scenarios(
-                    construct_filter_formula({"cities": city_id}) if city_id else None
-                )
-            ): "scenarios",
-            executor.submit(
-                lambda: fetch_indicator_values(
-                    construct_filter_formula_v2({"cities": city_id})
-                    if city_id
-                    else None
-                )
-            ): "indicator_values",
-            executor.submit(
-                lambda: fetch_indicators(
-                    construct_filter_formula_v2({"cities": city_id})
-                    if city_id
-                    else None
-                )
-            ): "indicators",
-            executor.submit(fetch_layers): "layers",
-            executor.submit(
-                lambda: fetch_first_city(generate_search_query("id", city_id))
-            ): "city",
-        }
-        results = {}
-        for future in as_completed(futures):
-            func_name = futures[future]
-            results[func_name] = future.result()
-
-    layers_dict = {layer["id"]: layer["fields"] for layer in results["layers"]}
+    futures = {
+        upstream_executor.submit(
+            fetch_interventions, formulas["interventions"], INTERVENTION_FIELDS
+        ): "interventions",
+        upstream_executor.submit(
+            fetch_scenarios, formulas["scenarios"], SCENARIO_FIELDS
+        ): "scenarios",
+        upstream_executor.submit(
+            fetch_indicator_values,
+            formulas["indicator_values"],
+            INDICATOR_VALUE_FIELDS,
+        ): "indicator_values",
+        upstream_executor.submit(
+            fetch_indicators, formulas["indicators"], INDICATOR_FIELDS
+        ): "indicators",
+        upstream_executor.submit(
+            fetch_layers, None, layers_service.LAYER_FIELDS
+        ): "layers",
+        upstream_executor.submit(
+            fetch_first_city, formulas["city"], layers_service.LAYER_CITY_FIELDS
+        ): "city",
+    }
+    results = {}
+    for future in as_completed(futures):
+        func_name = futures[future]
+        results[func_name] = future.result()
+
+    return _build_scenario_list(city_id, aoi_id, results)
+
+
+async def get_scenario_by_city_id_aoi_id_intervention_category_async(
+    city_id: str, aoi_id: str, intervention_category: str
+) -> List:
+    """
+    Async version of :func:`get_scenario_by_city_id_aoi_id_intervention_category`
+    that fetches from Airtable concurrently on the event loop.
+    """
+    formulas = _scenario_filter_formulas(city_id, aoi_id, intervention_category)
+    interventions, scenarios, indicator_values, indicators, layers, city = (
+        await asyncio.gather(
+            fetch_interventions_async(formulas["interventions"], INTERVENTION_FIELDS),
+            fetch_scenarios_async(formulas["scenarios"], SCENARIO_FIELDS),
+            fetch_indicator_values_async(
+                formulas["indicator_values"], INDICATOR_VALUE_FIELDS
+            ),
+            fetch_indicators_async(formulas["indicators"], INDICATOR_FIELDS),
+            fetch_layers_async(fields=layers_service.LAYER_FIELDS),
+            fetch_first_city_async(formulas["city"], layers_service.LAYER_CITY_FIELDS),
+        )
+    )
+    results = {
+        "interventions": interventions,
+        "scenarios": scenarios,
+        "indicator_values": indicator_values,
+        "indicators": indicators,
+        "layers": layers,
+        "city": city,
+    }
+    return _build_scenario_list(city_id, aoi_id, results)
+
+
+def _build_scenario_list(city_id: str, aoi_id: str, results: Dict[str, Any]) -> List:
+    # No interventions match an unknown city, area or category.
+    if not results["interventions"]:
+        return []
+
+    # Lookup maps, built once per snapshot
+    layers_index = index_for(results["layers"])
+    scenarios_by_intervention = index_for(results["scenarios"]).group("Interventions")
+    indicators_dict = index_for(results["indicators"]).field_map("name")
     intervention_ids_list = [
         intervention["id"] for intervention in results["interventions"]
     ]
 
     scenario_list = [
-        (
-            {key: scenario["fields"].get(key) for key in SCENARIOS_RESPONSE_KEYS}
-            if intervention_ids_list[0] in scenario["fields"].get("Interventions", [""])
-            else None
-        )
-        for scenario in results["scenarios"]
+        {key: scenario["fields"].get(key) for key in SCENARIOS_RESPONSE_KEYS}
+        for scenario in scenarios_by_intervention.get(intervention_ids_list[0], [])
     ]
-    scenario_list = [scenario for scenario in scenario_list if scenario]
-
-    indicators_dict = {
-        indicator["id"]: indicator["fields"].get("name")
-        for indicator in results["indicators"]
-    }
     scenario_indicator_dict = {}
 
     for indicator in results["indicator_values"]:
@@ -130,13 +200,13 @@ def get_scenario_by_city_id_aoi_id_intervention_category(
     for scenario in scenario_list:
         layers = []
         for layer_id in scenario["layers"]:
-            layer_fields = layers_dict.get(layer_id)
-            if layer_fields:
+            layer = layers_index.get(layer_id)
+            if layer:
                 layers.append(
                     layers_service.generate_layer_response(
                         city_id=city_id,
                         aoi_id=aoi_id,
-                        layer_fields=layer_fields,
+                        layer_fields=layer["fields"],
                         city_fields=results["city"]["fields"],
                     )
                 )
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import quote
+
+import httpx
+
+from app.utils.metrics import airtable_table_label, observe_airtable_response
+from app.utils.rate_limiter import RateLimiter
+from app.utils.telemetry import record_span, timing_requests
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# (table, fields) projections Airtable rejected; queried without fields from then on
+RejectedProjections = Set[Tuple[str, Tuple[str, ...]]]
+
+
+def is_unknown_field_error(error: Exception) -> bool:
+    """Whether an HTTP error is Airtable rejecting a ``fields[]`` projection.
+
+    Works for both ``requests`` and ``httpx`` errors, which carry the response.
+    """
+    response = getattr(error, "response", None)
+    if response is None or response.status_code != 422:
+        return False
+    try:
+        return response.json()["error"]["type"] == "UNKNOWN_FIELD_NAME"
+    except (ValueError, KeyError, TypeError):
+        return False
+
+
+class AsyncAirtableClient:
+    """Asyncio client for the Airtable list-records endpoint.
+
+    Requests go through one pooled ``httpx.AsyncClient`` so connections are kept
+    alive between calls, and every page waits for a slot from the base's shared
+    rate limiter without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_id: str,
+        rate_limiter: RateLimiter,
+        endpoint_url: str = "https://api.airtable.com",
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: Union[httpx.Timeout, float, None] = 30.0,
+        max_retries: int = 5,
+        backoff_factor: float = 0.1,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rejected_projections: Optional[RejectedProjections] = None,
+    ):
+        self.base_id = base_id
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.rejected_projections: RejectedProjections = (
+            set() if rejected_projections is None else rejected_projections
+        )
+        self._client = httpx.AsyncClient(
+            base_url=f"{endpoint_url.rstrip('/')}/v0/{base_id}/",
+            headers={"Authorization": f"Bearer {api_key}"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def all(
+        self,
+        table_name: str,
+        view: Optional[str] = None,
+        formula: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        max_records: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Retrieve all matching records, following ``offset`` across pages.
+
+        If Airtable rejects a name in ``fields`` the query is repeated without the
+        projection, so a renamed column costs bandwidth instead of an outage. The
+        rejection is remembered and later queries skip the projection.
+        """
+        projection = (table_name, tuple(fields or ()))
+        if fields and projection in self.rejected_projections:
+            fields = None
+        try:
+            return await self._all(table_name, view, formula, fields, max_records)
+        except httpx.HTTPStatusError as e:
+            if not fields or not is_unknown_field_error(e):
+                raise
+            logger.warning(
+                "Airtable rejected fields %s of %s; fetching all fields",
+                fields,
+                table_name,
+            )
+            self.rejected_projections.add(projection)
+            return await self._all(table_name, view, formula, None, max_records)
+
+    async def _all(
+        self,
+        table_name: str,
+        view: Optional[str],
+        formula: Optional[str],
+        fields: Optional[List[str]],
+        max_records: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {}
+        if view:
+            params["view"] = view
+        if formula:
+            params["filterByFormula"] = formula
+        if fields:
+            params["fields[]"] = fields
+        if max_records:
+            params["maxRecords"] = max_records
+
+        records: List[Dict[str, Any]] = []
+        while True:
+            page = await self._get(quote(table_name, safe=""), params)
+            records.extend(page.get("records", []))
+            offset = page.get("offset")
+            if not offset:
+                return records
+            params = {**params, "offset": offset}
+
+    async def first(
+        self,
+        table_name: str,
+        view: Optional[str] = None,
+        formula: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieve the first matching record, or ``None``."""
+        records = await self.all(
+            table_name, view=view, formula=formula, fields=fields, max_records=1
+        )
+        return records[0] if records else None
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _get(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            # The reservation may flock the shared state file, so it runs off
+            # the event loop.
+            delay = await asyncio.to_thread(self.rate_limiter.reserve)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            start = time.perf_counter()
+            try:
+                response = await self._client.get(url, params=params)
+            except httpx.TransportError as e:
+                # Connection failures and timeouts, as urllib3 retries them
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                await self._backoff(attempt, url, type(e).__name__)
+                continue
+            duration = time.perf_counter() - start
+            path = response.request.url.path
+            size = len(response.content)
+            observe_airtable_response("GET", path, response.status_code, duration, size)
+            if timing_requests():
+                record_span(
+                    "airtable",
+                    duration * 1000,
+                    table=airtable_table_label(path),
+                    formula=params.get("filterByFormula"),
+                    status=response.status_code,
+                    bytes=size,
+                    ratelimit_ms=round(delay * 1000, 3),
+                )
+            if (
+                response.status_code in RETRY_STATUS_CODES
+                and attempt < self.max_retries
+            ):
+                attempt += 1
+                await self._backoff(attempt, url, response.status_code)
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    async def _backoff(self, attempt: int, url: str, reason: Any) -> None:
+        backoff = self.backoff_factor * (2 ** (attempt - 1))
+        logger.debug(
+            "Airtable returned %s for %s; retrying in %.2f s", reason, url, backoff
+        )
+        await asyncio.sleep(backoff)
@@ -0,0 +1,163 @@
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+import requests
+from pyairtable import Api, Table
+from pyairtable.api.retrying import retry_strategy
+from pyairtable.api.types import RecordDict
+
+from app.utils.airtable_async import (
+    RETRY_STATUS_CODES,
+    AsyncAirtableClient,
+    RejectedProjections,
+    is_unknown_field_error,
+)
+from app.utils.rate_limiter import RateLimitedAdapter, get_rate_limiter
+from app.utils.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+
+class ProjectedTable(Table):
+    """pyairtable ``Table`` that drops a ``fields`` projection Airtable rejects.
+
+    ``all`` and ``first`` both read through ``iterate``; an unknown field name
+    fails the first page, so the query is repeated without the projection. The
+    rejection is recorded in ``rejected_projections``, shared with the async
+    client, and later queries skip the projection.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        rejected_projections: Optional[RejectedProjections] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.rejected_projections: RejectedProjections = (
+            set() if rejected_projections is None else rejected_projections
+        )
+
+    def iterate(self, **options: Any) -> Iterator[List[RecordDict]]:
+        projection = (self.name, tuple(options.get("fields") or ()))
+        if options.get("fields") and projection in self.rejected_projections:
+            options.pop("fields")
+        try:
+            yield from super().iterate(**options)
+        except requests.HTTPError as e:
+            if not options.get("fields") or not is_unknown_field_error(e):
+                raise
+            logger.warning(
+                "Airtable rejected fields %s of %s; fetching all fields",
+                options["fields"],
+                self.name,
+            )
+            self.rejected_projections.add(projection)
+            options.pop("fields")
+            yield from super().iterate(**options)
+
+
+class AirtableClients:
+    """Airtable clients shared by every repository in the process.
+
+    Holds one pyairtable ``Api`` whose ``requests.Session`` is mounted with a
+    pooled, rate limited adapter, and one ``AsyncAirtableClient`` for the async
+    repositories. Pool size, keep-alive, retry and timeout values come from
+    ``Settings``.
+    """
+
+    def __init__(self, app_settings: Settings):
+        self.base_id = app_settings.airtable_base_id
+        rate_limiter = get_rate_limiter(self.base_id)
+        # Projections Airtable rejected, skipped by the sync and async clients
+        self.rejected_projections: RejectedProjections = set()
+        # Retry the same statuses as the async client, not only pyairtable's 429.
+        retry = retry_strategy(
+            total=app_settings.airtable_max_retries,
+            backoff_factor=app_settings.airtable_retry_backoff_factor,
+            status_forcelist=tuple(sorted(RETRY_STATUS_CODES)),
+        )
+
+        self.api = Api(
+            app_settings.cities_api_airtable_key,
+            timeout=(
+                app_settings.airtable_connect_timeout_seconds,
+                app_settings.airtable_read_timeout_seconds,
+            ),
+            retry_strategy=retry,
+            endpoint_url=app_settings.airtable_endpoint_url,
+        )
+        adapter = RateLimitedAdapter(
+            rate_limiter,
+            max_retries=retry,
+            pool_maxsize=app_settings.airtable_pool_maxsize,
+        )
+        self.api.session.mount("https://", adapter)
+        self.api.session.mount("http://", adapter)
+
+        self.async_client = AsyncAirtableClient(
+            api_key=app_settings.cities_api_airtable_key,
+            base_id=self.base_id,
+            rate_limiter=rate_limiter,
+            endpoint_url=app_settings.airtable_endpoint_url,
+            max_connections=app_settings.airtable_pool_maxsize,
+            max_keepalive_connections=app_settings.airtable_max_keepalive_connections,
+            keepalive_expiry=app_settings.airtable_keepalive_expiry_seconds,
+            timeout=httpx.Timeout(
+                app_settings.airtable_read_timeout_seconds,
+                connect=app_settings.airtable_connect_timeout_seconds,
+            ),
+            max_retries=app_settings.airtable_max_retries,
+            backoff_factor=app_settings.airtable_retry_backoff_factor,
+            rejected_projections=self.rejected_projections,
+        )
+        self._tables: Dict[str, Table] = {}
+
+    def table(self, table_name: str) -> Table:
+        if table_name not in self._tables:
+            self._tables[table_name] = ProjectedTable(
+                None,
+                self.api.base(self.base_id),
+                table_name,
+                rejected_projections=self.rejected_projections,
+            )
+        return self._tables[table_name]
+
+    async def aclose(self) -> None:
+        self.api.session.close()
+        await self.async_client.aclose()
+
+
+_clients: Optional[AirtableClients] = None
+_clients_lock = threading.Lock()
+
+
+def get_airtable_clients() -> AirtableClients:
+    """Return the process-wide Airtable clients, creating them on first use."""
+    global _clients  # pylint: disable=global-statement
+    if _clients is None:
+        with _clients_lock:
+            if _clients is None:
+                _clients = AirtableClients(settings)
+                logger.debug("Airtable clients created for base %s", _clients.base_id)
+    return _clients
+
+
+def airtable_table(table_name: str) -> Table:
+    return get_airtable_clients().table(table_name)
+
+
+def airtable_async_client() -> AsyncAirtableClient:
+    return get_airtable_clients().async_client
+
+
+async def close_airtable_clients() -> None:
+    global _clients  # pylint: disable=global-statement
+    with _clients_lock:
+        clients, _clients = _clients, None
+    if clients is not None:
+        await clients.aclose()
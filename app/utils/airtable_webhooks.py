@@ -0,0 +1,121 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Set
+
+from pyairtable import Base
+from pyairtable.models import WebhookPayload
+
+from app.utils.airtable_clients import get_airtable_clients
+from app.utils.settings import Settings
+from app.utils.snapshot import SNAPSHOT_TABLES, SnapshotCache, snapshot_cache
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+
+@dataclass
+class TableChanges:
+    """What a run of webhook payloads changed in one table."""
+
+    expire: bool = False
+    destroyed_record_ids: Set[str] = field(default_factory=set)
+
+
+class AirtableWebhooks:
+    """Apply Airtable webhook payloads to the snapshot cache.
+
+    A notification only names the webhook; the changes themselves are read from
+    its payload list, starting at the cursor after the last payload applied.
+    Tables with created or changed records, fields or views are expired, so the
+    next read refreshes them (by delta for delta-synced tables) while the old
+    snapshot is still served. Deleted records are removed from the snapshots
+    right away. The first notification after startup has no cursor to resume
+    from, so it expires every table and starts from the current cursor.
+    """
+
+    def __init__(self, cache: SnapshotCache, base: Callable[[], Base]):
+        self.cache = cache
+        self.base = base
+        self._cursors: Dict[str, int] = {}
+        self._table_names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def process(self, webhook_id: str) -> Dict[str, TableChanges]:
+        """Read and apply the new payloads of a webhook; returns the changes."""
+        with self._lock:
+            webhook = self.base().webhook(webhook_id)
+            cursor = self._cursors.get(webhook_id)
+            if cursor is None:
+                self.cache.expire()
+                self._cursors[webhook_id] = webhook.cursor_for_next_payload
+                logger.info("Expired every table on the first %s payload", webhook_id)
+                return {}
+
+            changes: Dict[str, TableChanges] = {}
+            for payload in webhook.payloads(cursor):
+                if payload.error:
+                    # Airtable could not describe the changes.
+                    for table in SNAPSHOT_TABLES:
+                        changes.setdefault(table, TableChanges()).expire = True
+                else:
+                    self._collect(payload, changes)
+                cursor = payload.cursor + 1
+
+            for table, table_changes in changes.items():
+                if table_changes.destroyed_record_ids:
+                    self.cache.discard_records(
+                        table, table_changes.destroyed_record_ids
+                    )
+                if table_changes.expire:
+                    self.cache.expire(table)
+            # Only move past payloads once they are applied, so a failure is
+            # retried on the next notification.
+            self._cursors[webhook_id] = cursor
+            logger.info(
+                "Applied %s payloads up to cursor %d to %s",
+                webhook_id,
+                cursor,
+                sorted(changes),
+            )
+            return changes
+
+    def _collect(
+        self, payload: WebhookPayload, changes: Dict[str, TableChanges]
+    ) -> None:
+        for table_id in payload.destroyed_table_ids:
+            table = self._table_name(table_id)
+            if table:
+                changes.setdefault(table, TableChanges()).expire = True
+        for table_id, changed in payload.changed_tables_by_id.items():
+            table = self._table_name(table_id)
+            if table is None:
+                continue
+            table_changes = changes.setdefault(table, TableChanges())
+            table_changes.destroyed_record_ids.update(changed.destroyed_record_ids)
+            if (
+                changed.changed_records_by_id
+                or changed.created_records_by_id
+                or changed.changed_fields_by_id
+                or changed.created_fields_by_id
+                or changed.destroyed_field_ids
+                or changed.changed_views_by_id
+                or changed.changed_metadata
+            ):
+                table_changes.expire = True
+
+    def _table_name(self, table_id: str) -> Optional[str]:
+        # Payloads identify tables by id; map them to the names the repositories
+        # use, reloading the schema when a table is new or renamed.
+        if table_id not in self._table_names:
+            schema = self.base().schema(force=bool(self._table_names))
+            self._table_names = {table.id: table.name for table in schema.tables}
+        name = self._table_names.get(table_id)
+        return name if name in SNAPSHOT_TABLES else None
+
+
+airtable_webhooks = AirtableWebhooks(
+    snapshot_cache,
+    lambda: get_airtable_clients().api.base(settings.airtable_base_id),
+)
@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+Records = List[Dict[str, Any]]
+Fetch = Callable[[Optional[str], Optional[List[str]]], Records]
+AsyncFetch = Callable[[Optional[str], Optional[List[str]]], Awaitable[Records]]
+
+
+def modified_since_formula(formula: Optional[str], since: float) -> str:
+    """Restrict ``formula`` to records modified after the ``since`` timestamp."""
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(since))
+    clause = f"IS_AFTER(LAST_MODIFIED_TIME(), '{timestamp}')"
+    return f"AND({formula}, {clause})" if formula else clause
+
+
+def merge_records(
+    records: Records, changed: Records, listed_ids: Optional[Sequence[str]] = None
+) -> Records:
+    """Merge changed records into a snapshot.
+
+    Changed records replace their previous version in place and new ones are
+    appended. Given the ids of a record listing, records missing from it are
+    dropped as deleted and the rest follow the listing order. Returns
+    ``records`` itself if nothing changed, so views derived from it stay valid.
+    """
+    if not changed and listed_ids is None:
+        return records
+
+    changed_by_id = {record["id"]: record for record in changed}
+    merged = [changed_by_id.pop(record["id"], record) for record in records]
+    merged.extend(changed_by_id.values())
+    if listed_ids is not None:
+        by_id = {record["id"]: record for record in merged}
+        # Records created after the delta was read come with the next delta.
+        merged = [by_id[i] for i in listed_ids if i in by_id]
+        if not changed and len(merged) == len(records):
+            if all(a is b for a, b in zip(merged, records)):
+                return records
+    return merged
+
+
+@dataclass
+class SyncMarks:
+    """When a snapshot was last brought up to date, by each kind of fetch."""
+
+    modified_since: float
+    listed_at: float
+    loaded_at: float
+
+
+class DeltaSync:
+    """Refresh whole-query snapshots by fetching only what changed upstream.
+
+    A refresh fetches the records modified since the high-water mark of the
+    previous fetch and merges them into the snapshot. Deleted records do not
+    show up in that delta, so every ``listing_interval`` seconds the refresh also
+    lists the matching record ids, with a single field, and drops the rest.
+    ``LAST_MODIFIED_TIME()`` ignores computed fields such as lookups, so a full
+    reload still runs every ``full_refresh_interval`` seconds. The mark is moved
+    back by ``overlap`` seconds to absorb clock skew with Airtable; re-fetching a
+    record is harmless.
+    """
+
+    def __init__(
+        self, listing_interval: float, full_refresh_interval: float, overlap: float
+    ):
+        self.listing_interval = listing_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.overlap = overlap
+        self._marks: Dict[Hashable, SyncMarks] = {}
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        key: Hashable,
+        fetch: Fetch,
+        formula: Optional[str],
+        fields: Optional[List[str]],
+    ) -> Records:
+        start = time.time()
+        records = fetch(formula, fields)
+        self._set_marks(key, SyncMarks(start, start, start))
+        return records
+
+    async def aload(
+        self,
+        key: Hashable,
+        fetch: AsyncFetch,
+        formula: Optional[str],
+        fields: Optional[List[str]],
+    ) -> Records:
+        start = time.time()
+        records = await fetch(formula, fields)
+        self._set_marks(key, SyncMarks(start, start, start))
+        return records
+
+    def refresh(
+        self,
+        key: Hashable,
+        records: Records,
+        fetched_at: float,
+        fetch: Fetch,
+        formula: Optional[str],
+        fields: Optional[List[str]],
+    ) -> Records:
+        """Bring ``records``, last fetched at ``fetched_at``, up to date."""
+        marks, needs_listing = self._plan(key, fetched_at, fields)
+        if marks is None:
+            return self.load(key, fetch, formula, fields)
+
+        start = time.time()
+        changed = fetch(modified_since_formula(formula, marks.modified_since), fields)
+        listed_ids = None
+        if needs_listing:
+            listed_ids = [record["id"] for record in fetch(formula, fields[:1])]
+        return self._merge(key, marks, start, records, changed, listed_ids)
+
+    async def arefresh(
+        self,
+        key: Hashable,
+        records: Records,
+        fetched_at: float,
+        fetch: AsyncFetch,
+        formula: Optional[str],
+        fields: Optional[List[str]],
+    ) -> Records:
+        """Async counterpart of :meth:`refresh`."""
+        marks, needs_listing = self._plan(key, fetched_at, fields)
+        if marks is None:
+            return await self.aload(key, fetch, formula, fields)
+
+        start = time.time()
+        since = modified_since_formula(formula, marks.modified_since)
+        changed = await fetch(since, fields)
+        listed_ids = None
+        if needs_listing:
+            listed = await fetch(formula, fields[:1])
+            listed_ids = [record["id"] for record in listed]
+        return self._merge(key, marks, start, records, changed, listed_ids)
+
+    def _plan(
+        self, key: Hashable, fetched_at: float, fields: Optional[List[str]]
+    ) -> Tuple[Optional[SyncMarks], bool]:
+        # Snapshots not loaded here, e.g. seeded from disk, sync from their fetch
+        # time and list right away.
+        marks = self._marks.get(key) or SyncMarks(fetched_at, 0.0, fetched_at)
+        now = time.time()
+        if not fields or now - marks.loaded_at >= self.full_refresh_interval:
+            # Without a projection the id listing would be a full reload anyway.
+            return None, False
+        marks = replace(marks, modified_since=marks.modified_since - self.overlap)
+        return marks, now - marks.listed_at >= self.listing_interval
+
+    def _merge(
+        self,
+        key: Hashable,
+        marks: SyncMarks,
+        start: float,
+        records: Records,
+        changed: Records,
+        listed_ids: Optional[List[str]],
+    ) -> Records:
+        merged = merge_records(records, changed, listed_ids)
+        listed_at = start if listed_ids is not None else marks.listed_at
+        self._set_marks(key, SyncMarks(start, listed_at, marks.loaded_at))
+        logger.debug(
+            "Delta-synced %s: %d changed, %d -> %d records",
+            key,
+            len(changed),
+            len(records),
+            len(merged),
+        )
+        return merged
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the marks of a snapshot that is no longer kept."""
+        with self._lock:
+            self._marks.pop(key, None)
+
+    def _set_marks(self, key: Hashable, marks: SyncMarks) -> None:
+        with self._lock:
+            self._marks[key] = marks
@@ -0,0 +1,85 @@
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.metrics import UPSTREAM_EXECUTOR_TASKS
+from app.utils.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+
+class UpstreamExecutor:
+    """The process-wide thread pool that services fan out Airtable fetches on.
+
+    The pool is sized by ``max_workers`` and created on first use, so it can be
+    shut down at the end of the app lifespan and recreated by a later one. Tasks
+    run in a copy of the submitting context, so context variables set by the
+    request are visible to them.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "upstream"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        context = contextvars.copy_context()
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.thread_name_prefix,
+                )
+                logger.debug(
+                    "Upstream executor started with %d workers", self.max_workers
+                )
+            self._queued += 1
+            UPSTREAM_EXECUTOR_TASKS.labels("queued").inc()
+            return self._pool.submit(self._run, context, fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool; queued tasks still run unless ``wait`` is false."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _run(
+        self,
+        context: contextvars.Context,
+        fn: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        UPSTREAM_EXECUTOR_TASKS.labels("queued").dec()
+        UPSTREAM_EXECUTOR_TASKS.labels("active").inc()
+        try:
+            return context.run(fn, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+            UPSTREAM_EXECUTOR_TASKS.labels("active").dec()
+
+
+upstream_executor = UpstreamExecutor(settings.upstream_executor_max_workers)
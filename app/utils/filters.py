@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import Any, Dict, List, Union
 
 
 def generate_search_query(column_name: str, value: Union[str, List[str]]) -> str:
@@ -64,3 +64,42 @@ def construct_filter_formula_v2(filters: dict) -> str:
         filter_clauses.append(f'"{value}"={{{column}}}')
 
     return f"AND({', '.join(filter_clauses)})" if filter_clauses else ""
+
+
+def _field_text(record: Dict[str, Any], column_name: str) -> str:
+    # Airtable compares list fields (links, lookups, multiple selects) as their
+    # values joined with ", ".
+    value = record.get("fields", {}).get(column_name)
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+def record_matches_search(
+    record: Dict[str, Any], column_name: str, value: Union[str, List[str]]
+) -> bool:
+    """
+    In-memory counterpart of :func:`generate_search_query` for one record.
+
+    Args:
+        record (Dict[str, Any]): An Airtable record with a ``fields`` dict.
+        column_name (str): The name of the column to search within.
+        value (Union[str, List[str]]): The value or list of values to search for.
+
+    Returns:
+        bool: True if the column contains the value, or any of the values. An
+              empty value matches every record, as the empty query would.
+    """
+    if not value:
+        return True
+    values = value if isinstance(value, list) else [value]
+    text = _field_text(record, column_name)
+    return any(v in text for v in values)
+
+
+def record_matches_equals(record: Dict[str, Any], column_name: str, value: str) -> bool:
+    """
+    In-memory counterpart of one ``"value"={column}`` clause of
+    :func:`construct_filter_formula_v2`.
+    """
+    return _field_text(record, column_name) == str(value)
@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.utils.settings import Settings
+from app.utils.telemetry import RequestTimings
+
+settings = Settings()
+
+
+class FlightRecorder:
+    """Ring buffer of the traces of the last ``capacity`` slow requests.
+
+    Every request collects its spans anyway (see :class:`RequestTimings`); a
+    request faster than ``threshold_ms`` costs one comparison here, and only a
+    slower one has its trace rendered and kept.
+    """
+
+    def __init__(self, threshold_ms: float, capacity: int):
+        self.threshold_ms = threshold_ms
+        self._traces: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        method: str,
+        path: str,
+        query: str,
+        status: int,
+        duration_ms: float,
+        timings: RequestTimings,
+    ) -> None:
+        if duration_ms < self.threshold_ms:
+            return
+        trace = {
+            "at": time.time(),
+            "method": method,
+            "path": path,
+            "query": query,
+            "status": status,
+            "duration_ms": round(duration_ms, 3),
+            **timings.trace(),
+        }
+        with self._lock:
+            self._traces.append(trace)
+
+    def traces(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The recorded traces, newest first."""
+        with self._lock:
+            traces = list(reversed(self._traces))
+        return traces[:limit] if limit is not None else traces
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+
+flight_recorder = FlightRecorder(
+    threshold_ms=settings.slow_request_threshold_ms,
+    capacity=settings.slow_request_traces,
+)
@@ -0,0 +1,193 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Request, Response
+from fastapi.routing import APIRoute
+
+from app.utils.materialized import served_stale
+from app.utils.settings import Settings
+from app.utils.snapshot import TableState, snapshot_cache
+
+settings = Settings()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """HTTP caching headers of the GET endpoints of one router."""
+
+    name: str
+    tables: Tuple[str, ...]
+    cache_control: str
+    surrogate_key: str
+
+    def headers(self, etag: Optional[str]) -> Dict[str, str]:
+        headers = {
+            "Cache-Control": self.cache_control,
+            "Surrogate-Key": self.surrogate_key,
+        }
+        if etag:
+            headers["ETag"] = etag
+        return headers
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """A hash of the app sources, so a deploy changes every ETag."""
+    digest = hashlib.blake2b(digest_size=8)
+    root = Path(__file__).resolve().parents[1]
+    for path in sorted(root.rglob("*.py")):
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def entity_tag(request: Request, state: TableState) -> str:
+    """A strong ETag for the response to ``request`` built from ``state``."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(code_version().encode())
+    digest.update(request.url.path.encode())
+    for name, value in sorted(request.query_params.multi_items()):
+        digest.update(f"\0{name}={value}".encode())
+    digest.update(state.digest.encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(
+    if_none_match: Optional[str], etag: str, representation_exists: bool = False
+) -> bool:
+    """Whether ``If-None-Match`` matches, so the response can be a 304.
+
+    ``*`` only matches a representation known to exist, e.g. a stored body, so
+    it never turns a 404 into a 304.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in tags:
+        return representation_exists
+    # If-None-Match uses the weak comparison.
+    return etag in (tag.removeprefix("W/") for tag in tags)
+
+
+class ResponseCache:
+    """Response bodies keyed by ETag, evicted least recently used first."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._bodies: OrderedDict[str, Tuple[bytes, Optional[str]]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        with self._lock:
+            cached = self._bodies.get(key)
+            if cached is not None:
+                self._bodies.move_to_end(key)
+            return cached
+
+    def put(self, key: str, body: bytes, media_type: Optional[str]) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._bodies.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._bodies[key] = (body, media_type)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._bodies.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+            self._size = 0
+
+
+response_cache = ResponseCache(settings.http_response_cache_max_bytes)
+
+
+def cached_handler(
+    policy: CachePolicy, handler: Callable[[Request], Awaitable[Response]]
+) -> Callable[[Request], Awaitable[Response]]:
+    """Wrap a route handler with HTTP caching.
+
+    GET responses get ``Cache-Control`` and ``Surrogate-Key`` headers and a strong
+    ``ETag`` hashed from the request and the cached snapshots of the policy's
+    tables. While those snapshots are fresh, a request matching
+    ``If-None-Match`` gets a 304 and a repeated request gets the stored bytes of
+    the previous response, both without running the dependencies, the service
+    or serialization. With stale snapshots the handler runs, so it triggers
+    their refresh. A body is only tagged and stored if no snapshot changed
+    while it was built and no materialized view it read was being rebuilt.
+    """
+
+    async def route_handler(request: Request) -> Response:
+        if request.method != "GET":
+            return await handler(request)
+
+        state = (
+            snapshot_cache.table_state(policy.tables)
+            if snapshot_cache.enabled
+            else None
+        )
+        etag = entity_tag(request, state) if state is not None else None
+        if state is not None and state.fresh:
+            cached = response_cache.get(etag)
+            if etag_matches(
+                request.headers.get("If-None-Match"),
+                etag,
+                representation_exists=cached is not None,
+            ):
+                return Response(status_code=304, headers=policy.headers(etag))
+            if cached is not None:
+                body, media_type = cached
+                return Response(
+                    body, media_type=media_type, headers=policy.headers(etag)
+                )
+
+        response = await handler(request)
+        if response.status_code != 200:
+            return response
+        if etag and (
+            served_stale()
+            or snapshot_cache.table_state(policy.tables).digest != state.digest
+        ):
+            etag = None
+        response.headers.update(policy.headers(etag))
+        if etag:
+            response_cache.put(etag, bytes(response.body), response.media_type)
+            if etag_matches(
+                request.headers.get("If-None-Match"), etag, representation_exists=True
+            ):
+                return Response(status_code=304, headers=policy.headers(etag))
+        return response
+
+    return route_handler
+
+
+def cached_router(name: str, *tables: str) -> APIRouter:
+    """Create the router of the GET endpoints reading ``tables``.
+
+    ``Cache-Control`` and ``Surrogate-Key`` are configured per router ``name``;
+    ``tables`` must list every snapshot table the router reads.
+    """
+    policy = CachePolicy(
+        name=name,
+        tables=tables,
+        cache_control=settings.http_cache_control.get(
+            name, settings.http_cache_control_default
+        ),
+        surrogate_key=settings.http_surrogate_keys.get(name, " ".join([name, *tables])),
+    )
+
+    class CachedRoute(APIRoute):
+        def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+            return cached_handler(policy, super().get_route_handler())
+
+    return APIRouter(route_class=CachedRoute)
@@ -0,0 +1,186 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import product
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from app.utils.snapshot import snapshot_cache
+
+T = TypeVar("T")
+
+Record = Dict[str, Any]
+
+
+def field_values(record: Record, field: str) -> List[Any]:
+    """Return the values of ``field`` in a record as a list.
+
+    Linked records and lookups are lists already, scalars are wrapped and a
+    missing field gives no values.
+    """
+    value = record.get("fields", {}).get(field)
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+class RecordIndex:
+    """Lookup maps over one snapshot of Airtable records.
+
+    Records are indexed by Airtable record id up front; maps by business field
+    and reverse link maps are built on first use and kept on the index. The
+    records are shared with the snapshot cache and must not be modified.
+    """
+
+    def __init__(self, records: Sequence[Record]):
+        self.records = records
+        self.by_record_id: Dict[str, Record] = {
+            record["id"]: record for record in records
+        }
+        self._derived: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, record_id: str) -> Optional[Record]:
+        return self.by_record_id.get(record_id)
+
+    def derive(self, name: Hashable, build: Callable[[Sequence[Record]], T]) -> T:
+        """Return ``build(records)``, computed once per index under ``name``."""
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+        value = build(self.records)
+        with self._lock:
+            return self._derived.setdefault(name, value)
+
+    def field_map(self, field: str) -> Dict[str, Any]:
+        """Map record id to the value of ``field``, for records that have it."""
+
+        def build(records: Sequence[Record]) -> Dict[str, Any]:
+            return {
+                record["id"]: record["fields"][field]
+                for record in records
+                if field in record.get("fields", {})
+            }
+
+        return self.derive(("field_map", field), build)
+
+    def resolve(self, links: Any, field: str = "id") -> List[Any]:
+        """Map a linked-record list to the ``field`` values of the linked records.
+
+        The result follows the order of ``links``, which is the order shown in
+        Airtable. Links to records missing from this snapshot, or without the
+        field, are skipped; anything other than a list resolves to nothing.
+        """
+        if not isinstance(links, list):
+            return []
+        values = self.field_map(field)
+        return [values[link] for link in links if link in values]
+
+    def unique(self, field: str) -> Dict[Any, Record]:
+        """Map each value of ``field`` (e.g. the business ``id``) to its record."""
+
+        def build(records: Sequence[Record]) -> Dict[Any, Record]:
+            return {
+                value: record
+                for record in records
+                for value in field_values(record, field)
+                if isinstance(value, Hashable)
+            }
+
+        return self.derive(("unique", field), build)
+
+    def group(self, *fields: str) -> Dict[Hashable, List[Record]]:
+        """Group records by the values of ``fields``, keeping record order.
+
+        A record linked to several values is listed under each of them, so
+        grouping AOIs by ``cities`` gives the AOIs of each city record. With more
+        than one field the keys are tuples, one element per field.
+        """
+
+        def keys(record: Record) -> Iterable[Hashable]:
+            values = product(*(field_values(record, field) for field in fields))
+            if len(fields) == 1:
+                return (key[0] for key in values)
+            return values
+
+        return self.group_by(("group", *fields), keys)
+
+    def group_by(
+        self, name: Hashable, keys: Callable[[Record], Iterable[Hashable]]
+    ) -> Dict[Hashable, List[Record]]:
+        """Group records under each key returned by ``keys``, keeping record order.
+
+        ``name`` identifies the grouping on this index, so it must stay tied to the
+        same ``keys`` function.
+        """
+
+        def build(records: Sequence[Record]) -> Dict[Hashable, List[Record]]:
+            groups: Dict[Hashable, List[Record]] = {}
+            for record in records:
+                for key in dict.fromkeys(keys(record)):
+                    groups.setdefault(key, []).append(record)
+            return groups
+
+        return self.derive(("group_by", name), build)
+
+
+# Indexes of lists outside the snapshot cache, kept for an index_scope() block.
+_scope: ContextVar[Optional[Dict[int, Tuple[Sequence[Record], RecordIndex]]]] = (
+    ContextVar("index_scope", default=None)
+)
+
+
+@contextmanager
+def index_scope() -> Iterator[None]:
+    """Keep the index of every list indexed in the block until the block ends.
+
+    For builds that look up the same derived lists, e.g. records filtered per
+    application, once per city. Nested scopes share the outermost one.
+    """
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def index_for(records: Sequence[Record]) -> RecordIndex:
+    """Return the index of a records list, building it on first use.
+
+    The index of a list served by the snapshot cache is kept on its cache entry,
+    so every map is built once per refresh and dropped with the entry. Other
+    lists, e.g. with the cache disabled, keep their index until the enclosing
+    :func:`index_scope` ends, and get a new one every time outside of a scope.
+    """
+    entry = snapshot_cache.entry_for(records)
+    if entry is not None:
+        index = entry.index
+        if index is None:
+            # Two threads may both build it; either index is correct.
+            index = entry.index = RecordIndex(records)
+        return index
+    scope = _scope.get()
+    if scope is None:
+        return RecordIndex(records)
+    # The scope holds the list, so its id is not reused while the scope lasts.
+    cached = scope.get(id(records))
+    if cached is None or cached[0] is not records:
+        cached = scope[id(records)] = (records, RecordIndex(records))
+    return cached[1]
@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Callable, Generic, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+_served_stale: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "materialized_served_stale", default=False
+)
+
+
+def served_stale() -> bool:
+    """Whether this context was served a view older than its sources."""
+    return _served_stale.get()
+
+
+class MaterializedView(Generic[T]):
+    """A value derived from several snapshots, rebuilt when any of them changes.
+
+    ``get`` is called with the current source record lists, as returned by the
+    snapshot cache. The lists only change identity when a table is refreshed, so
+    the view is rebuilt once after each refresh and otherwise served as is. Only
+    one thread builds at a time; callers arriving meanwhile wait for its result.
+
+    ``aget`` builds on a worker thread instead of the event loop, and once a
+    view exists it keeps serving it while the rebuild runs; :func:`served_stale`
+    then tells the caller, e.g. so the response is not cached.
+    """
+
+    def __init__(self, name: str, build: Callable[..., T]):
+        self.name = name
+        self.build = build
+        self.built_at: Optional[float] = None
+        # Sources and value are swapped together so readers never mix the two.
+        self._state: Optional[Tuple[Tuple[Sequence[Any], ...], T]] = None
+        self._lock = threading.Lock()
+        self._rebuild: Optional[asyncio.Task] = None
+
+    def get(self, *sources: Sequence[Any]) -> T:
+        value = self._current(sources)
+        if value is not None:
+            return value
+        return self._build(sources)
+
+    async def aget(self, *sources: Sequence[Any]) -> T:
+        value = self._current(sources)
+        if value is not None:
+            return value
+        rebuild = self._schedule_rebuild(sources)
+        if self._state is None:
+            await asyncio.shield(rebuild)
+            value = self._current(sources)
+            if value is not None:
+                return value
+        # A rebuild for newer sources is under way.
+        _served_stale.set(True)
+        return self._state[1]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._state, self.built_at = None, None
+
+    def _build(self, sources: Tuple[Sequence[Any], ...]) -> T:
+        with self._lock:
+            value = self._current(sources)
+            if value is not None:
+                return value
+            start = time.perf_counter()
+            value = self.build(*sources)
+            self._state = (sources, value)
+            self.built_at = time.time()
+            logger.debug(
+                "Materialized %s in %.2f ms",
+                self.name,
+                (time.perf_counter() - start) * 1000,
+            )
+            return value
+
+    def _schedule_rebuild(self, sources: Tuple[Sequence[Any], ...]) -> asyncio.Task:
+        # One rebuild at a time; sources that changed meanwhile are picked up
+        # by the first request after it finishes.
+        loop = asyncio.get_running_loop()
+        rebuild = self._rebuild
+        if rebuild is not None and not rebuild.done() and rebuild.get_loop() is loop:
+            return rebuild
+        # Run outside the request's context, so the build is not timed as part
+        # of the request that happened to trigger it.
+        rebuild = loop.create_task(
+            asyncio.to_thread(self._build, sources), context=contextvars.Context()
+        )
+        rebuild.add_done_callback(self._rebuilt)
+        self._rebuild = rebuild
+        return rebuild
+
+    def _rebuilt(self, rebuild: asyncio.Task) -> None:
+        if not rebuild.cancelled() and rebuild.exception() is not None:
+            logger.warning(
+                "Materializing %s failed: %s", self.name, rebuild.exception()
+            )
+
+    def _current(self, sources: Tuple[Sequence[Any], ...]) -> Optional[T]:
+        state = self._state
+        if state is None:
+            return None
+        current, value = state
+        if len(current) != len(sources):
+            return None
+        if all(a is b for a, b in zip(current, sources)):
+            return value
+        return None
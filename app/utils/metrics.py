@@ -0,0 +1,123 @@
+"""Prometheus metrics of the API, exposed on ``/metrics``.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty
+directory shared by the workers (and emptied before they start): every process
+then writes its samples there and ``/metrics`` aggregates all of them, whichever
+worker answers the scrape.
+"""
+
+import os
+from typing import Optional
+from urllib.parse import unquote
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Request latencies range from a snapshot hit to several paginated Airtable calls.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to answer an HTTP request, by route template and status code.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+AIRTABLE_REQUEST_DURATION = Histogram(
+    "airtable_request_duration_seconds",
+    "Time of an Airtable API request, including reading the body, by table.",
+    ["table", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+AIRTABLE_PAGES = Counter(
+    "airtable_pages_fetched_total",
+    "Pages of records fetched from Airtable.",
+    ["table"],
+)
+AIRTABLE_RESPONSE_BYTES = Counter(
+    "airtable_response_bytes_total",
+    "Bytes of Airtable response bodies.",
+    ["table"],
+)
+RATE_LIMIT_WAIT = Histogram(
+    "airtable_rate_limit_wait_seconds",
+    "Time an Airtable request waited for a rate limiter slot.",
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+SNAPSHOT_CACHE_REQUESTS = Counter(
+    "snapshot_cache_requests_total",
+    "Snapshot cache lookups by table and result: hit, stale, seed or miss.",
+    ["table", "result"],
+)
+UPSTREAM_EXECUTOR_TASKS = Gauge(
+    "upstream_executor_tasks",
+    "Tasks of the shared upstream executor, by state: queued or active.",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+
+def airtable_table_label(path: str) -> str:
+    """The table an Airtable API URL path refers to, e.g. ``/v0/appX/Cities``.
+
+    Metadata and webhook endpoints are labelled ``_meta``.
+    """
+    parts = path.strip("/").split("/")
+    if len(parts) < 3 or parts[0] != "v0" or parts[1] in {"meta", "bases"}:
+        return "_meta"
+    return unquote(parts[2])
+
+
+def observe_airtable_response(
+    method: str, path: str, status: int, seconds: float, size: int
+) -> None:
+    table = airtable_table_label(path)
+    AIRTABLE_REQUEST_DURATION.labels(table, str(status)).observe(seconds)
+    AIRTABLE_RESPONSE_BYTES.labels(table).inc(size)
+    # Records are listed with GET on the table URL, or POST to listRecords when
+    # the query is too long for a URL.
+    is_listing = path.rstrip("/").endswith("/listRecords") or (
+        method == "GET" and len(path.strip("/").split("/")) == 3
+    )
+    if status == 200 and table != "_meta" and is_listing:
+        AIRTABLE_PAGES.labels(table).inc()
+
+
+def metrics_registry() -> CollectorRegistry:
+    """The registry to expose: every worker's samples in multiprocess mode."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    return generate_latest(metrics_registry())
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop the live gauges of a worker that exits, in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid or os.getpid())
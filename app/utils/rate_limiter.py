@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.utils.metrics import (
+    RATE_LIMIT_WAIT,
+    airtable_table_label,
+    observe_airtable_response,
+)
+from app.utils.settings import Settings
+from app.utils.telemetry import record_span, timing_requests
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+
+class RateLimiter:
+    """Sliding-window limiter allowing at most ``calls`` requests per ``period``.
+
+    Callers reserve a start time instead of holding a lock while sleeping, so a
+    reservation is a few microseconds of bookkeeping. When ``state_path`` is given
+    the window is kept in that file under an exclusive ``flock``, which makes every
+    process on the host that uses the same path share one budget.
+    """
+
+    def __init__(self, calls: int, period: float, state_path: Optional[str] = None):
+        self.calls = calls
+        self.period = period
+        self.state_path = state_path if fcntl else None
+        self._window: Deque[float] = deque(maxlen=calls)
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._fd_pid: Optional[int] = None
+        self._calls = 0
+        self._waited_calls = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    def reserve(self) -> float:
+        """Reserve the next free slot and return how many seconds to wait for it."""
+        now = time.time()
+        with self._lock:
+            if self.state_path:
+                start = self._reserve_shared(now)
+            else:
+                start = self._schedule(self._window, now)
+            delay = max(0.0, start - now)
+            RATE_LIMIT_WAIT.observe(delay)
+            self._calls += 1
+            if delay > 0:
+                self._waited_calls += 1
+                self._wait_seconds_total += delay
+                self._wait_seconds_max = max(self._wait_seconds_max, delay)
+        if delay > 0:
+            record_span("ratelimit", delay * 1000)
+        return delay
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; return the time spent waiting."""
+        delay = self.reserve()
+        if delay > 0:
+            logger.debug("Airtable rate limiter delayed call by %.2f ms", delay * 1000)
+            time.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "waited_calls": self._waited_calls,
+                "wait_seconds_total": self._wait_seconds_total,
+                "wait_seconds_max": self._wait_seconds_max,
+            }
+
+    def _schedule(self, window: Deque[float], now: float) -> float:
+        start = now
+        if len(window) == self.calls:
+            start = max(start, window[0] + self.period)
+        if window:
+            start = max(start, window[-1])
+        window.append(start)
+        return start
+
+    def _reserve_shared(self, now: float) -> float:
+        fd = self._state_fd()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            raw = os.read(fd, 4096)
+            try:
+                window: Deque[float] = deque(json.loads(raw or b"[]"), self.calls)
+            except ValueError:
+                window = deque(maxlen=self.calls)
+            start = self._schedule(window, now)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, json.dumps(list(window)).encode())
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        return start
+
+    def _state_fd(self) -> int:
+        # flock is tied to the open file description, which a forked worker would
+        # share with its parent, so each process opens the state file itself.
+        if self._fd is None or self._fd_pid != os.getpid():
+            self._fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._fd_pid = os.getpid()
+        return self._fd
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(base_id: str) -> RateLimiter:
+    """Return the process-wide limiter for an Airtable base."""
+    with _rate_limiters_lock:
+        if base_id not in _rate_limiters:
+            state_path = (
+                os.path.join(
+                    settings.airtable_rate_limit_state_dir,
+                    f"airtable-{base_id}.ratelimit",
+                )
+                if settings.airtable_rate_limit_state_dir
+                else None
+            )
+            _rate_limiters[base_id] = RateLimiter(
+                calls=settings.airtable_rate_limit_calls,
+                period=settings.airtable_rate_limit_period,
+                state_path=state_path,
+            )
+        return _rate_limiters[base_id]
+
+
+class RateLimitedRetry(Retry):
+    """urllib3 retry policy that takes a rate limiter slot before every retry.
+
+    urllib3 retries below ``HTTPAdapter.send``, so without this a burst of
+    retried 429s would go out on top of the shared budget.
+    """
+
+    rate_limiter: Optional[RateLimiter] = None
+
+    @classmethod
+    def limiting(cls, retry: Retry, rate_limiter: RateLimiter) -> "RateLimitedRetry":
+        """A copy of ``retry`` that also waits for ``rate_limiter``."""
+        limited = cls.__new__(cls)
+        limited.__dict__.update(retry.__dict__)
+        limited.rate_limiter = rate_limiter
+        return limited
+
+    def new(self, **kw: Any) -> "RateLimitedRetry":
+        retry = super().new(**kw)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def sleep(self, response=None) -> None:
+        super().sleep(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTP adapter that takes a rate limiter slot before every request it sends.
+
+    Limiting at the transport covers every page of a paginated ``Table.all``;
+    retries performed by ``max_retries`` take a slot each through
+    :class:`RateLimitedRetry`.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter, **kwargs: Any):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+        self.max_retries = RateLimitedRetry.limiting(self.max_retries, rate_limiter)
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=arguments-differ
+        waited = self.rate_limiter.acquire()
+        start = time.perf_counter()
+        response = super().send(request, *args, **kwargs)
+        if not kwargs.get("stream"):
+            duration = time.perf_counter() - start
+            url = urlsplit(request.url)
+            size = len(response.content)
+            observe_airtable_response(
+                request.method, url.path, response.status_code, duration, size
+            )
+            if timing_requests():
+                record_span(
+                    "airtable",
+                    duration * 1000,
+                    table=airtable_table_label(url.path),
+                    formula=parse_qs(url.query).get("filterByFormula", [None])[0],
+                    status=response.status_code,
+                    bytes=size,
+                    ratelimit_ms=round(waited * 1000, 3),
+                )
+        return response
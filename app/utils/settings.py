@@ -1,4 +1,5 @@
-from typing import List
+import tempfile
+from typing import Dict, List
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,9 +11,68 @@ class Settings(BaseSettings):
     cities_api_airtable_key: str
     airtable_base_id: str
     env: str
+    # Point the clients at a stand-in such as tests/fake_airtable for load tests
+    airtable_endpoint_url: str = "https://api.airtable.com"
 
     airtable_rate_limit_calls: int = 5
     airtable_rate_limit_period: int = 1
+    # Worker processes sharing this directory share one rate limit budget per base;
+    # set to an empty string to limit each process on its own.
+    airtable_rate_limit_state_dir: str = tempfile.gettempdir()
+
+    # Airtable HTTP clients, shared by every repository
+    airtable_pool_maxsize: int = 32
+    airtable_max_keepalive_connections: int = 32
+    airtable_keepalive_expiry_seconds: float = 60.0
+    airtable_connect_timeout_seconds: float = 5.0
+    airtable_read_timeout_seconds: float = 30.0
+    airtable_max_retries: int = 5
+    airtable_retry_backoff_factor: float = 0.1
+    # Threads of the shared executor the services fan out Airtable fetches on
+    upstream_executor_max_workers: int = 32
+
+    # Snapshot cache
+    airtable_cache_enabled: bool = True
+    airtable_cache_ttl_seconds: int = 300
+    airtable_cache_table_ttl_seconds: Dict[str, int] = {}
+    # Cached queries kept, least recently read dropped first; filter formulas
+    # are built from request parameters, so the count has to be capped.
+    airtable_cache_max_entries: int = 4096
+    # Tables refreshed by fetching only the records modified since the last
+    # fetch, with a periodic id listing to drop deleted records and a periodic
+    # full reload for computed fields, which LAST_MODIFIED_TIME() ignores.
+    airtable_delta_sync_tables: List[str] = ["Indicators_values", "Areas_of_interest"]
+    airtable_delta_sync_listing_seconds: int = 900
+    airtable_delta_sync_full_refresh_seconds: int = 21600
+    airtable_delta_sync_overlap_seconds: int = 60
+
+    # MAC secret (base64) of the Airtable webhook that notifies
+    # /internal/airtable/webhook of changes; the endpoint is disabled without it.
+    airtable_webhook_mac_secret: str = ""
+
+    # HTTP caching headers of GET responses, configurable per router name
+    http_cache_control_default: str = "public, max-age=60, stale-while-revalidate=300"
+    http_cache_control: Dict[str, str] = {}
+    http_surrogate_keys: Dict[str, str] = {}
+    # Bytes of the response bodies kept for repeated requests
+    http_response_cache_max_bytes: int = 64 * 1024 * 1024
+    # Break the request time down by phase in a Server-Timing response header
+    server_timing_enabled: bool = True
+    # Serve /debug/timings, /debug/slow-requests and their resets, and record
+    # the slow request traces. They are unauthenticated and show Airtable
+    # formulas and query strings, so only enable them where that is acceptable.
+    debug_endpoints_enabled: bool = False
+    # Requests slower than this keep a detailed trace for /debug/slow-requests
+    slow_request_threshold_ms: float = 2000.0
+    slow_request_traces: int = 50
+
+    # On-disk snapshots of the whole base, loaded on startup for a warm cache;
+    # set the directory to an empty string to always start cold.
+    airtable_snapshot_dir: str = "snapshots"
+    airtable_snapshot_keep: int = 3
+
+    # /health/ready fails once a table the warm-up loaded is older than this
+    readiness_max_age_seconds: float = 3600.0
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
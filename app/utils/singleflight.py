@@ -0,0 +1,193 @@
+import asyncio
+import functools
+import inspect
+import threading
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+FORMULA_ARGUMENT = "filter_formula"
+
+
+def normalize_formula(formula: Optional[str]) -> Optional[str]:
+    """Return a canonical form of an Airtable formula for use as a lookup key.
+
+    Whitespace is dropped everywhere except inside string literals and ``{field}``
+    references, and an empty formula is treated as no formula at all, so
+    ``AND({a}='x', {b}='y')`` and ``AND({a}='x',{b}='y')`` map to the same key.
+    The result is only used for keys; the original formula is what gets sent.
+    """
+    if not formula or not formula.strip():
+        return None
+
+    chars = []
+    closing: Optional[str] = None
+    escaped = False
+    for char in formula:
+        if closing:
+            chars.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\" and closing != "}":
+                escaped = True
+            elif char == closing:
+                closing = None
+        elif char.isspace():
+            continue
+        else:
+            chars.append(char)
+            if char in ("'", '"'):
+                closing = char
+            elif char == "{":
+                closing = "}"
+    return "".join(chars)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def call_key(
+    signature: inspect.Signature, args: Any, kwargs: Any
+) -> Tuple[Hashable, ...]:
+    """Build a hashable key from the bound arguments of a repository call."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return tuple(
+        normalize_formula(value) if name == FORMULA_ARGUMENT else _freeze(value)
+        for name, value in bound.arguments.items()
+    )
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers that arrive while it is
+    still running wait for it and receive the same result or exception. Nothing is
+    kept once the call finishes, so this only deduplicates work that overlaps in
+    time. Threads and event loop tasks are tracked separately.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of :meth:`do`.
+
+        The shared call runs as its own task, so a caller being cancelled does not
+        cancel the fetch the other callers are waiting on.
+        """
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None or task.get_loop() is not asyncio.get_running_loop():
+                task = asyncio.ensure_future(func())
+                self._tasks[key] = task
+                task.add_done_callback(functools.partial(self._task_done, key))
+                self._executions += 1
+            else:
+                self._shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executions": self._executions,
+                "shared": self._shared,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
+
+    def _task_done(self, key: Hashable, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved; the awaiting callers re-raise it.
+            task.exception()
+
+
+singleflight = SingleFlight()
+
+
+def coalesce(table: str, op: str = "all", view: str = "all") -> Callable[[F], F]:
+    """Decorator to share one in-flight Airtable fetch between concurrent callers.
+
+    Calls are keyed by ``table``, ``view``, ``op`` and the bound call arguments,
+    with the filter formula normalized, so a burst of identical requests turns
+    into a single upstream query. Works for both sync and async functions.
+    """
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        def flight_key(args: Any, kwargs: Any) -> Hashable:
+            return (table, view, op, *call_key(signature, args, kwargs))
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await singleflight.ado(
+                    flight_key(args, kwargs), lambda: func(*args, **kwargs)
+                )
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return singleflight.do(
+                flight_key(args, kwargs), lambda: func(*args, **kwargs)
+            )
+
+        return cast(F, wrapper)
+
+    return decorator
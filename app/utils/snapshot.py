@@ -0,0 +1,612 @@
+import asyncio
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from app.utils.delta_sync import DeltaSync
+from app.utils.metrics import SNAPSHOT_CACHE_REQUESTS
+from app.utils.settings import Settings
+from app.utils.singleflight import call_key
+from app.utils.telemetry import span
+from app.utils.utilities import normalize_whitespace
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Tables read through @snapshot, i.e. every table the repositories read.
+SNAPSHOT_TABLES: Set[str] = set()
+
+
+@dataclass
+class Snapshot:
+    """Records returned by one upstream query, as last fetched from Airtable."""
+
+    records: Any
+    # When the fetch of the records started.
+    fetched_at: float
+    version: int
+    refreshing: bool = False
+    # Refetch on the next read regardless of age, see SnapshotCache.expire().
+    expired: bool = False
+    _digest: Optional[str] = field(default=None, repr=False, compare=False)
+    # The RecordIndex of the records, see app.utils.indexes.index_for().
+    index: Any = field(default=None, repr=False, compare=False)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def digest(self) -> str:
+        """A hash of the records, computed on first use."""
+        if self._digest is None:
+            content = json.dumps(
+                self.records, sort_keys=True, separators=(",", ":"), default=str
+            )
+            self._digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+        return self._digest
+
+
+@dataclass
+class TableState:
+    """The combined content hash of the cached entries of some tables."""
+
+    digest: str
+    # Every table has entries and none of them is stale.
+    fresh: bool
+
+
+@dataclass
+class TableStats:
+    """How much of a table is cached and how old it is."""
+
+    # Records of the largest cached query, i.e. of the whole table if it is read.
+    records: int
+    entries: int
+    # Age of the oldest entry's last successful fetch, whether or not it was
+    # expired since, so a fresh filtered query does not hide a stale table.
+    age: float
+
+
+class SnapshotCache:
+    """In-process cache of Airtable query results with stale-while-revalidate.
+
+    Entries are keyed by table name and query key. A fresh entry is returned as is;
+    an entry older than its table TTL is still returned immediately, while a
+    background thread fetches the new data and swaps it in. Only a cold miss waits
+    on Airtable.
+
+    Query keys come from request parameters, so at most ``max_entries`` entries
+    are kept; the least recently read ones are dropped first, and ``on_evict`` is
+    told their keys.
+    """
+
+    def __init__(
+        self,
+        default_ttl: float,
+        table_ttls: Optional[Dict[str, float]] = None,
+        enabled: bool = True,
+        max_entries: int = 4096,
+        on_evict: Optional[Callable[[Tuple[str, Hashable]], None]] = None,
+    ):
+        self.default_ttl = default_ttl
+        self.table_ttls = table_ttls or {}
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Tuple[str, Hashable], Snapshot]" = OrderedDict()
+        # Entries by id() of their records, gone once the entry is dropped.
+        self._owners: "weakref.WeakValueDictionary[int, Snapshot]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        # Whole tables loaded from an on-disk snapshot, see seed().
+        self._seed: Dict[str, List[Dict[str, Any]]] = {}
+        self._seeded_at = 0.0
+        self._expired_at: Dict[Optional[str], float] = {}
+
+    def ttl_for(self, table: str) -> float:
+        return self.table_ttls.get(table, self.default_ttl)
+
+    def is_stale(self, table: str, entry: Snapshot) -> bool:
+        return entry.expired or entry.age >= self.ttl_for(table)
+
+    def get(
+        self,
+        table: str,
+        key: Hashable,
+        loader: Callable[[], Any],
+        refresher: Optional[Callable[[Snapshot], Any]] = None,
+    ) -> Any:
+        """Return the records for ``key``, loading them on a cold miss.
+
+        Stale entries are refreshed with ``refresher``, given the stale entry, if
+        there is one, and with ``loader`` otherwise.
+        """
+        if not self.enabled:
+            return loader()
+
+        entry = self._lookup(table, key)
+        if entry is None:
+            entry = self._from_seed(table, key)
+            if entry is None:
+                SNAPSHOT_CACHE_REQUESTS.labels(table, "miss").inc()
+                return self._load(table, key, loader)
+            SNAPSHOT_CACHE_REQUESTS.labels(table, "seed").inc()
+            self._schedule_refresh(
+                table, key, self._reloader(loader, refresher, entry), entry
+            )
+        elif self.is_stale(table, entry):
+            SNAPSHOT_CACHE_REQUESTS.labels(table, "stale").inc()
+            self._schedule_refresh(
+                table, key, self._reloader(loader, refresher, entry), entry
+            )
+        else:
+            SNAPSHOT_CACHE_REQUESTS.labels(table, "hit").inc()
+        return entry.records
+
+    async def aget(
+        self,
+        table: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        refresher: Optional[Callable[[Snapshot], Awaitable[Any]]] = None,
+    ) -> Any:
+        """Async counterpart of :meth:`get`; refreshes run as event loop tasks."""
+        if not self.enabled:
+            return await loader()
+
+        entry = self._lookup(table, key)
+        if entry is None:
+            entry = self._from_seed(table, key)
+            if entry is None:
+                SNAPSHOT_CACHE_REQUESTS.labels(table, "miss").inc()
+                return await self._aload(table, key, loader)
+            SNAPSHOT_CACHE_REQUESTS.labels(table, "seed").inc()
+            self._schedule_arefresh(
+                table, key, self._reloader(loader, refresher, entry), entry
+            )
+        elif self.is_stale(table, entry):
+            SNAPSHOT_CACHE_REQUESTS.labels(table, "stale").inc()
+            self._schedule_arefresh(
+                table, key, self._reloader(loader, refresher, entry), entry
+            )
+        else:
+            SNAPSHOT_CACHE_REQUESTS.labels(table, "hit").inc()
+        return entry.records
+
+    def seed(self, tables: Dict[str, List[Dict[str, Any]]], fetched_at: float) -> None:
+        """Serve whole-table queries from previously fetched tables.
+
+        Used for warm starts from an on-disk snapshot: a query without a filter
+        formula that misses the cache is answered from the seeded table, projected
+        onto the requested fields, and refreshed from Airtable in the background
+        right away. Filtered queries still go to Airtable, since formulas compare
+        linked records by their display text, which the records do not carry.
+        """
+        with self._lock:
+            self._seed = dict(tables)
+            self._seeded_at = fetched_at
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """Drop cached entries for one table, or for every table if none is given."""
+        with self._lock:
+            for entry_key in list(self._entries):
+                if table is None or entry_key[0] == table:
+                    del self._entries[entry_key]
+            if table is None:
+                self._seed = {}
+            else:
+                self._seed.pop(table, None)
+
+    def entry_for(self, records: Any) -> Optional[Snapshot]:
+        """The cached entry serving ``records``, if the cache still holds one."""
+        with self._lock:
+            entry = self._owners.get(id(records))
+        return entry if entry is not None and entry.records is records else None
+
+    def table_state(self, tables: Sequence[str]) -> TableState:
+        """Hash the cached entries of ``tables``, e.g. to derive an ETag.
+
+        The digest only depends on the query keys and records, so it is the same
+        in every process holding the same data.
+        """
+        with self._lock:
+            entries = [
+                (repr(key), key[0], entry)
+                for key, entry in self._entries.items()
+                if key[0] in tables
+            ]
+        entries.sort(key=lambda item: item[0])
+
+        digest = hashlib.blake2b(digest_size=16)
+        fresh = {table for _, table, _ in entries} == set(tables)
+        for key, table, entry in entries:
+            digest.update(key.encode())
+            digest.update(entry.digest.encode())
+            if self.is_stale(table, entry):
+                fresh = False
+        return TableState(digest=digest.hexdigest(), fresh=fresh)
+
+    def table_stats(self) -> Dict[str, TableStats]:
+        """Describe every cached table, including tables only seeded so far."""
+        now = time.time()
+        with self._lock:
+            entries = list(self._entries.items())
+            seed, seeded_at = self._seed, self._seeded_at
+        stats: Dict[str, TableStats] = {
+            table: TableStats(records=len(records), entries=0, age=now - seeded_at)
+            for table, records in seed.items()
+        }
+        for (table, _), entry in entries:
+            if isinstance(entry.records, list):
+                records = len(entry.records)
+            else:
+                records = int(entry.records is not None)
+            current = stats.get(table)
+            if current is None or current.entries == 0:
+                stats[table] = TableStats(records=records, entries=1, age=entry.age)
+            else:
+                current.records = max(current.records, records)
+                current.entries += 1
+                current.age = max(current.age, entry.age)
+        return stats
+
+    def expire(self, table: Optional[str] = None) -> None:
+        """Mark entries of one table, or of every table, as stale.
+
+        Unlike :meth:`invalidate`, the entries keep being served while the next
+        read refreshes them in the background.
+        """
+        with self._lock:
+            # None records the expiry of every table.
+            self._expired_at[table] = time.time()
+            for entry_key, entry in self._entries.items():
+                if table is None or entry_key[0] == table:
+                    entry.expired = True
+            if table is None:
+                self._seed = {}
+            else:
+                self._seed.pop(table, None)
+
+    def discard_records(self, table: str, record_ids: Set[str]) -> None:
+        """Remove deleted records from every entry of ``table``."""
+        with self._lock:
+            for entry_key, entry in list(self._entries.items()):
+                if entry_key[0] != table:
+                    continue
+                records = entry.records
+                if not isinstance(records, list):
+                    # A "first" query: drop it if its record was deleted.
+                    if records and records.get("id") in record_ids:
+                        del self._entries[entry_key]
+                    continue
+                kept = [r for r in records if r["id"] not in record_ids]
+                if len(kept) != len(records):
+                    version = self._versions.get(table, 0) + 1
+                    self._versions[table] = version
+                    self._entries[entry_key] = self._own(
+                        Snapshot(
+                            records=kept,
+                            fetched_at=entry.fetched_at,
+                            version=version,
+                            expired=entry.expired,
+                        )
+                    )
+            if table in self._seed:
+                self._seed[table] = [
+                    r for r in self._seed[table] if r["id"] not in record_ids
+                ]
+
+    def _own(self, entry: Snapshot) -> Snapshot:
+        # Called with the lock held.
+        self._owners[id(entry.records)] = entry
+        return entry
+
+    def _lookup(self, table: str, key: Hashable) -> Optional[Snapshot]:
+        with self._lock:
+            entry = self._entries.get((table, key))
+            if entry is not None:
+                self._entries.move_to_end((table, key))
+        return entry
+
+    def _evict(self) -> List[Tuple[str, Hashable]]:
+        """Drop the least recently read entries beyond ``max_entries``.
+
+        Called with the lock held; returns the dropped keys.
+        """
+        evicted = []
+        while len(self._entries) > self.max_entries > 0:
+            entry_key, _ = self._entries.popitem(last=False)
+            evicted.append(entry_key)
+        return evicted
+
+    def _notify_evicted(self, evicted: List[Tuple[str, Hashable]]) -> None:
+        if self.on_evict is not None:
+            for entry_key in evicted:
+                self.on_evict(entry_key)
+
+    @staticmethod
+    def _reloader(
+        loader: Callable[[], Any],
+        refresher: Optional[Callable[[Snapshot], Any]],
+        entry: Snapshot,
+    ) -> Callable[[], Any]:
+        return loader if refresher is None else functools.partial(refresher, entry)
+
+    def _from_seed(self, table: str, key: Hashable) -> Optional[Snapshot]:
+        # Keys are built by snapshot(): (op, filter_formula, fields).
+        records = self._seed.get(table)
+        if records is None or not isinstance(key, tuple) or len(key) < 2:
+            return None
+        op, formula = key[0], key[1]
+        fields = key[2] if len(key) > 2 else None
+        if formula is not None or op not in ("all", "first"):
+            return None
+
+        if fields:
+            records = [
+                {
+                    **record,
+                    "fields": {
+                        f: record["fields"][f] for f in fields if f in record["fields"]
+                    },
+                }
+                for record in records
+            ]
+        else:
+            records = list(records)
+        if op == "first":
+            records = records[0] if records else None
+
+        with self._lock:
+            entry = self._entries.get((table, key))
+            if entry is None:
+                entry = self._entries[(table, key)] = self._own(
+                    Snapshot(records=records, fetched_at=self._seeded_at, version=0)
+                )
+            evicted = self._evict()
+        self._notify_evicted(evicted)
+        return entry
+
+    def _load(self, table: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        started_at = time.time()
+        return self._store(table, key, loader(), started_at)
+
+    async def _aload(
+        self, table: str, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        started_at = time.time()
+        return self._store(table, key, await loader(), started_at)
+
+    def _store(self, table: str, key: Hashable, records: Any, started_at: float) -> Any:
+        with self._lock:
+            previous = self._entries.get((table, key))
+            if previous is not None and previous.records is records:
+                # An unchanged delta sync: keep the version, digest and index.
+                version, digest = previous.version, previous._digest
+                index = previous.index
+            else:
+                version, digest, index = self._versions.get(table, 0) + 1, None, None
+                self._versions[table] = version
+            # A fetch that started before the table was expired may have missed
+            # the change, so it is stored as stale and refreshed again.
+            expired_at = max(
+                self._expired_at.get(table, 0.0), self._expired_at.get(None, 0.0)
+            )
+            self._entries[(table, key)] = self._own(
+                Snapshot(
+                    records=records,
+                    fetched_at=started_at,
+                    version=version,
+                    expired=started_at < expired_at,
+                    _digest=digest,
+                    index=index,
+                )
+            )
+            self._entries.move_to_end((table, key))
+            evicted = self._evict()
+        self._notify_evicted(evicted)
+        return records
+
+    def _claim_refresh(self, entry: Snapshot) -> bool:
+        with self._lock:
+            if entry.refreshing:
+                return False
+            entry.refreshing = True
+            return True
+
+    def _schedule_refresh(
+        self, table: str, key: Hashable, loader: Callable[[], Any], entry: Snapshot
+    ) -> None:
+        if not self._claim_refresh(entry):
+            return
+        threading.Thread(
+            target=self._refresh,
+            args=(table, key, loader, entry),
+            name=f"snapshot-refresh-{table}",
+            daemon=True,
+        ).start()
+
+    def _schedule_arefresh(
+        self,
+        table: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        entry: Snapshot,
+    ) -> None:
+        if not self._claim_refresh(entry):
+            return
+        # Run outside the request's context, so the refresh is not timed as
+        # part of the request that happened to trigger it.
+        task = asyncio.get_running_loop().create_task(
+            self._arefresh(table, key, loader, entry), context=contextvars.Context()
+        )
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def _refresh(
+        self, table: str, key: Hashable, loader: Callable[[], Any], entry: Snapshot
+    ) -> None:
+        try:
+            self._load(table, key, loader)
+        except Exception as e:
+            # Keep serving the stale entry; the next stale hit retries the refresh.
+            logger.warning("Refreshing %s snapshot failed: %s", table, e)
+            entry.refreshing = False
+
+    async def _arefresh(
+        self,
+        table: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        entry: Snapshot,
+    ) -> None:
+        try:
+            await self._aload(table, key, loader)
+        except Exception as e:
+            logger.warning("Refreshing %s snapshot failed: %s", table, e)
+            entry.refreshing = False
+
+
+delta_sync = DeltaSync(
+    listing_interval=settings.airtable_delta_sync_listing_seconds,
+    full_refresh_interval=settings.airtable_delta_sync_full_refresh_seconds,
+    overlap=settings.airtable_delta_sync_overlap_seconds,
+)
+
+snapshot_cache = SnapshotCache(
+    default_ttl=settings.airtable_cache_ttl_seconds,
+    table_ttls=settings.airtable_cache_table_ttl_seconds,
+    enabled=settings.airtable_cache_enabled,
+    max_entries=settings.airtable_cache_max_entries,
+    # Delta sync keys are the cache entry keys, see snapshot()
+    on_evict=delta_sync.forget,
+)
+
+
+def snapshot(table: str, op: str = "all") -> Callable[[F], F]:
+    """Decorator to serve a repository fetch function from the snapshot cache.
+
+    Calls are keyed by ``op`` and the bound call arguments (with the filter formula
+    normalized), so each distinct filter formula of ``table`` is held and refreshed
+    as its own snapshot. Works for both sync and async functions; the two share
+    entries for the same key.
+
+    ``all`` queries of the tables in ``airtable_delta_sync_tables`` are refreshed
+    through :class:`DeltaSync`; the function must take ``filter_formula`` and
+    ``fields`` arguments.
+
+    Fetched records are passed through :func:`normalize_whitespace` once, as they
+    enter the snapshot, so readers never need to clean up strings themselves.
+    """
+
+    SNAPSHOT_TABLES.add(table)
+    delta = op == "all" and table in settings.airtable_delta_sync_tables
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        def cache_key(args: Any, kwargs: Any) -> Hashable:
+            return (op, *call_key(signature, args, kwargs))
+
+        def query(args: Any, kwargs: Any) -> Tuple[Any, Any]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments["filter_formula"] or None, bound.arguments["fields"]
+
+        if inspect.iscoroutinefunction(func):
+
+            async def source(*args: Any, **kwargs: Any) -> Any:
+                return normalize_whitespace(await func(*args, **kwargs))
+
+        else:
+
+            def source(*args: Any, **kwargs: Any) -> Any:
+                return normalize_whitespace(func(*args, **kwargs))
+
+        def fetch(formula: Optional[str], fields: Optional[List[str]]) -> Any:
+            return source(filter_formula=formula, fields=fields)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                key = cache_key(args, kwargs)
+                with span("repository", table=table, op=op, formula=key[1]):
+                    if not delta:
+                        return await snapshot_cache.aget(
+                            table, key, lambda: source(*args, **kwargs)
+                        )
+                    sync_key = (table, key)
+                    formula, fields = query(args, kwargs)
+                    return await snapshot_cache.aget(
+                        table,
+                        key,
+                        lambda: delta_sync.aload(sync_key, fetch, formula, fields),
+                        lambda entry: delta_sync.arefresh(
+                            sync_key,
+                            entry.records,
+                            entry.fetched_at,
+                            fetch,
+                            formula,
+                            fields,
+                        ),
+                    )
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = cache_key(args, kwargs)
+            with span("repository", table=table, op=op, formula=key[1]):
+                if not delta:
+                    return snapshot_cache.get(
+                        table, key, lambda: source(*args, **kwargs)
+                    )
+                sync_key = (table, key)
+                formula, fields = query(args, kwargs)
+                return snapshot_cache.get(
+                    table,
+                    key,
+                    lambda: delta_sync.load(sync_key, fetch, formula, fields),
+                    lambda entry: delta_sync.refresh(
+                        sync_key,
+                        entry.records,
+                        entry.fetched_at,
+                        fetch,
+                        formula,
+                        fields,
+                    ),
+                )
+
+        return cast(F, wrapper)
+
+    return decorator
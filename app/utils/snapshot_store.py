@@ -0,0 +1,182 @@
+"""Write and load on-disk snapshots of the Airtable base for warm starts.
+
+A snapshot holds every table the repositories read, as gzip-compressed JSON
+stamped with a format version, the base id and the time it was fetched. Produce
+one at image build time or on demand with::
+
+    python -m app.utils.snapshot_store
+
+On startup the app loads the newest snapshot into the snapshot cache, serves
+from it right away and refreshes from Airtable in the background.
+"""
+
+import argparse
+import gzip
+import importlib
+import json
+import logging
+import os
+import pkgutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.utils.airtable_clients import airtable_table
+from app.utils.settings import Settings
+from app.utils.snapshot import SNAPSHOT_TABLES, snapshot_cache
+from app.utils.utilities import normalize_whitespace
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_PREFIX = "airtable-snapshot-"
+SNAPSHOT_SUFFIX = ".json.gz"
+
+
+@dataclass
+class BaseSnapshot:
+    """All records of the snapshotted tables of one base."""
+
+    base_id: str
+    fetched_at: float
+    tables: Dict[str, List[Dict[str, Any]]]
+
+
+def snapshot_path(directory: str, fetched_at: float) -> Path:
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(fetched_at))
+    return Path(directory) / f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}"
+
+
+def write_snapshot(snapshot: BaseSnapshot, directory: str) -> Path:
+    """Write a snapshot file, atomically, and return its path."""
+    path = snapshot_path(directory, snapshot.fetched_at)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "base_id": snapshot.base_id,
+        "fetched_at": snapshot.fetched_at,
+        "tables": snapshot.tables,
+    }
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_snapshot(path: Path) -> BaseSnapshot:
+    """Read a snapshot file.
+
+    Raises:
+        ValueError: If the file was written in another snapshot format.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    if payload.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(
+            f"Unsupported snapshot format {payload.get('format')!r} in {path}"
+        )
+    return BaseSnapshot(
+        base_id=payload["base_id"],
+        fetched_at=payload["fetched_at"],
+        tables=payload["tables"],
+    )
+
+
+def snapshot_files(directory: str) -> List[Path]:
+    """Snapshot files in the directory, oldest first."""
+    if not directory or not os.path.isdir(directory):
+        return []
+    # The UTC timestamps in the names sort chronologically.
+    return sorted(Path(directory).glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"))
+
+
+def prune_snapshots(directory: str, keep: int) -> None:
+    """Delete all but the newest ``keep`` snapshot files."""
+    files = snapshot_files(directory)
+    for path in files[: max(len(files) - keep, 0)]:
+        path.unlink(missing_ok=True)
+
+
+def load_latest_snapshot(
+    directory: str = settings.airtable_snapshot_dir,
+    base_id: str = settings.airtable_base_id,
+) -> Optional[BaseSnapshot]:
+    """Seed the snapshot cache from the newest snapshot of the base, if any.
+
+    Unreadable files and snapshots of another base are skipped, so a bad file
+    only means a cold start.
+    """
+    for path in reversed(snapshot_files(directory)):
+        start = time.perf_counter()
+        try:
+            snapshot = read_snapshot(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Skipping unreadable snapshot %s: %s", path, e)
+            continue
+        if snapshot.base_id != base_id:
+            logger.info("Skipping snapshot %s of base %s", path, snapshot.base_id)
+            continue
+        snapshot_cache.seed(snapshot.tables, snapshot.fetched_at)
+        logger.info(
+            "Loaded snapshot %s (%d tables, %.0f s old) in %.2f ms",
+            path,
+            len(snapshot.tables),
+            time.time() - snapshot.fetched_at,
+            (time.perf_counter() - start) * 1000,
+        )
+        return snapshot
+    return None
+
+
+def snapshot_tables() -> List[str]:
+    """Names of every table read by a repository."""
+    import app.repositories
+
+    # Importing the repositories registers their tables with @snapshot.
+    for module in pkgutil.iter_modules(app.repositories.__path__):
+        importlib.import_module(f"app.repositories.{module.name}")
+    return sorted(SNAPSHOT_TABLES)
+
+
+def fetch_base_snapshot(tables: Sequence[str]) -> BaseSnapshot:
+    """Fetch every record of the given tables from Airtable, normalized as the
+    snapshot cache stores them."""
+    fetched_at = time.time()
+    records = {}
+    for table in tables:
+        records[table] = normalize_whitespace(airtable_table(table).all(view="all"))
+        logger.info("Fetched %d records from %s", len(records[table]), table)
+    return BaseSnapshot(
+        base_id=settings.airtable_base_id, fetched_at=fetched_at, tables=records
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Write a snapshot of the Airtable base for warm starts."
+    )
+    parser.add_argument(
+        "--dir",
+        default=settings.airtable_snapshot_dir or "snapshots",
+        help="directory to write the snapshot to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=settings.airtable_snapshot_keep,
+        help="number of snapshot files to keep (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    path = write_snapshot(fetch_base_snapshot(snapshot_tables()), args.dir)
+    prune_snapshots(args.dir, max(args.keep, 1))
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
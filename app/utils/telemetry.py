@@ -1,27 +1,290 @@
 import logging
+import math
+import re
+import threading
 import time
 import functools
 import inspect
-from typing import Any, Callable, TypeVar, cast
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, cast
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+# Characters not allowed in a Server-Timing metric name (an HTTP token).
+_NON_TOKEN = re.compile(r"[^!#$%&'*+\-.^_`|~0-9A-Za-z]")
+
+
+class RequestTimings:
+    """Durations of the phases of one request, summed per span name.
+
+    Every span is also kept as an event with its end time and details, which
+    costs a tuple per span and is only rendered for slow requests, see
+    :meth:`trace`. Shared by every task and executor thread of the request,
+    which run in copies of its context.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._spans: Dict[str, List[float]] = {}
+        self._events: List[Tuple[float, str, float, Optional[Dict[str, Any]]]] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self, name: str, duration_ms: float, details: Optional[Dict[str, Any]] = None
+    ) -> None:
+        ended = time.perf_counter()
+        with self._lock:
+            span = self._spans.setdefault(name, [0.0, 0])
+            span[0] += duration_ms
+            span[1] += 1
+            self._events.append((ended, name, duration_ms, details))
+
+    def server_timing(self) -> str:
+        """Render the spans as a W3C ``Server-Timing`` header value."""
+        with self._lock:
+            spans = list(self._spans.items())
+        return ", ".join(
+            f"{_NON_TOKEN.sub('_', name)};dur={duration:.2f}"
+            + (f';desc="{count:d} calls"' if count > 1 else "")
+            for name, (duration, count) in spans
+        )
+
+    def trace(self) -> Dict[str, Any]:
+        """The summed spans and every event, in start order, with start offsets in ms."""
+        with self._lock:
+            spans = list(self._spans.items())
+            events = list(self._events)
+        timeline = [
+            {
+                "name": name,
+                "start_ms": round((ended - self.started) * 1000 - duration_ms, 3),
+                "duration_ms": round(duration_ms, 3),
+                **(details or {}),
+            }
+            for ended, name, duration_ms, details in events
+        ]
+        timeline.sort(key=lambda event: event["start_ms"])
+        return {
+            "spans": {
+                name: {"duration_ms": round(duration, 3), "count": count}
+                for name, (duration, count) in spans
+            },
+            "events": timeline,
+        }
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> RequestTimings:
+    """Collect the spans recorded from now on in this context, e.g. a request."""
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+
+def timing_requests() -> bool:
+    """Whether spans recorded now are kept, i.e. a request is being timed."""
+    return _request_timings.get() is not None
+
+
+def record_span(name: str, duration_ms: float, **details: Any) -> None:
+    """Add a duration to the current request's span ``name``, if there is one.
+
+    ``details`` are kept with the span for the trace of a slow request.
+    """
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(name, duration_ms, details or None)
+
+
+@contextmanager
+def span(name: str, **details: Any) -> Iterator[None]:
+    """Record the time spent in the block as span ``name`` of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, (time.perf_counter() - start) * 1000, **details)
+
+
+# Histogram buckets grow by 2 ** (1 / 4), about 19% each, from 0.01 ms up to
+# about 10 hours, so a percentile is within a bucket width of the true value.
+_BUCKET_MIN_MS = 0.01
+_BUCKET_GROWTH = 2**0.25
+_BUCKET_COUNT = 128
+_BUCKET_BOUNDS_MS = [_BUCKET_MIN_MS * _BUCKET_GROWTH**i for i in range(_BUCKET_COUNT)]
+_LOG_BUCKET_GROWTH = math.log(_BUCKET_GROWTH)
+
+
+def _bucket(duration_ms: float) -> int:
+    if duration_ms <= _BUCKET_MIN_MS:
+        return 0
+    index = math.ceil(math.log(duration_ms / _BUCKET_MIN_MS) / _LOG_BUCKET_GROWTH)
+    return min(index, _BUCKET_COUNT - 1)
+
+
+class _Histogram:
+    """Latencies of one function, recorded by one thread."""
+
+    __slots__ = ("buckets", "count", "sum", "max")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        self.buckets[_bucket(duration_ms)] += 1
+        self.count += 1
+        self.sum += duration_ms
+        if duration_ms > self.max:
+            self.max = duration_ms
+
+    def merge(self, other: "_Histogram") -> None:
+        for i, n in enumerate(other.buckets):
+            if n:
+                self.buckets[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(_BUCKET_BOUNDS_MS[i], self.max)
+        return self.max
+
+
+class _ThreadTimings:
+    """The histograms one thread records into; only that thread writes them."""
+
+    def __init__(self, epoch: int) -> None:
+        self.epoch = epoch
+        self.thread = threading.current_thread()
+        self.histograms: Dict[str, _Histogram] = {}
+
+
+class FunctionTimings:
+    """Per-function latency histograms of ``@timed``, aggregated on read.
+
+    Every thread records into its own histograms, so recording takes no lock.
+    Reads merge the histograms of all threads; :meth:`reset` starts a new epoch
+    that threads notice on their next record. Histograms of finished threads are
+    folded into one, so short-lived threads do not pile up.
+    """
+
+    def __init__(self) -> None:
+        self._epoch = 0
+        self._started_at = time.time()
+        self._local = threading.local()
+        self._threads: List[_ThreadTimings] = []
+        self._finished: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, qualname: str, duration_ms: float) -> None:
+        timings = getattr(self._local, "timings", None)
+        if timings is None or timings.epoch != self._epoch:
+            timings = self._register()
+        histogram = timings.histograms.get(qualname)
+        if histogram is None:
+            histogram = timings.histograms[qualname] = _Histogram()
+        histogram.record(duration_ms)
+
+    def stats(self, reset: bool = False) -> Dict[str, Any]:
+        """Count, sum, mean, p50, p90, p99 and max in ms of every function.
+
+        With ``reset`` the histograms are cleared after they are read.
+        """
+        with self._lock:
+            self._fold_finished()
+            merged: Dict[str, _Histogram] = {}
+            for qualname, histogram in self._finished.items():
+                merged.setdefault(qualname, _Histogram()).merge(histogram)
+            for timings in self._threads:
+                for qualname, histogram in list(timings.histograms.items()):
+                    merged.setdefault(qualname, _Histogram()).merge(histogram)
+            since = self._started_at
+            if reset:
+                self._reset()
+        return {
+            "since": since,
+            "timings": {
+                qualname: {
+                    "count": histogram.count,
+                    "sum_ms": round(histogram.sum, 3),
+                    "mean_ms": round(histogram.sum / histogram.count, 3),
+                    "p50_ms": round(histogram.percentile(0.5), 3),
+                    "p90_ms": round(histogram.percentile(0.9), 3),
+                    "p99_ms": round(histogram.percentile(0.99), 3),
+                    "max_ms": round(histogram.max, 3),
+                }
+                for qualname, histogram in sorted(merged.items())
+                if histogram.count
+            },
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._epoch += 1
+        self._started_at = time.time()
+        self._threads = []
+        self._finished = {}
+
+    def _register(self) -> _ThreadTimings:
+        with self._lock:
+            self._fold_finished()
+            timings = _ThreadTimings(self._epoch)
+            self._threads.append(timings)
+        self._local.timings = timings
+        return timings
+
+    def _fold_finished(self) -> None:
+        running = []
+        for timings in self._threads:
+            if timings.thread.is_alive():
+                running.append(timings)
+                continue
+            for qualname, histogram in timings.histograms.items():
+                self._finished.setdefault(qualname, _Histogram()).merge(histogram)
+        self._threads = running
+
+
+function_timings = FunctionTimings()
+
 
 def _log_duration(logger: logging.Logger, qualname: str, duration_ms: float) -> None:
-    logger.debug("TIMER %s took %.2f ms", qualname, duration_ms)
+    function_timings.record(qualname, duration_ms)
+    record_span(qualname, duration_ms)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("TIMER %s took %.2f ms", qualname, duration_ms)
 
 
 def timed(func: F) -> F:
-    """Decorator to log execution duration of a function at DEBUG level.
+    """Decorator to record execution duration of a function.
 
-    Works for both sync and async functions. Keeps original signature and name.
+    The duration goes into the function's histogram in :data:`function_timings`,
+    into a span of the current request (see :func:`record_span`) and, at DEBUG
+    level, into the log. Works for both sync and async functions. Keeps original
+    signature and name.
     """
 
+    logger = logging.getLogger(func.__module__)
+
     if inspect.iscoroutinefunction(func):
 
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-            logger = logging.getLogger(func.__module__)
             start = time.perf_counter()
             try:
                 return await cast(Callable[..., Any], func)(*args, **kwargs)
@@ -32,7 +295,6 @@ def timed(func: F) -> F:
 
     @functools.wraps(func)
     def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-        logger = logging.getLogger(func.__module__)
         start = time.perf_counter()
         try:
             return func(*args, **kwargs)
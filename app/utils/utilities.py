@@ -1,23 +1,35 @@
-import copy
-
-
-def cleanup_spaces_in_response(response: dict | list) -> dict | list:
-
-    response_copy = copy.deepcopy(response)
-    if isinstance(response, list):
-        response_copy = enumerate(response_copy)
-    elif isinstance(response, dict):
-        response_copy = response.items()
-    for k, v in response_copy:
-        if isinstance(v, str):
-            response[k] = v.strip()
-        elif isinstance(v, list):
-            for idx, list_val in enumerate(v):
-                if isinstance(list_val, str):
-                    response[k][idx] = list_val.strip()
-        elif isinstance(v, dict):
-            vcopy = copy.deepcopy(v)
-            for subk, subv in vcopy.items():
-                if isinstance(subv, str):
-                    response[k][subk] = subv.strip()
-    return response
+from typing import Any
+
+import orjson
+from fastapi import responses
+
+from app.utils.telemetry import span
+
+
+def normalize_whitespace(value: Any) -> Any:
+    """Return ``value`` with the surrounding whitespace of every string stripped.
+
+    Lists and dicts are rebuilt recursively; other values are returned as is.
+    """
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return [normalize_whitespace(item) for item in value]
+    if isinstance(value, dict):
+        return {key: normalize_whitespace(item) for key, item in value.items()}
+    return value
+
+
+def json_bytes(content: Any) -> bytes:
+    """Serialize a response body exactly as FastAPI's ``ORJSONResponse`` does."""
+    with span("serialize"):
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+class ORJSONResponse(responses.ORJSONResponse):
+    """FastAPI's ``ORJSONResponse``, timed as the request's ``serialize`` span."""
+
+    def render(self, content: Any) -> bytes:
+        return json_bytes(content)
@@ -0,0 +1,144 @@
+import asyncio
+import importlib
+import os
+from typing import Dict, List, Optional
+
+import pytest
+
+from app.utils import indexes
+from app.utils.snapshot import SnapshotCache
+from tests.fake_airtable.synthetic import SyntheticBase, synthetic_base
+
+# Cities per synthetic base, e.g. BENCHMARK_SCALES=50,500,5000. The 5000 city
+# base has half a million indicator values and takes about 700 MB to build.
+SCALES = [
+    int(scale)
+    for scale in os.environ.get("BENCHMARK_SCALES", "50,500").split(",")
+    if scale.strip()
+]
+
+# Repository functions the services import, by name: (table, op)
+REPOSITORY_FUNCTIONS = {
+    "fetch_areas_of_interest": ("Areas_of_interest", "all"),
+    "fetch_cities": ("Cities", "all"),
+    "fetch_first_city": ("Cities", "first"),
+    "fetch_datasets": ("Datasets", "all"),
+    "fetch_indicators": ("Indicators", "all"),
+    "fetch_first_indicator": ("Indicators", "first"),
+    "fetch_indicator_values": ("Indicators_values", "all"),
+    "fetch_interventions": ("Interventions", "all"),
+    "fetch_layers": ("Layers", "all"),
+    "fetch_first_layer": ("Layers", "first"),
+    "fetch_projects": ("Projects", "all"),
+    "fetch_scenarios": ("Scenarios", "all"),
+}
+
+SERVICE_MODULES = [
+    "app.services.cities_service",
+    "app.services.datasets_service",
+    "app.services.indicators_service",
+    "app.services.interventions_service",
+    "app.services.layers_service",
+    "app.services.projects_service",
+    "app.services.scenarios_service",
+]
+
+_bases: Dict[int, SyntheticBase] = {}
+
+
+def pytest_generate_tests(metafunc):
+    if "base" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "base", SCALES, indirect=True, ids=[f"{n}cities" for n in SCALES]
+        )
+
+
+@pytest.fixture
+def base(request) -> SyntheticBase:
+    # Built once per scale for the whole session; the tests only read it.
+    if request.param not in _bases:
+        _bases[request.param] = synthetic_base(request.param)
+    return _bases[request.param]
+
+
+class StubRepository:
+    """Answers the repository calls from a synthetic base.
+
+    Results are kept per ``(table, op, formula, fields)`` in a snapshot cache
+    that never expires, so after the first call a service reads the same lists,
+    and reuses the same record indexes, a warm cache would hand it and the
+    benchmark times the service alone.
+    """
+
+    def __init__(self, synthetic: SyntheticBase):
+        self.base = synthetic
+        self.cache = SnapshotCache(default_ttl=float("inf"))
+
+    def query(
+        self,
+        table: str,
+        op: str,
+        formula: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ):
+        key = (op, formula, tuple(fields) if fields is not None else None)
+
+        def load():
+            if op == "first":
+                records = self.base.select(table, formula, fields, max_records=1)
+                return records[0] if records else None
+            return self.base.select(table, formula, fields)
+
+        return self.cache.get(table, key, load)
+
+    def function(self, table: str, op: str, is_async: bool):
+        def fetch(
+            filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+        ):
+            return self.query(table, op, filter_formula, fields)
+
+        async def fetch_async(
+            filter_formula: Optional[str] = None, fields: Optional[List[str]] = None
+        ):
+            return self.query(table, op, filter_formula, fields)
+
+        return fetch_async if is_async else fetch
+
+
+@pytest.fixture
+def repository(base, monkeypatch) -> StubRepository:
+    """Point every repository function the services use at ``base``."""
+    stub = StubRepository(base)
+    monkeypatch.setattr(indexes, "snapshot_cache", stub.cache)
+    for module in map(importlib.import_module, SERVICE_MODULES):
+        for name, (table, op) in REPOSITORY_FUNCTIONS.items():
+            for is_async, attribute in ((False, name), (True, f"{name}_async")):
+                if hasattr(module, attribute):
+                    monkeypatch.setattr(
+                        module, attribute, stub.function(table, op, is_async)
+                    )
+    return stub
+
+
+@pytest.fixture
+def run_async():
+    """Run ``func(*args)`` to completion on one event loop kept for the test.
+
+    Benchmarking ``run_async`` times the coroutine plus a loop iteration, which
+    is what the routers pay when they await a service.
+    """
+    loop = asyncio.new_event_loop()
+    yield lambda func, *args: loop.run_until_complete(func(*args))
+    loop.close()
+
+
+@pytest.fixture
+def city_views(repository, run_async, monkeypatch):
+    """The materialized ``/cities`` views, built from ``repository``'s base."""
+    cities_service = importlib.import_module("app.services.cities_service")
+    monkeypatch.setattr(cities_service.snapshot_cache, "enabled", True)
+    # A view of another base would be served while the rebuild runs.
+    cities_service.city_views.invalidate()
+    run_async(cities_service._city_views_async)
+    yield cities_service.city_views
+    cities_service.city_views.invalidate()
@@ -0,0 +1,97 @@
+import pytest
+
+from app.schemas.common_schema import ApplicationIdParam
+from app.services import cities_service
+
+
+@pytest.mark.benchmark(group="list_cities")
+def test_list_cities(benchmark, repository):
+    assert cities_service.list_cities(None, None, None)
+    benchmark(cities_service.list_cities, None, None, None)
+
+
+@pytest.mark.benchmark(group="list_cities")
+def test_list_cities_by_application_and_country(benchmark, repository):
+    args = (ApplicationIdParam.cid, None, "USA")
+    assert cities_service.list_cities(*args)
+    benchmark(cities_service.list_cities, *args)
+
+
+@pytest.mark.benchmark(group="get_city_by_city_id")
+def test_get_city_by_city_id(benchmark, base, repository):
+    city_id = f"city{base.cities // 2}"
+    assert cities_service.get_city_by_city_id(ApplicationIdParam.cid, city_id)
+    benchmark(cities_service.get_city_by_city_id, ApplicationIdParam.cid, city_id)
+
+
+@pytest.mark.benchmark(group="list_cities")
+def test_list_cities_async(benchmark, repository, run_async):
+    assert run_async(cities_service.list_cities_async, None, None, None)
+    benchmark(run_async, cities_service.list_cities_async, None, None, None)
+
+
+@pytest.mark.benchmark(group="get_city_by_city_id")
+def test_get_city_by_city_id_async(benchmark, base, repository, run_async):
+    args = (ApplicationIdParam.cid, f"city{base.cities // 2}")
+    assert run_async(cities_service.get_city_by_city_id_async, *args)
+    benchmark(run_async, cities_service.get_city_by_city_id_async, *args)
+
+
+@pytest.mark.benchmark(group="city_documents")
+def test_get_city_list_document_async(benchmark, city_views, run_async):
+    # What GET /cities runs with the snapshot cache on: a warm view lookup
+    args = (None, None, None)
+    assert run_async(cities_service.get_city_list_document_async, *args)
+    benchmark(run_async, cities_service.get_city_list_document_async, *args)
+
+
+@pytest.mark.benchmark(group="city_documents")
+def test_get_city_list_document_by_project_and_country_async(
+    benchmark, base, city_views, run_async
+):
+    args = (ApplicationIdParam.cid, [base.table("Projects")[0]["fields"]["id"]], "USA")
+    run_async(cities_service.get_city_list_document_async, *args)
+    benchmark(run_async, cities_service.get_city_list_document_async, *args)
+
+
+@pytest.mark.benchmark(group="city_documents")
+def test_get_city_document_async(benchmark, base, city_views, run_async):
+    args = (ApplicationIdParam.cid, f"city{base.cities // 2}")
+    assert run_async(cities_service.get_city_document_async, *args)
+    benchmark(run_async, cities_service.get_city_document_async, *args)
+
+
+@pytest.mark.benchmark(group="city_views")
+def test_cold_city_views_async(benchmark, city_views, run_async):
+    # The rebuild after a snapshot refresh, through MaterializedView.aget and
+    # its worker thread, as the first request after a cold start awaits it
+    benchmark.pedantic(
+        run_async,
+        args=(cities_service._city_views_async,),
+        setup=city_views.invalidate,
+        rounds=3,
+        warmup_rounds=1,
+    )
+
+
+@pytest.mark.benchmark(group="city_views")
+def test_build_city_views(benchmark, repository):
+    # Rebuilding every /cities document after a snapshot refresh
+    sources = (
+        repository.query("Cities", "all", None, cities_service.CITY_FIELDS),
+        repository.query(
+            "Projects", "all", None, cities_service.DOCUMENT_PROJECT_FIELDS
+        ),
+        repository.query(
+            "Indicators_values",
+            "all",
+            None,
+            cities_service.DOCUMENT_INDICATOR_VALUE_FIELDS,
+        ),
+        repository.query(
+            "Areas_of_interest", "all", None, cities_service.DOCUMENT_AOI_FIELDS
+        ),
+    )
+    benchmark.pedantic(
+        cities_service._build_city_views, args=sources, rounds=3, warmup_rounds=1
+    )
@@ -0,0 +1,34 @@
+import pytest
+
+from app.schemas.common_schema import ApplicationIdParam
+from app.services import datasets_service
+
+
+@pytest.mark.benchmark(group="list_datasets")
+def test_list_datasets(benchmark, repository):
+    assert datasets_service.list_datasets(None, None)
+    benchmark(datasets_service.list_datasets, None, None)
+
+
+@pytest.mark.benchmark(group="list_datasets")
+def test_list_datasets_by_application_and_city(benchmark, base, repository):
+    city_id = base.table("Datasets")[0]["fields"]["cities"].split(", ")[0]
+    args = (ApplicationIdParam.cid, city_id)
+    assert datasets_service.list_datasets(*args)
+    benchmark(datasets_service.list_datasets, *args)
+
+
+@pytest.mark.benchmark(group="list_datasets")
+def test_list_datasets_async(benchmark, repository, run_async):
+    assert run_async(datasets_service.list_datasets_async, None, None)
+    benchmark(run_async, datasets_service.list_datasets_async, None, None)
+
+
+@pytest.mark.benchmark(group="list_datasets")
+def test_list_datasets_by_application_and_city_async(
+    benchmark, base, repository, run_async
+):
+    city_id = base.table("Datasets")[0]["fields"]["cities"].split(", ")[0]
+    args = (ApplicationIdParam.cid, city_id)
+    assert run_async(datasets_service.list_datasets_async, *args)
+    benchmark(run_async, datasets_service.list_datasets_async, *args)
@@ -0,0 +1,32 @@
+import pytest
+
+from app.schemas.common_schema import ApplicationIdParam
+from app.services import indicators_service
+
+
+@pytest.mark.benchmark(group="list_indicators")
+def test_list_indicators(benchmark, repository):
+    assert indicators_service.list_indicators()
+    benchmark(indicators_service.list_indicators)
+
+
+@pytest.mark.benchmark(group="list_indicators")
+def test_list_indicators_by_application_and_city(benchmark, base, repository):
+    args = (ApplicationIdParam.cid, None, [f"city{base.cities // 2}"])
+    assert indicators_service.list_indicators(*args)
+    benchmark(indicators_service.list_indicators, *args)
+
+
+@pytest.mark.benchmark(group="list_indicators")
+def test_list_indicators_async(benchmark, repository, run_async):
+    assert run_async(indicators_service.list_indicators_async)
+    benchmark(run_async, indicators_service.list_indicators_async)
+
+
+@pytest.mark.benchmark(group="list_indicators")
+def test_list_indicators_by_application_and_city_async(
+    benchmark, base, repository, run_async
+):
+    args = (ApplicationIdParam.cid, None, [f"city{base.cities // 2}"])
+    assert run_async(indicators_service.list_indicators_async, *args)
+    benchmark(run_async, indicators_service.list_indicators_async, *args)
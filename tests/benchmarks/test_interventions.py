@@ -0,0 +1,9 @@
+import pytest
+
+from app.services import interventions_service
+
+
+@pytest.mark.benchmark(group="list_interventions")
+def test_list_interventions(benchmark, repository):
+    assert interventions_service.list_interventions()
+    benchmark(interventions_service.list_interventions)
@@ -0,0 +1,10 @@
+import pytest
+
+from app.services import layers_service
+
+
+@pytest.mark.benchmark(group="get_city_layer")
+def test_get_city_layer(benchmark, base, repository):
+    args = ("city0", "layer1", "aoi0_0", None)
+    assert layers_service.get_city_layer(*args)
+    benchmark(layers_service.get_city_layer, *args)
@@ -0,0 +1,37 @@
+import pytest
+
+from app.services import scenarios_service
+
+
+@pytest.mark.benchmark(group="scenarios")
+def test_get_scenario_by_city_id_aoi_id_intervention_category(
+    benchmark, base, repository
+):
+    intervention = base.table("Interventions")[-1]
+    args = (
+        base.text(intervention, "cities"),
+        base.text(intervention, "areas_of_interest"),
+        intervention["fields"]["category"],
+    )
+    get_scenarios = (
+        scenarios_service.get_scenario_by_city_id_aoi_id_intervention_category
+    )
+    assert get_scenarios(*args)
+    benchmark(get_scenarios, *args)
+
+
+@pytest.mark.benchmark(group="scenarios")
+def test_get_scenario_by_city_id_aoi_id_intervention_category_async(
+    benchmark, base, repository, run_async
+):
+    intervention = base.table("Interventions")[-1]
+    args = (
+        base.text(intervention, "cities"),
+        base.text(intervention, "areas_of_interest"),
+        intervention["fields"]["category"],
+    )
+    get_scenarios = (
+        scenarios_service.get_scenario_by_city_id_aoi_id_intervention_category_async
+    )
+    assert run_async(get_scenarios, *args)
+    benchmark(run_async, get_scenarios, *args)
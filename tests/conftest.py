@@ -0,0 +1,7 @@
+import os
+
+# Settings are loaded at import time by the app modules; provide placeholders so the
+# unit tests never need real Airtable credentials.
+os.environ.setdefault("CITIES_API_AIRTABLE_KEY", "your_test_api_key")
+os.environ.setdefault("AIRTABLE_BASE_ID", "appTestBase")
+os.environ.setdefault("ENV", "test")
@@ -0,0 +1,10 @@
+"""A local stand-in for the Airtable API, for load and integration tests.
+
+Serves the nine tables of the base from fixture files or a synthetic base of
+any size; see ``python -m tests.fake_airtable --help``.
+"""
+
+from tests.fake_airtable.base import FakeBase
+from tests.fake_airtable.server import FakeAirtable, create_app
+
+__all__ = ["FakeAirtable", "FakeBase", "create_app"]
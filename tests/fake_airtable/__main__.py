@@ -0,0 +1,66 @@
+import argparse
+
+import uvicorn
+
+from tests.fake_airtable.base import FIXTURES_DIR, FakeBase
+from tests.fake_airtable.server import FakeAirtable, create_app
+from tests.fake_airtable.synthetic import synthetic_base
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.fake_airtable",
+        description="Serve a fake Airtable base for load and integration tests.",
+    )
+    parser.add_argument(
+        "--fixtures", default=FIXTURES_DIR, help="directory of <Table>.json files"
+    )
+    parser.add_argument(
+        "--cities",
+        type=int,
+        help="serve a synthetic base of this many cities instead of the fixtures",
+    )
+    parser.add_argument(
+        "--dump", metavar="DIR", help="write the base as fixture files and exit"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=5,
+        help="requests per second before a 429, 0 for no limit (default: 5)",
+    )
+    parser.add_argument(
+        "--penalty-seconds",
+        type=float,
+        default=0.0,
+        help="keep answering 429 this long after the rate limit is hit",
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="fraction of the other requests answered with a 429",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    base = synthetic_base(args.cities) if args.cities else FakeBase.load(args.fixtures)
+    if args.dump:
+        base.dump(args.dump)
+        return
+    fake = FakeAirtable(
+        base,
+        rate_limit=args.rate_limit,
+        penalty_seconds=args.penalty_seconds,
+        throttle_rate=args.throttle_rate,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+    )
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from tests.fake_airtable.formula import Predicate, Record, compile_formula
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class FakeBase:
+    """The tables of an Airtable base, queried the way Airtable queries them."""
+
+    def __init__(self, tables: Dict[str, List[Record]]):
+        self.tables = tables
+        # Formulas see a linked record as the value of its primary field.
+        self._primary: Dict[str, Any] = {
+            r["id"]: r["fields"].get("id")
+            for records in tables.values()
+            for r in records
+        }
+
+    @classmethod
+    def load(cls, directory: str = FIXTURES_DIR) -> "FakeBase":
+        """Read every ``<Table>.json`` file of ``directory``."""
+        tables = {}
+        for name in sorted(os.listdir(directory)):
+            table, extension = os.path.splitext(name)
+            if extension == ".json":
+                with open(os.path.join(directory, name), encoding="utf-8") as f:
+                    tables[table] = json.load(f)["records"]
+        return cls(tables)
+
+    def dump(self, directory: str) -> None:
+        """Write the tables as fixture files, one record per line."""
+        os.makedirs(directory, exist_ok=True)
+        for table, records in self.tables.items():
+            with open(
+                os.path.join(directory, f"{table}.json"), "w", encoding="utf-8"
+            ) as f:
+                f.write('{"records": [\n')
+                f.write(",\n".join(json.dumps(r, ensure_ascii=False) for r in records))
+                f.write("\n]}\n")
+
+    def table(self, name: str) -> List[Record]:
+        return self.tables[name]
+
+    def text(self, record: Record, column: str) -> str:
+        """The value of ``column`` as a formula sees it."""
+        value = record["fields"].get(column)
+        if isinstance(value, list):
+            return ", ".join(str(self._primary.get(v, v)) for v in value)
+        return "" if value is None else str(value)
+
+    def predicate(self, formula: Optional[str]) -> Predicate:
+        return compile_formula(formula, self.text)
+
+    def select(
+        self,
+        table: str,
+        formula: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        max_records: Optional[int] = None,
+    ) -> List[Record]:
+        """The records Airtable would list for the query, ``fields`` projected."""
+        predicate = self.predicate(formula)
+        selected = []
+        for r in self.tables[table]:
+            if not predicate(r):
+                continue
+            if fields:
+                r = {
+                    **r,
+                    "fields": {k: v for k, v in r["fields"].items() if k in fields},
+                }
+            selected.append(r)
+            if max_records and len(selected) == max_records:
+                break
+        return selected
@@ -0,0 +1,131 @@
+"""Evaluate the ``filterByFormula`` forms the API sends to Airtable.
+
+Covers what ``app.utils.filters`` and the delta sync build: ``AND``, ``OR``,
+``SEARCH('value', {column})``, ``"value"={column}`` and
+``IS_AFTER(LAST_MODIFIED_TIME(), 'timestamp')``. Anything else is rejected the
+way Airtable rejects an invalid formula.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Record = Dict[str, Any]
+Predicate = Callable[[Record], bool]
+# How a formula sees a column of a record, e.g. links as their primary values
+ColumnText = Callable[[Record, str], str]
+
+_TOKEN = re.compile(
+    r"""\s*(?:(AND|OR|SEARCH|IS_AFTER|LAST_MODIFIED_TIME)\(|'([^']*)'|"([^"]*)"|\{([^}]*)\}|([,()=]))"""
+)
+
+
+class FormulaError(ValueError):
+    """A formula outside the supported forms."""
+
+
+def compile_formula(formula: Optional[str], text: ColumnText) -> Predicate:
+    """Compile ``formula`` into a predicate over records; empty matches all."""
+    if not formula or not formula.strip():
+        return lambda record: True
+    return _Parser(formula, text).parse()
+
+
+def _timestamp(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as e:
+        raise FormulaError(f"Invalid timestamp {value!r}") from e
+
+
+class _Parser:
+    """Recursive descent parser over terms: calls, strings and ``{columns}``.
+
+    Terms parse to ``(kind, value)`` pairs; a call or comparison is a
+    ``"predicate"``, ``LAST_MODIFIED_TIME()`` is a ``"modified"`` accessor.
+    """
+
+    def __init__(self, formula: str, text: ColumnText):
+        self.text = text
+        self.tokens: List[Tuple[Optional[str], ...]] = []
+        position, formula = 0, formula.rstrip()
+        while position < len(formula):
+            match = _TOKEN.match(formula, position)
+            if not match:
+                raise FormulaError(f"Unsupported formula {formula!r} at {position}")
+            self.tokens.append(match.groups())
+            position = match.end()
+        self.position = 0
+
+    def parse(self) -> Predicate:
+        kind, predicate = self._expression()
+        if kind != "predicate" or self.position != len(self.tokens):
+            raise FormulaError("The formula is not a condition")
+        return predicate
+
+    def _punct(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][4]
+        return None
+
+    def _expect(self, punct: str) -> None:
+        if self._punct() != punct:
+            raise FormulaError(f"Expected {punct!r}")
+        self.position += 1
+
+    def _expression(self) -> Tuple[str, Any]:
+        if self._punct() in (",", ")"):
+            # construct_filter_formula leaves an empty argument for an empty value
+            return "predicate", lambda record: True
+        left = self._term()
+        if self._punct() != "=":
+            return left
+        self.position += 1
+        right = self._term()
+        operands = {left[0]: left[1], right[0]: right[1]}
+        if set(operands) != {"string", "column"}:
+            raise FormulaError("'=' compares a string with a column")
+        value, column, text = operands["string"], operands["column"], self.text
+        return "predicate", lambda record: text(record, column) == value
+
+    def _term(self) -> Tuple[str, Any]:
+        if self.position == len(self.tokens):
+            raise FormulaError("Unexpected end of formula")
+        function, single, double, column, _ = self.tokens[self.position]
+        self.position += 1
+        if column is not None:
+            return "column", column
+        if single is not None or double is not None:
+            return "string", single if single is not None else double
+        if function is None:
+            raise FormulaError("Expected a term")
+        if function == "LAST_MODIFIED_TIME":
+            self._expect(")")
+            return "modified", lambda record: _timestamp(record["createdTime"])
+        arguments = [self._expression()]
+        while self._punct() == ",":
+            self.position += 1
+            arguments.append(self._expression())
+        self._expect(")")
+        return "predicate", self._call(function, arguments)
+
+    def _call(self, function: str, arguments: List[Tuple[str, Any]]) -> Predicate:
+        kinds = tuple(kind for kind, _ in arguments)
+        if function == "SEARCH":
+            if kinds != ("string", "column"):
+                raise FormulaError("SEARCH takes a string and a column")
+            (_, value), (_, column) = arguments
+            text = self.text
+            return lambda record: value in text(record, column)
+        if function == "IS_AFTER":
+            if kinds != ("modified", "string"):
+                raise FormulaError("IS_AFTER takes LAST_MODIFIED_TIME() and a string")
+            (_, modified), (_, value) = arguments
+            after = _timestamp(value)
+            return lambda record: modified(record) > after
+        if any(kind != "predicate" for kind in kinds):
+            raise FormulaError(f"{function} takes conditions")
+        predicates = [predicate for _, predicate in arguments]
+        if function == "AND":
+            return lambda record: all(p(record) for p in predicates)
+        return lambda record: any(p(record) for p in predicates)
@@ -0,0 +1,204 @@
+import asyncio
+import random
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response
+
+from tests.fake_airtable.base import FakeBase
+from tests.fake_airtable.formula import FormulaError, Record
+
+MAX_PAGE_SIZE = 100
+# Selections kept for the pages that follow the first one
+QUERY_CACHE_SIZE = 128
+
+QueryKey = Tuple[str, Optional[str], Optional[Tuple[str, ...]], Optional[int]]
+
+
+def _error(status: int, error_type: str, message: str) -> ORJSONResponse:
+    return ORJSONResponse(
+        {"error": {"type": error_type, "message": message}}, status_code=status
+    )
+
+
+class FakeAirtable:
+    """A local stand-in for the Airtable list-records API over a :class:`FakeBase`.
+
+    Requests beyond ``rate_limit`` per ``rate_limit_period`` seconds get a 429,
+    as Airtable answers more than 5 requests per second to a base, and keep
+    getting one for ``penalty_seconds`` after that. ``throttle_rate`` adds
+    random 429s on top. Every response is delayed by ``latency_ms`` plus up to
+    ``jitter_ms``.
+    """
+
+    def __init__(
+        self,
+        base: FakeBase,
+        rate_limit: int = 5,
+        rate_limit_period: float = 1.0,
+        penalty_seconds: float = 0.0,
+        throttle_rate: float = 0.0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.base = base
+        self.rate_limit = rate_limit
+        self.rate_limit_period = rate_limit_period
+        self.penalty_seconds = penalty_seconds
+        self.throttle_rate = throttle_rate
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._window: Deque[float] = deque()
+        self._penalty_until = 0.0
+        self._queries: "OrderedDict[QueryKey, List[Record]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._started_at = time.time()
+            self._requests: Counter = Counter()
+            self._throttled = 0
+            self._records = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "since": self._started_at,
+                "requests": sum(self._requests.values()),
+                "requests_by_table": dict(self._requests),
+                "throttled": self._throttled,
+                "records": self._records,
+            }
+
+    def admit(self, table: str) -> bool:
+        """Count a request to ``table``; False if it is to be throttled."""
+        now = time.monotonic()
+        with self._lock:
+            self._requests[table] += 1
+            while self._window and self._window[0] <= now - self.rate_limit_period:
+                self._window.popleft()
+            throttled = (
+                now < self._penalty_until
+                or (self.rate_limit and len(self._window) >= self.rate_limit)
+                or (self.throttle_rate and self._random.random() < self.throttle_rate)
+            )
+            if throttled:
+                self._throttled += 1
+                if now >= self._penalty_until and self.penalty_seconds:
+                    self._penalty_until = now + self.penalty_seconds
+                return False
+            self._window.append(now)
+            return True
+
+    async def delay(self) -> None:
+        seconds = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def page(
+        self,
+        table: str,
+        formula: Optional[str],
+        fields: Optional[List[str]],
+        max_records: Optional[int],
+        page_size: int,
+        offset: int,
+    ) -> Dict[str, Any]:
+        """One page of a list-records query, with the offset of the next one."""
+        key = (table, formula, tuple(fields) if fields else None, max_records)
+        with self._lock:
+            records = self._queries.get(key)
+            if records is not None:
+                self._queries.move_to_end(key)
+        if records is None:
+            records = self.base.select(table, formula, fields, max_records)
+            with self._lock:
+                self._queries[key] = records
+                while len(self._queries) > QUERY_CACHE_SIZE:
+                    self._queries.popitem(last=False)
+        page = records[offset : offset + page_size]
+        with self._lock:
+            self._records += len(page)
+        body: Dict[str, Any] = {"records": page}
+        if offset + page_size < len(records):
+            body["offset"] = f"itr{offset + page_size}/{table}"
+        return body
+
+    async def list_records(self, table: str, options: Dict[str, Any]) -> Response:
+        admitted = self.admit(table)
+        await self.delay()
+        if not admitted:
+            return ORJSONResponse(
+                {
+                    "errors": [
+                        {
+                            "error": "RATE_LIMIT_REACHED",
+                            "message": "Rate limit exceeded. Please try again later",
+                        }
+                    ]
+                },
+                status_code=429,
+            )
+        if table not in self.base.tables:
+            return _error(404, "TABLE_NOT_FOUND", f"Could not find table {table}")
+        try:
+            offset = int(str(options.get("offset") or "itr0").split("/")[0][3:])
+            page_size = min(
+                int(options.get("pageSize") or MAX_PAGE_SIZE), MAX_PAGE_SIZE
+            )
+            max_records = int(options.get("maxRecords") or 0) or None
+        except ValueError:
+            return _error(
+                422, "LIST_RECORDS_ITERATOR_NOT_AVAILABLE", "Invalid offset or size"
+            )
+        try:
+            body = await asyncio.to_thread(
+                self.page,
+                table,
+                options.get("filterByFormula"),
+                options.get("fields"),
+                max_records,
+                page_size,
+                offset,
+            )
+        except FormulaError as e:
+            return _error(422, "INVALID_FILTER_BY_FORMULA", str(e))
+        return ORJSONResponse(body)
+
+
+def create_app(fake: FakeAirtable) -> FastAPI:
+    """The HTTP app serving ``fake`` on Airtable's URLs.
+
+    ``GET /_fake/stats`` counts the requests by table and the 429s since start
+    or the last ``DELETE /_fake/stats``.
+    """
+    app = FastAPI(title="Fake Airtable")
+
+    @app.get("/v0/{base_id}/{table}")
+    async def list_records(base_id: str, table: str, request: Request):
+        params = request.query_params
+        options: Dict[str, Any] = dict(params)
+        options["fields"] = params.getlist("fields[]")
+        return await fake.list_records(table, options)
+
+    @app.post("/v0/{base_id}/{table}/listRecords")
+    async def list_records_post(base_id: str, table: str, request: Request):
+        # pyairtable switches to this form when the query string gets too long
+        options = {**request.query_params, **await request.json()}
+        return await fake.list_records(table, options)
+
+    @app.get("/_fake/stats")
+    def stats():
+        return fake.stats()
+
+    @app.delete("/_fake/stats", status_code=204)
+    def reset_stats():
+        fake.reset()
+
+    return app
@@ -0,0 +1,218 @@
+"""Synthetic Airtable bases shaped like the production one, at any scale.
+
+``synthetic_base(cities)`` builds every table the services read, with the
+linked-record fields, lookups and text columns they join on. Per city there are
+``AOIS_PER_CITY`` areas of interest and ``VALUES_PER_CITY`` indicator values;
+the shared tables (projects, indicators, layers, ...) have fixed sizes. Output
+is deterministic for a given scale.
+"""
+
+import json
+import random
+from typing import Any, Dict, List
+
+from tests.fake_airtable.base import FakeBase
+from tests.fake_airtable.formula import Record
+
+AOIS_PER_CITY = 10
+VALUES_PER_CITY = 100
+APPLICATIONS = ["cid", "ccl", "cif"]
+PROJECTS = 12
+INDICATORS = 120
+DATASETS = 40
+LAYERS = 200
+INTERVENTIONS = 24
+SCENARIOS_PER_INTERVENTION = 5
+INTERVENTION_CATEGORIES = ["greening", "roofs", "shade", "water"]
+THEMES = ["Heat", "Air", "Flooding", "Biodiversity", "Land use", "Access"]
+COUNTRIES = ["USA", "BRA", "MEX", "IND", "IDN", "ZAF", "ETH", "COL", "ARG", "KEN"]
+CREATED_TIME = "2024-01-01T00:00:00.000Z"
+
+
+def record(record_id: str, **fields: Any) -> Record:
+    return {"id": record_id, "createdTime": CREATED_TIME, "fields": fields}
+
+
+class SyntheticBase(FakeBase):
+    def __init__(self, cities: int, tables: Dict[str, List[Record]]):
+        super().__init__(tables)
+        self.cities = cities
+
+
+def synthetic_base(cities: int, seed: int = 0) -> SyntheticBase:
+    rng = random.Random(seed)
+    styling = json.dumps({"colors": ["#fff7bc", "#fec44f", "#d95f0e"], "opacity": 0.8})
+
+    projects = [
+        record(
+            f"recP{p}",
+            id=f"proj{p}",
+            application_id=[APPLICATIONS[p % len(APPLICATIONS)]],
+            name=[f"Project {p}"],
+            about_text=f"About project {p}. " * 10,
+        )
+        for p in range(PROJECTS)
+    ]
+    layers = [
+        record(
+            f"recL{l}",
+            id=f"layer{l}",
+            layer_name=f"Layer {l}",
+            layer_legend=f"Legend {l}",
+            s3_path=f"https://bucket.s3.amazonaws.com/data/prd/layers/layer{l}/",
+            layer_file_name=f"layer{l}",
+            version=str(2015 + l % 10),
+            file_type="tif" if l % 2 else "geojson",
+            layer_type="raster" if l % 2 else "vector",
+            cif_class_name=f"Class{l}",
+            datasets_id=[f"ds{l % DATASETS}"],
+            source_layer_id=f"src{l}",
+            layers_group_mask=f"group{l % 7}",
+            map_styling=styling,
+            legend_styling=styling,
+        )
+        for l in range(LAYERS)
+    ]
+
+    city_records = []
+    aois = []
+    values = []
+    for c in range(cities):
+        city_projects = rng.sample(projects, 2)
+        city_records.append(
+            record(
+                f"recC{c}",
+                id=f"city{c}",
+                name=f"City {c}",
+                country_name=f"Country {c % len(COUNTRIES)}",
+                country_code_iso3=COUNTRIES[c % len(COUNTRIES)],
+                admin_levels=["ADM0", "ADM1", "ADM2"],
+                city_admin_level="ADM2",
+                subcity_admin_level="ADM3",
+                latitude=rng.uniform(-60, 60),
+                longitude=rng.uniform(-180, 180),
+                projects=[p["id"] for p in city_projects],
+                s3_base_path=f"https://bucket.s3.amazonaws.com/data/prd/cities/city{c}/",
+            )
+        )
+        for a in range(AOIS_PER_CITY):
+            aois.append(
+                record(
+                    f"recA{c}_{a}",
+                    id=f"aoi{c}_{a}",
+                    cities=[f"recC{c}"],
+                    bounding_box=",".join(
+                        f"{rng.uniform(-90, 90):.5f}" for _ in range(4)
+                    ),
+                    application_id=APPLICATIONS[a % len(APPLICATIONS)],
+                )
+            )
+        for v in range(VALUES_PER_CITY):
+            indicator = (c + v) % INDICATORS
+            aoi = v % AOIS_PER_CITY
+            values.append(
+                record(
+                    f"recV{c}_{v}",
+                    id=f"IND_{indicator}",
+                    value=round(rng.uniform(0, 100), 4),
+                    time=str(2015 + v % 10),
+                    cities=[f"recC{c}"],
+                    cities_id=[f"city{c}"],
+                    areas_of_interest_id=[f"aoi{c}_{aoi}"],
+                    application_id=APPLICATIONS[aoi % len(APPLICATIONS)],
+                    indicators=[f"recI{indicator}"],
+                    scenarios_ids=[
+                        f"scen{v % (INTERVENTIONS * SCENARIOS_PER_INTERVENTION)}"
+                    ],
+                )
+            )
+
+    city_ids = [c["fields"]["id"] for c in city_records]
+    indicators = [
+        record(
+            f"recI{i}",
+            id=f"IND_{i}",
+            name=f"Indicator {i}",
+            cities=[c["id"] for c in city_records if rng.random() < 0.5],
+            projects=[p["id"] for p in rng.sample(projects, 3)],
+            layers=[f"recL{rng.randrange(LAYERS)}" for _ in range(3)],
+            data_sources_link=[f"recD{rng.randrange(DATASETS)}" for _ in range(2)],
+            themes=rng.sample(THEMES, 2),
+            definition=f"Definition of indicator {i}. " * 5,
+            methods=f"Methods of indicator {i}. " * 20,
+            importance="high",
+            legend=f"Legend {i}",
+            data_views=["map", "table"],
+            population_category="all",
+            year="2020",
+            notebook_url=f"https://example.org/notebooks/{i}",
+            unit="%",
+            cif_metric_name=f"metric{i}",
+            map_styling=styling,
+            legend_styling=styling,
+        )
+        for i in range(INDICATORS)
+    ]
+    datasets = [
+        record(
+            f"recD{d}",
+            id=f"ds{d}",
+            name=f"Dataset {d}",
+            description=f"Description of dataset {d}. " * 5,
+            source=f"Source {d}",
+            cities=", ".join(rng.sample(city_ids, min(len(city_ids), 20))),
+            indicators=[f"recI{rng.randrange(INDICATORS)}" for _ in range(3)],
+            layers=[f"recL{rng.randrange(LAYERS)}" for _ in range(3)],
+            application_id=APPLICATIONS[d % len(APPLICATIONS)],
+        )
+        for d in range(DATASETS)
+    ]
+    interventions = []
+    scenarios = []
+    for n in range(INTERVENTIONS):
+        # Scenario queries match an intervention on one city and one AOI.
+        city = n * cities // INTERVENTIONS
+        scenario_ids = [
+            f"recS{n * SCENARIOS_PER_INTERVENTION + s}"
+            for s in range(SCENARIOS_PER_INTERVENTION)
+        ]
+        interventions.append(
+            record(
+                f"recN{n}",
+                id=f"int{n}",
+                name=f"Intervention {n}",
+                category=INTERVENTION_CATEGORIES[n % len(INTERVENTION_CATEGORIES)],
+                cities=[f"recC{city}"],
+                areas_of_interest=[f"recA{city}_{n % AOIS_PER_CITY}"],
+                scenarios=scenario_ids,
+                card_intervention_long_description=f"Intervention {n}. " * 20,
+                tags=["nature-based"],
+            )
+        )
+        for s, scenario_id in enumerate(scenario_ids):
+            scenarios.append(
+                record(
+                    scenario_id,
+                    id=f"scen{n * SCENARIOS_PER_INTERVENTION + s}",
+                    name=f"Scenario {s} of intervention {n}",
+                    description=f"Scenario {s}. " * 10,
+                    Interventions=[f"recN{n}"],
+                    cities=[f"recC{city}"],
+                    layers=[f"recL{rng.randrange(LAYERS)}" for _ in range(4)],
+                )
+            )
+
+    return SyntheticBase(
+        cities=cities,
+        tables={
+            "Projects": projects,
+            "Cities": city_records,
+            "Areas_of_interest": aois,
+            "Indicators_values": values,
+            "Indicators": indicators,
+            "Datasets": datasets,
+            "Layers": layers,
+            "Interventions": interventions,
+            "Scenarios": scenarios,
+        },
+    )
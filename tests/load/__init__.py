@@ -0,0 +1,5 @@
+"""Load tests that replay a realistic mix of API requests.
+
+See ``python -m tests.load --help``; run the app against the Airtable stand-in
+of ``tests.fake_airtable`` to also measure the Airtable calls per request.
+"""
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import json
+import time
+from contextlib import AsyncExitStack
+
+import httpx
+
+from tests.fake_airtable.base import FIXTURES_DIR, FakeBase
+from tests.fake_airtable.synthetic import synthetic_base
+from tests.load.mix import DEFAULT_MIX, TrafficMix, parse_mix
+from tests.load.runner import LoadTest, format_report
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/health/ready")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise SystemExit(f"The app was not ready within {timeout:.0f} s")
+        await asyncio.sleep(0.5)
+
+
+async def run(args: argparse.Namespace) -> None:
+    base = synthetic_base(args.cities) if args.cities else FakeBase.load(args.fixtures)
+    mix = TrafficMix(base, parse_mix(args.mix), seed=args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with AsyncExitStack() as stack:
+        app = await stack.enter_async_context(
+            httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout)
+        )
+        airtable = None
+        if args.airtable_url:
+            airtable = await stack.enter_async_context(
+                httpx.AsyncClient(base_url=args.airtable_url)
+            )
+        if args.ready_timeout:
+            await wait_until_ready(app, args.ready_timeout)
+        report = await LoadTest(
+            app,
+            mix,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            warmup=args.warmup,
+            airtable=airtable,
+        ).run()
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.load",
+        description="Replay a mix of API requests and report throughput, latency "
+        "percentiles, errors and Airtable calls per request.",
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="the API")
+    parser.add_argument(
+        "--airtable-url",
+        help="the Airtable stand-in the API uses, e.g. http://127.0.0.1:8081",
+    )
+    parser.add_argument(
+        "--fixtures",
+        default=FIXTURES_DIR,
+        help="fixtures the stand-in serves, for the ids to request",
+    )
+    parser.add_argument(
+        "--cities",
+        type=int,
+        help="size of the synthetic base the stand-in serves, instead of --fixtures",
+    )
+    parser.add_argument(
+        "--mix",
+        default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+        help="relative weights of the endpoints (default: %(default)s)",
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="requests per second on a fixed schedule; default: a closed loop",
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="per request")
+    parser.add_argument(
+        "--ready-timeout",
+        type=float,
+        default=120.0,
+        help="wait this long for /health/ready first, 0 to start right away",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="also write the report here")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""The requests a load test sends, drawn from a weighted mix of endpoints.
+
+Paths are built from the ids of the base the Airtable stand-in serves, so
+every request names a city, layer or scenario that exists.
+"""
+
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from tests.fake_airtable.base import FakeBase
+
+# Share of the requests per endpoint, roughly the production traffic
+DEFAULT_MIX = {
+    "cities": 20,
+    "city": 25,
+    "indicators": 15,
+    "layer": 20,
+    "scenarios": 10,
+    "datasets": 10,
+}
+APPLICATIONS = [None, "cid", "ccl"]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``endpoint=weight,...``, e.g. ``city=3,layer=1``."""
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        endpoint, _, weight = item.partition("=")
+        if endpoint not in DEFAULT_MIX:
+            raise ValueError(
+                f"Unknown endpoint {endpoint!r}; expected one of {sorted(DEFAULT_MIX)}"
+            )
+        mix[endpoint] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("The mix gives no endpoint a weight")
+    return mix
+
+
+def _query(path: str, **params: Optional[str]) -> str:
+    present = {name: value for name, value in params.items() if value}
+    return f"{path}?{urlencode(present)}" if present else path
+
+
+class TrafficMix:
+    """Draws ``(endpoint, path)`` pairs according to the endpoint weights."""
+
+    def __init__(
+        self, base: FakeBase, mix: Dict[str, float], seed: Optional[int] = None
+    ):
+        self._random = random.Random(seed)
+        self._endpoints = [endpoint for endpoint, weight in mix.items() if weight > 0]
+        self._weights = [mix[endpoint] for endpoint in self._endpoints]
+
+        self.city_ids = [r["fields"]["id"] for r in base.table("Cities")]
+        self.countries = sorted(
+            {r["fields"]["country_code_iso3"] for r in base.table("Cities")}
+        )
+        self.layer_ids = [r["fields"]["id"] for r in base.table("Layers")]
+        # Scenario queries match an intervention on its one city and AOI
+        self.scenarios: List[Tuple[str, str, str]] = [
+            (
+                base.text(r, "cities"),
+                base.text(r, "areas_of_interest"),
+                r["fields"]["category"],
+            )
+            for r in base.table("Interventions")
+            if r["fields"].get("cities") and r["fields"].get("areas_of_interest")
+        ]
+        self._paths: Dict[str, Callable[[], str]] = {
+            "cities": self._cities,
+            "city": self._city,
+            "indicators": self._indicators,
+            "layer": self._layer,
+            "scenarios": self._scenarios,
+            "datasets": self._datasets,
+        }
+
+    def next(self) -> Tuple[str, str]:
+        endpoint = self._random.choices(self._endpoints, self._weights)[0]
+        return endpoint, self._paths[endpoint]()
+
+    def _maybe(self, values: List, probability: float = 0.5):
+        return (
+            self._random.choice(values) if self._random.random() < probability else None
+        )
+
+    def _cities(self) -> str:
+        return _query(
+            "/cities",
+            application_id=self._random.choice(APPLICATIONS),
+            country_code_iso3=self._maybe(self.countries, 0.3),
+        )
+
+    def _city(self) -> str:
+        return _query(
+            f"/cities/{self._random.choice(self.city_ids)}",
+            application_id=self._random.choice(APPLICATIONS),
+        )
+
+    def _indicators(self) -> str:
+        return _query("/indicators", city_id=self._maybe(self.city_ids))
+
+    def _layer(self) -> str:
+        layer_id = self._random.choice(self.layer_ids)
+        return f"/layers/{layer_id}/{self._random.choice(self.city_ids)}"
+
+    def _scenarios(self) -> str:
+        city_id, aoi_id, category = self._random.choice(self.scenarios)
+        return f"/scenarios/{city_id}/{aoi_id}/{category}"
+
+    def _datasets(self) -> str:
+        return _query(
+            "/datasets",
+            application_id=self._random.choice(APPLICATIONS),
+            city_id=self._maybe(self.city_ids),
+        )
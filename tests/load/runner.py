@@ -0,0 +1,207 @@
+import asyncio
+import math
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from tests.load.mix import TrafficMix
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.latencies_ms: List[float] = []
+        self.statuses: Counter = Counter()
+
+    def record(self, status: str, latency_ms: float) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.statuses[status] += 1
+
+    def merge(self, other: "EndpointStats") -> None:
+        self.latencies_ms.extend(other.latencies_ms)
+        self.statuses.update(other.statuses)
+
+    def summary(self, seconds: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        requests = len(latencies)
+        # Server errors and failed connections; a 404 is an answer
+        errors = sum(n for status, n in self.statuses.items() if status[0] not in "234")
+        return {
+            "requests": requests,
+            "throughput_rps": round(requests / seconds, 2) if seconds else 0.0,
+            "errors": errors,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+            "latency_ms": {
+                "mean": round(sum(latencies) / requests, 2) if requests else 0.0,
+                "p50": round(percentile(latencies, 0.5), 2),
+                "p90": round(percentile(latencies, 0.9), 2),
+                "p99": round(percentile(latencies, 0.99), 2),
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+        }
+
+
+class LoadTest:
+    """Sends the requests of a traffic mix to the app and measures the answers.
+
+    Without ``rate`` it is a closed loop: ``concurrency`` clients each send
+    their next request when the last one is answered. With ``rate`` requests
+    start on a fixed schedule, at most ``concurrency`` at a time, and latency
+    counts from the scheduled start, so a slow app is not hidden by clients
+    that slowed down with it. ``warmup`` seconds of traffic go unrecorded.
+
+    Given a client for the Airtable stand-in, the report includes the Airtable
+    calls made per API request, read from its ``/_fake/stats``.
+    """
+
+    def __init__(
+        self,
+        app: httpx.AsyncClient,
+        mix: TrafficMix,
+        duration: float,
+        concurrency: int = 10,
+        rate: Optional[float] = None,
+        warmup: float = 0.0,
+        airtable: Optional[httpx.AsyncClient] = None,
+    ):
+        self.app = app
+        self.mix = mix
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rate = rate
+        self.warmup = warmup
+        self.airtable = airtable
+
+    async def run(self) -> Dict[str, Any]:
+        if self.warmup:
+            await self._phase(self.warmup)
+        airtable_before = await self._airtable_stats()
+        started = time.perf_counter()
+        stats = await self._phase(self.duration)
+        seconds = time.perf_counter() - started
+        airtable_after = await self._airtable_stats()
+
+        total = EndpointStats()
+        for endpoint_stats in stats.values():
+            total.merge(endpoint_stats)
+        report = {
+            "duration_s": round(seconds, 2),
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            **total.summary(seconds),
+            "endpoints": {
+                endpoint: endpoint_stats.summary(seconds)
+                for endpoint, endpoint_stats in sorted(stats.items())
+            },
+        }
+        if airtable_before is not None and airtable_after is not None:
+            report["airtable"] = _airtable_delta(
+                airtable_before, airtable_after, report["requests"]
+            )
+        return report
+
+    async def _phase(self, seconds: float) -> Dict[str, EndpointStats]:
+        stats: Dict[str, EndpointStats] = {}
+        deadline = time.perf_counter() + seconds
+        if self.rate:
+            await self._open_loop(stats, deadline)
+        else:
+            await asyncio.gather(
+                *(self._closed_loop(stats, deadline) for _ in range(self.concurrency))
+            )
+        return stats
+
+    async def _closed_loop(
+        self, stats: Dict[str, EndpointStats], deadline: float
+    ) -> None:
+        while time.perf_counter() < deadline:
+            await self._send(stats, time.perf_counter())
+
+    async def _open_loop(
+        self, stats: Dict[str, EndpointStats], deadline: float
+    ) -> None:
+        slots = asyncio.Semaphore(self.concurrency)
+        interval = 1 / self.rate
+        scheduled = time.perf_counter()
+        tasks = set()
+
+        async def send(at: float) -> None:
+            async with slots:
+                await self._send(stats, at)
+
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(send(scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            scheduled += interval
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _send(self, stats: Dict[str, EndpointStats], started: float) -> None:
+        endpoint, path = self.mix.next()
+        try:
+            response = await self.app.get(path)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        latency_ms = (time.perf_counter() - started) * 1000
+        stats.setdefault(endpoint, EndpointStats()).record(status, latency_ms)
+
+    async def _airtable_stats(self) -> Optional[Dict[str, Any]]:
+        if self.airtable is None:
+            return None
+        response = await self.airtable.get("/_fake/stats")
+        response.raise_for_status()
+        return response.json()
+
+
+def _airtable_delta(
+    before: Dict[str, Any], after: Dict[str, Any], api_requests: int
+) -> Dict[str, Any]:
+    requests = after["requests"] - before["requests"]
+    by_table = Counter(after["requests_by_table"])
+    by_table.subtract(before["requests_by_table"])
+    return {
+        "requests": requests,
+        "throttled": after["throttled"] - before["throttled"],
+        "requests_by_table": {table: n for table, n in sorted(by_table.items()) if n},
+        "calls_per_request": round(requests / api_requests, 3) if api_requests else 0.0,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a report as a plain text table."""
+    header = (
+        f"{'endpoint':<12} {'requests':>9} {'rps':>8} {'errors':>7} "
+        f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    )
+    rows = [header, "-" * len(header)]
+    for name, summary in [*report["endpoints"].items(), ("total", report)]:
+        latency = summary["latency_ms"]
+        rows.append(
+            f"{name:<12} {summary['requests']:>9} {summary['throughput_rps']:>8.1f} "
+            f"{summary['error_rate']:>7.1%} {latency['p50']:>9.1f} "
+            f"{latency['p90']:>9.1f} {latency['p99']:>9.1f} {latency['max']:>9.1f}"
+        )
+    airtable = report.get("airtable")
+    if airtable:
+        rows.append("")
+        rows.append(
+            f"Airtable: {airtable['requests']} calls, "
+            f"{airtable['calls_per_request']:.3f} per API request, "
+            f"{airtable['throttled']} throttled"
+        )
+    return "\n".join(rows)
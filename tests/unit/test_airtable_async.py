@@ -0,0 +1,154 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.services.datasets_service import list_datasets_async
+from app.utils.airtable_async import AsyncAirtableClient
+from app.utils.rate_limiter import RateLimiter
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def make_client(handler):
+    return AsyncAirtableClient(
+        api_key="key",
+        base_id="appTest",
+        rate_limiter=RateLimiter(calls=100, period=1),
+        backoff_factor=0,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+# Test Cases
+@pytest.mark.unit
+class TestAsyncAirtableClient:
+    def test_all_follows_offset_pages(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if "offset" not in request.url.params:
+                return httpx.Response(
+                    200, json={"records": [{"id": "rec1"}], "offset": "page2"}
+                )
+            return httpx.Response(200, json={"records": [{"id": "rec2"}]})
+
+        records = run(make_client(handler).all("Cities", view="all", formula="1"))
+
+        assert [record["id"] for record in records] == ["rec1", "rec2"]
+        assert requests[0].url.path == "/v0/appTest/Cities"
+        assert requests[0].url.params["filterByFormula"] == "1"
+        assert requests[0].headers["Authorization"] == "Bearer key"
+
+    def test_retries_rate_limited_responses(self):
+        responses = [
+            httpx.Response(429, json={}),
+            httpx.Response(200, json={"records": [{"id": "rec1"}]}),
+        ]
+
+        record = run(make_client(lambda request: responses.pop(0)).first("Cities"))
+
+        assert record == {"id": "rec1"}
+
+    def test_retries_transport_errors(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) < 3:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json={"records": [{"id": "rec1"}]})
+
+        record = run(make_client(handler).first("Cities"))
+
+        assert record == {"id": "rec1"}
+        assert len(attempts) == 3
+
+    def test_gives_up_after_max_retries(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        client = make_client(handler)
+        client.max_retries = 1
+
+        with pytest.raises(httpx.ReadTimeout):
+            run(client.first("Cities"))
+        assert len(attempts) == 2
+
+    def test_falls_back_to_all_fields_on_unknown_field(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if "fields[]" in request.url.params:
+                return httpx.Response(
+                    422, json={"error": {"type": "UNKNOWN_FIELD_NAME"}}
+                )
+            return httpx.Response(200, json={"records": [{"id": "rec1"}]})
+
+        client = make_client(handler)
+        records = run(client.all("Cities", fields=["id", "gone"]))
+
+        assert records == [{"id": "rec1"}]
+        assert requests[0].url.params.get_list("fields[]") == ["id", "gone"]
+        assert "fields[]" not in requests[1].url.params
+
+        # The rejected projection is not sent again.
+        assert run(client.all("Cities", fields=["id", "gone"])) == [{"id": "rec1"}]
+        assert len(requests) == 3 and "fields[]" not in requests[2].url.params
+        run(client.all("Cities", fields=["id"]))
+        assert requests[3].url.params.get_list("fields[]") == ["id"]
+
+    def test_first_returns_none_without_records(self):
+        client = make_client(lambda request: httpx.Response(200, json={"records": []}))
+
+        assert run(client.first("Cities")) is None
+
+
+@pytest.mark.unit
+class TestListDatasetsAsync:
+    @patch("app.services.datasets_service.fetch_datasets_async", new_callable=AsyncMock)
+    @patch("app.services.datasets_service.fetch_cities_async", new_callable=AsyncMock)
+    @patch(
+        "app.services.datasets_service.fetch_indicators_async", new_callable=AsyncMock
+    )
+    @patch("app.services.datasets_service.fetch_layers_async", new_callable=AsyncMock)
+    def test_list_datasets_async(
+        self,
+        mock_fetch_layers,
+        mock_fetch_indicators,
+        mock_fetch_cities,
+        mock_fetch_datasets,
+    ):
+        mock_fetch_layers.return_value = [{"id": "layer1", "fields": {"id": "layer_1"}}]
+        mock_fetch_indicators.return_value = [{"id": "ind1", "fields": {"id": "IND_1"}}]
+        mock_fetch_cities.return_value = [{"id": "rec1", "fields": {"id": "city1"}}]
+        mock_fetch_datasets.return_value = [
+            {
+                "id": "ds1",
+                "fields": {
+                    "name": "Dataset 1",
+                    "indicators": ["ind1"],
+                    "cities": "city1",
+                    "layers": ["layer1"],
+                },
+            }
+        ]
+
+        result = run(list_datasets_async(None, "city1"))
+
+        assert result == [
+            {
+                "name": "Dataset 1",
+                "city_ids": ["city1"],
+                "indicators": ["IND_1"],
+                "layers": ["layer_1"],
+            }
+        ]
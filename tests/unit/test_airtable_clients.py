@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from app.utils.airtable_async import RETRY_STATUS_CODES
+from app.utils.airtable_clients import AirtableClients, ProjectedTable
+from app.utils.rate_limiter import RateLimitedAdapter
+from app.utils.settings import Settings
+
+
+# Test Cases
+@pytest.mark.unit
+class TestAirtableClients:
+    def test_tables_share_one_pooled_session(self):
+        clients = AirtableClients(
+            Settings(airtable_pool_maxsize=7, airtable_rate_limit_state_dir="")
+        )
+
+        cities = clients.table("Cities")
+        projects = clients.table("Projects")
+        adapter = clients.api.session.get_adapter("https://api.airtable.com/v0/")
+
+        assert clients.table("Cities") is cities
+        assert cities.api is projects.api is clients.api
+        assert isinstance(adapter, RateLimitedAdapter)
+        assert adapter._pool_maxsize == 7  # pylint: disable=protected-access
+
+    def test_async_client_shares_the_rate_limiter(self):
+        clients = AirtableClients(Settings(airtable_rate_limit_state_dir=""))
+
+        adapter = clients.api.session.get_adapter("https://api.airtable.com/v0/")
+
+        assert clients.async_client.rate_limiter is adapter.rate_limiter
+
+    def test_sync_and_async_clients_retry_the_same_statuses(self):
+        clients = AirtableClients(Settings(airtable_rate_limit_state_dir=""))
+
+        adapter = clients.api.session.get_adapter("https://api.airtable.com/v0/")
+
+        assert set(adapter.max_retries.status_forcelist) == RETRY_STATUS_CODES
+
+    def test_table_drops_rejected_projection(self):
+        clients = AirtableClients(Settings(airtable_rate_limit_state_dir=""))
+        response = MagicMock(status_code=422)
+        response.json.return_value = {"error": {"type": "UNKNOWN_FIELD_NAME"}}
+        calls = []
+
+        def iterate(_table, **options):
+            calls.append(options)
+            if "fields" in options:
+                raise requests.HTTPError(response=response)
+            yield [{"id": "rec1", "fields": {}}]
+
+        with patch("pyairtable.Table.iterate", iterate):
+            records = clients.table("Cities").all(view="all", fields=["gone"])
+
+        assert isinstance(clients.table("Cities"), ProjectedTable)
+        assert records == [{"id": "rec1", "fields": {}}]
+        assert [options.get("fields") for options in calls] == [["gone"], None]
+
+        # Later queries skip the projection, in both clients.
+        with patch("pyairtable.Table.iterate", iterate):
+            clients.table("Cities").all(view="all", fields=["gone"])
+
+        assert [options.get("fields") for options in calls] == [["gone"], None, None]
+        assert clients.async_client.rejected_projections == {("Cities", ("gone",))}
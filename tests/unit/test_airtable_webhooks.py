@@ -0,0 +1,178 @@
+import base64
+import hashlib
+import hmac
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+from pyairtable import Api
+from requests.adapters import BaseAdapter
+
+from app.main import app
+from app.routers import internal_router
+from app.utils.airtable_webhooks import AirtableWebhooks
+from app.utils.snapshot import SnapshotCache
+
+SECRET = base64.b64encode(b"webhook secret").decode()
+
+
+def payload(changed_tables):
+    return {
+        "timestamp": "2024-01-01T00:00:00.000Z",
+        "baseTransactionNumber": 1,
+        "payloadFormat": "v0",
+        "changedTablesById": changed_tables,
+    }
+
+
+class FakeWebhookAdapter(BaseAdapter):
+    """Local stand-in for Airtable's webhook payload and schema endpoints."""
+
+    def __init__(self, payloads):
+        super().__init__()
+        self.payloads = payloads
+        self.page_size = 1
+
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        if url.path.endswith("/payloads"):
+            cursor = int(parse_qs(url.query)["cursor"][0])
+            page = self.payloads[cursor - 1 : cursor - 1 + self.page_size]
+            body = {
+                "payloads": page,
+                "cursor": cursor + len(page),
+                "mightHaveMore": cursor - 1 + len(page) < len(self.payloads),
+            }
+        elif url.path.endswith("/webhooks"):
+            body = {"webhooks": [self._webhook()]}
+        else:
+            body = {"tables": [self._table("tblC", "Cities")]}
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(body).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+    def _webhook(self):
+        return {
+            "id": "achW",
+            "areNotificationsEnabled": True,
+            "cursorForNextPayload": len(self.payloads) + 1,
+            "isHookEnabled": True,
+            "lastSuccessfulNotificationTime": None,
+            "notificationUrl": "https://example.com/internal/airtable/webhook",
+            "lastNotificationResult": None,
+            "expirationTime": None,
+            "specification": {"options": {"filters": {"dataTypes": ["tableData"]}}},
+        }
+
+    @staticmethod
+    def _table(table_id, name):
+        return {
+            "id": table_id,
+            "name": name,
+            "primaryFieldId": "fldId",
+            "fields": [{"id": "fldId", "name": "id", "type": "singleLineText"}],
+            "views": [],
+        }
+
+
+# Fixtures
+@pytest.fixture
+def cache():
+    return SnapshotCache(default_ttl=60)
+
+
+@pytest.fixture
+def stand_in():
+    return FakeWebhookAdapter([])
+
+
+@pytest.fixture
+def webhooks(cache, stand_in):
+    api = Api("key")
+    api.session.mount("https://", stand_in)
+    return AirtableWebhooks(cache, lambda: api.base("appB"))
+
+
+# Test Cases
+@pytest.mark.unit
+class TestAirtableWebhooks:
+    def test_first_notification_expires_everything(self, cache, webhooks):
+        cache.get("Cities", ("all", None), lambda: [{"id": "rec1"}])
+
+        assert webhooks.process("achW") == {}
+        entry = cache._entries[("Cities", ("all", None))]
+        assert entry.expired and cache.is_stale("Cities", entry)
+
+    def test_payloads_are_applied_from_the_cursor(self, cache, webhooks, stand_in):
+        webhooks.process("achW")
+        cache.get("Cities", ("all", None), lambda: [{"id": "rec1"}, {"id": "rec2"}])
+        stand_in.payloads += [
+            payload({"tblC": {"destroyedRecordIds": ["rec1"]}}),
+            payload({"tblOther": {"destroyedRecordIds": ["recX"]}}),
+        ]
+
+        changes = webhooks.process("achW")
+        entry = cache._entries[("Cities", ("all", None))]
+
+        assert list(changes) == ["Cities"] and not changes["Cities"].expire
+        assert entry.records == [{"id": "rec2"}] and entry.age < 60
+
+        stand_in.payloads.append(
+            payload(
+                {
+                    "tblC": {
+                        "changedRecordsById": {
+                            "rec2": {"current": {"cellValuesByFieldId": {"fldId": "x"}}}
+                        }
+                    }
+                }
+            )
+        )
+        assert webhooks.process("achW")["Cities"].expire
+        entry = cache._entries[("Cities", ("all", None))]
+        assert entry.expired and cache.is_stale("Cities", entry)
+
+
+@pytest.mark.unit
+class TestWebhookRouter:
+    @pytest.fixture(autouse=True)
+    def no_prewarm(self, mocker):
+        mocker.patch("app.main.prewarm.start")
+
+    def notify(self, body, mac):
+        with TestClient(app) as client:
+            return client.post(
+                "/internal/airtable/webhook",
+                content=body,
+                headers={"X-Airtable-Content-MAC": mac},
+            )
+
+    def test_notifications_are_authenticated(self, mocker):
+        mocker.patch.object(
+            internal_router.settings, "airtable_webhook_mac_secret", SECRET
+        )
+        mocker.patch.object(internal_router.settings, "airtable_base_id", "appB")
+        process = mocker.patch.object(internal_router.airtable_webhooks, "process")
+        body = json.dumps(
+            {
+                "base": {"id": "appB"},
+                "webhook": {"id": "achW"},
+                "timestamp": "2024-01-01T00:00:00.000Z",
+            }
+        )
+        mac = hmac.new(b"webhook secret", body.encode(), hashlib.sha256).hexdigest()
+
+        assert self.notify(body, "hmac-sha256=bad").status_code == 401
+        response = self.notify(body, f"hmac-sha256={mac}")
+
+        assert response.json() == {"status": "accepted"}
+        process.assert_called_once_with("achW")
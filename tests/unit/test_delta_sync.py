@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from app.utils.delta_sync import DeltaSync, merge_records, modified_since_formula
+
+
+def record(record_id, value):
+    return {"id": record_id, "fields": {"id": record_id, "value": value}}
+
+
+RECORDS = [record("rec1", 1), record("rec2", 2), record("rec3", 3)]
+
+
+class FakeTable:
+    """Answers delta, listing and full fetches like Airtable would."""
+
+    def __init__(self, records, changed):
+        self.records = records
+        self.changed = changed
+        self.calls = []
+
+    def fetch(self, formula, fields):
+        self.calls.append((formula, fields))
+        if formula and "LAST_MODIFIED_TIME" in formula:
+            return self.changed
+        return self.records
+
+
+# Test Cases
+@pytest.mark.unit
+class TestMergeRecords:
+    def test_changed_records_replace_in_place_and_new_ones_append(self):
+        merged = merge_records(RECORDS, [record("rec2", 20), record("rec4", 4)])
+
+        assert [r["fields"]["value"] for r in merged] == [1, 20, 3, 4]
+        assert merged[0] is RECORDS[0]
+
+    def test_listing_drops_deleted_records(self):
+        merged = merge_records(RECORDS, [], ["rec3", "rec1"])
+
+        assert [r["id"] for r in merged] == ["rec3", "rec1"]
+
+    def test_unchanged_snapshot_keeps_its_identity(self):
+        assert merge_records(RECORDS, []) is RECORDS
+        assert merge_records(RECORDS, [], ["rec1", "rec2", "rec3"]) is RECORDS
+
+
+@pytest.mark.unit
+class TestDeltaSync:
+    def test_modified_since_formula_keeps_the_query_filter(self):
+        assert modified_since_formula("{a}='x'", 0) == (
+            "AND({a}='x', IS_AFTER(LAST_MODIFIED_TIME(), '1970-01-01T00:00:00.000Z'))"
+        )
+
+    def test_refresh_fetches_changes_and_lists_ids_periodically(self):
+        sync = DeltaSync(listing_interval=900, full_refresh_interval=3600, overlap=0)
+        table = FakeTable(RECORDS[:2], [record("rec1", 10)])
+
+        records = sync.load("key", table.fetch, None, ["id", "value"])
+        refreshed = sync.refresh("key", records, 0, table.fetch, None, ["id", "value"])
+
+        assert [r["fields"]["value"] for r in refreshed] == [10, 2]
+        assert "LAST_MODIFIED_TIME" in table.calls[1][0]
+        assert len(table.calls) == 2
+
+    def test_first_refresh_of_an_unknown_snapshot_lists_ids(self):
+        sync = DeltaSync(listing_interval=900, full_refresh_interval=3600, overlap=0)
+        table = FakeTable(RECORDS[:2], [])
+
+        refreshed = sync.refresh("key", RECORDS, time.time(), table.fetch, None, ["id"])
+
+        assert [r["id"] for r in refreshed] == ["rec1", "rec2"]
+        assert table.calls[1] == (None, ["id"]) and len(table.calls) == 2
+
+    def test_unprojected_or_old_snapshots_are_reloaded(self):
+        sync = DeltaSync(listing_interval=900, full_refresh_interval=0, overlap=0)
+        table = FakeTable(RECORDS, [])
+
+        sync.refresh("key", [], 0, table.fetch, "{a}='x'", ["id"])
+        sync.refresh("other", [], 0, table.fetch, None, None)
+
+        assert table.calls == [("{a}='x'", ["id"]), (None, None)]
@@ -0,0 +1,51 @@
+import contextvars
+import threading
+
+import pytest
+
+from app.utils.executor import UpstreamExecutor
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+# Test Cases
+@pytest.mark.unit
+class TestUpstreamExecutor:
+    def test_tasks_see_the_submitting_context(self):
+        executor = UpstreamExecutor(max_workers=2)
+        request_id.set("req-1")
+
+        assert executor.submit(request_id.get).result() == "req-1"
+        executor.shutdown()
+
+    def test_gauges_track_queued_and_active_tasks(self):
+        executor = UpstreamExecutor(max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(timeout=5)
+
+        first = executor.submit(block)
+        second = executor.submit(lambda: None)
+        assert started.wait(timeout=5)
+        stats = executor.stats()
+        release.set()
+        first.result(), second.result()
+
+        assert stats["active"] == 1 and stats["queued"] == 1
+        assert executor.stats() == {
+            "max_workers": 1,
+            "queued": 0,
+            "active": 0,
+            "completed": 2,
+        }
+        executor.shutdown()
+
+    def test_pool_is_recreated_after_shutdown(self):
+        executor = UpstreamExecutor(max_workers=1)
+        executor.submit(lambda: None).result()
+        executor.shutdown()
+
+        assert executor.submit(lambda: 1).result() == 1
+        executor.shutdown()
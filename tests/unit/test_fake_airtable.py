@@ -0,0 +1,173 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.utils.airtable_async import AsyncAirtableClient
+from app.utils.airtable_clients import AirtableClients
+from app.utils.filters import construct_filter_formula, construct_filter_formula_v2
+from app.utils.rate_limiter import RateLimiter
+from app.utils.settings import Settings
+from tests.fake_airtable import FakeAirtable, FakeBase, create_app
+from tests.fake_airtable.formula import FormulaError
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture(scope="module")
+def base():
+    return FakeBase.load()
+
+
+def ids(records):
+    return [record["fields"]["id"] for record in records]
+
+
+# Test Cases
+@pytest.mark.unit
+class TestFakeBase:
+    def test_loads_the_nine_tables(self, base):
+        assert sorted(base.tables) == [
+            "Areas_of_interest",
+            "Cities",
+            "Datasets",
+            "Indicators",
+            "Indicators_values",
+            "Interventions",
+            "Layers",
+            "Projects",
+            "Scenarios",
+        ]
+
+    def test_search_matches_linked_records_by_primary_field(self, base):
+        formula = construct_filter_formula(
+            {"projects": ["deepdive", "coolcities"], "country_code_iso3": "MEX"}
+        )
+
+        assert ids(base.select("Cities", formula)) == ["MEX-Monterrey"]
+
+    def test_equals_compares_the_whole_value(self, base):
+        formula = construct_filter_formula_v2(
+            {"category": "greening", "cities": "BRA-Florianopolis"}
+        )
+
+        assert ids(base.select("Interventions", formula)) == ["trees_florianopolis"]
+        assert base.select("Cities", '"BRA" = {id}') == []
+
+    def test_empty_clauses_match_everything(self, base):
+        formula = "AND(, SEARCH('cid', {application_id}))"
+
+        assert ids(base.select("Projects", formula)) == ["urbanshift", "deepdive"]
+
+    def test_modified_since(self, base):
+        after = "IS_AFTER(LAST_MODIFIED_TIME(), '{}')"
+
+        assert base.select("Cities", after.format("2030-01-01T00:00:00.000Z")) == []
+        assert len(base.select("Cities", after.format("2020-01-01T00:00:00.000Z"))) == 4
+
+    def test_projects_fields_and_limits_records(self, base):
+        records = base.select("Cities", None, ["id", "name"], max_records=2)
+
+        assert [sorted(record["fields"]) for record in records] == [["id", "name"]] * 2
+
+    @pytest.mark.parametrize("formula", ["NOT({id})", "SEARCH({id}, 'x')", "AND('x')"])
+    def test_rejects_unsupported_formulas(self, base, formula):
+        with pytest.raises(FormulaError):
+            base.select("Cities", formula)
+
+
+@pytest.mark.unit
+class TestFakeAirtableServer:
+    def test_paginates_with_offset(self, base):
+        client = TestClient(create_app(FakeAirtable(base, rate_limit=0)))
+
+        first = client.get("/v0/appB/Indicators_values", params={"pageSize": 10}).json()
+        second = client.get(
+            "/v0/appB/Indicators_values",
+            params={"pageSize": 10, "offset": first["offset"]},
+        ).json()
+
+        assert len(first["records"]) == 10
+        assert "offset" not in second
+        assert len(first["records"]) + len(second["records"]) == len(
+            base.table("Indicators_values")
+        )
+
+    def test_lists_records_by_post(self, base):
+        client = TestClient(create_app(FakeAirtable(base, rate_limit=0)))
+
+        response = client.post(
+            "/v0/appB/Cities/listRecords",
+            json={"filterByFormula": '"IND-Pune" = {id}', "fields": ["name"]},
+        )
+
+        assert response.json()["records"][0]["fields"] == {"name": "Pune"}
+
+    def test_answers_errors_like_airtable(self, base):
+        client = TestClient(create_app(FakeAirtable(base, rate_limit=0)))
+
+        invalid = client.get("/v0/appB/Cities", params={"filterByFormula": "NOT(1)"})
+        missing = client.get("/v0/appB/Nowhere")
+
+        assert invalid.status_code == 422
+        assert invalid.json()["error"]["type"] == "INVALID_FILTER_BY_FORMULA"
+        assert missing.status_code == 404
+
+    def test_throttles_beyond_the_rate_limit(self, base):
+        fake = FakeAirtable(base, rate_limit=5, rate_limit_period=60)
+        client = TestClient(create_app(fake))
+
+        statuses = [client.get("/v0/appB/Projects").status_code for _ in range(7)]
+        stats = client.get("/_fake/stats").json()
+
+        assert statuses == [200] * 5 + [429] * 2
+        assert stats["requests"] == 7
+        assert stats["requests_by_table"] == {"Projects": 7}
+        assert stats["throttled"] == 2
+        assert client.delete("/_fake/stats").status_code == 204
+        assert fake.stats()["requests"] == 0
+
+    def test_injects_random_throttling(self, base):
+        fake = FakeAirtable(base, rate_limit=0, throttle_rate=1.0)
+
+        response = TestClient(create_app(fake)).get("/v0/appB/Projects")
+
+        assert response.status_code == 429
+        assert response.json()["errors"][0]["error"] == "RATE_LIMIT_REACHED"
+
+    def test_async_client_reads_every_page(self, base):
+        fake = FakeAirtable(base, rate_limit=0)
+        client = AsyncAirtableClient(
+            api_key="key",
+            base_id="appB",
+            rate_limiter=RateLimiter(calls=100, period=1),
+            endpoint_url="http://fake-airtable",
+            transport=httpx.ASGITransport(app=create_app(fake)),
+        )
+
+        records = run(client.all("Indicators_values", formula='"cid"={application_id}'))
+
+        assert records == base.select("Indicators_values", '"cid"={application_id}')
+        assert fake.stats()["requests"] == 1
+
+
+@pytest.mark.unit
+class TestAirtableEndpointSetting:
+    def test_clients_use_the_configured_endpoint(self):
+        endpoint = "http://127.0.0.1:8081/v0"
+        clients = AirtableClients(
+            Settings(
+                airtable_base_id="appTestBase",
+                airtable_endpoint_url="http://127.0.0.1:8081/",
+                airtable_rate_limit_state_dir="",
+            )
+        )
+
+        async_client = clients.async_client
+        base_url = async_client._client.base_url  # pylint: disable=protected-access
+
+        assert clients.table("Cities").urls.records == f"{endpoint}/appTestBase/Cities"
+        assert str(base_url) == f"{endpoint}/appTestBase/"
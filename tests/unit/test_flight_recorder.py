@@ -0,0 +1,47 @@
+import contextvars
+
+import pytest
+
+from app.utils.flight_recorder import FlightRecorder
+from app.utils.telemetry import record_span, start_request_timings
+
+
+def request(spans):
+    def run():
+        timings = start_request_timings()
+        for name, duration_ms, details in spans:
+            record_span(name, duration_ms, **details)
+        return timings
+
+    return contextvars.copy_context().run(run)
+
+
+# Test Cases
+@pytest.mark.unit
+class TestFlightRecorder:
+    def test_only_slow_requests_are_recorded(self):
+        recorder = FlightRecorder(threshold_ms=100, capacity=10)
+        timings = request([("airtable", 80.0, {"table": "Cities", "bytes": 512})])
+
+        recorder.observe("GET", "/cities", "", 200, 99.9, timings)
+        recorder.observe("GET", "/cities", "country_code_iso3=BRA", 200, 120.0, timings)
+
+        (trace,) = recorder.traces()
+        assert trace["query"] == "country_code_iso3=BRA"
+        assert trace["spans"] == {"airtable": {"duration_ms": 80.0, "count": 1}}
+        (event,) = trace["events"]
+        assert event["name"] == "airtable" and event["duration_ms"] == 80.0
+        assert event["table"] == "Cities" and event["bytes"] == 512
+
+    def test_keeps_the_newest_traces_first(self):
+        recorder = FlightRecorder(threshold_ms=0, capacity=2)
+        for path in ("/cities", "/datasets", "/indicators"):
+            recorder.observe("GET", path, "", 200, 1.0, request([]))
+
+        assert [t["path"] for t in recorder.traces()] == ["/indicators", "/datasets"]
+        assert [t["path"] for t in recorder.traces(limit=1)] == ["/indicators"]
+
+    def test_debug_endpoints_are_off_by_default(self):
+        from app.main import app  # pylint: disable=import-outside-toplevel
+
+        assert not [route for route in app.routes if route.path.startswith("/debug")]
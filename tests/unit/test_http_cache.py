@@ -0,0 +1,107 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.utils import http_cache
+from app.utils.http_cache import ResponseCache, etag_matches
+from app.utils.snapshot import SnapshotCache
+
+
+# Fixtures
+@pytest.fixture
+def cache(mocker):
+    cache = SnapshotCache(default_ttl=60)
+    mocker.patch.object(http_cache, "snapshot_cache", cache)
+    mocker.patch.object(http_cache, "response_cache", ResponseCache(1024))
+    return cache
+
+
+@pytest.fixture
+def client(cache):
+    calls = []
+    router = http_cache.cached_router("cities", "Cities")
+
+    @router.get("")
+    def list_cities():
+        calls.append(1)
+        return cache.get("Cities", ("all", None), lambda: [{"id": "rec1"}])
+
+    @router.get("/{city_id}")
+    def get_city(city_id: str):
+        cache.get("Cities", ("all", None), lambda: [{"id": "rec1"}])
+        raise HTTPException(status_code=404, detail="City not found")
+
+    app = FastAPI()
+    app.include_router(router, prefix="/cities")
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+# Test Cases
+@pytest.mark.unit
+class TestHttpCache:
+    def test_matching_etag_is_answered_before_building_the_body(self, client):
+        first = client.get("/cities")
+        second = client.get("/cities")
+        etag = second.headers["ETag"]
+
+        response = client.get("/cities", headers={"If-None-Match": etag})
+
+        # The first response loads the snapshot, so it is not tagged.
+        assert "ETag" not in first.headers
+        assert response.status_code == 304 and response.content == b""
+        assert (
+            response.headers["Cache-Control"]
+            == "public, max-age=60, stale-while-revalidate=300"
+        )
+        assert response.headers["Surrogate-Key"] == "cities Cities"
+        assert len(client.calls) == 2
+
+    def test_repeated_requests_are_served_from_stored_bytes(self, client):
+        client.get("/cities")
+        second = client.get("/cities")
+        third = client.get("/cities")
+
+        assert third.content == second.content == b'[{"id":"rec1"}]'
+        assert third.headers["ETag"] == second.headers["ETag"]
+        assert len(client.calls) == 2
+
+    def test_etag_changes_with_the_snapshot_and_the_query(self, client, cache):
+        client.get("/cities")
+        etag = client.get("/cities").headers["ETag"]
+
+        assert client.get("/cities?country=USA").headers["ETag"] != etag
+
+        cache.invalidate("Cities")
+        cache.get("Cities", ("all", None), lambda: [{"id": "rec2"}])
+        response = client.get("/cities", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_bodies_built_from_a_stale_view_are_not_tagged(self, client, mocker):
+        client.get("/cities")
+        mocker.patch.object(http_cache, "served_stale", return_value=True)
+
+        response = client.get("/cities")
+
+        assert "ETag" not in response.headers
+        assert len(client.calls) == 2
+
+    def test_if_none_match_uses_weak_comparison(self):
+        assert etag_matches('W/"a", "b"', '"a"')
+        assert not etag_matches('"b"', '"a"')
+
+    def test_wildcard_only_matches_an_existing_representation(self, client):
+        assert not etag_matches("*", '"a"')
+        assert etag_matches("*", '"a"', representation_exists=True)
+
+        client.get("/cities")
+        missing = client.get("/cities/nowhere", headers={"If-None-Match": "*"})
+        client.get("/cities")
+        stored = client.get("/cities", headers={"If-None-Match": "*"})
+
+        assert missing.status_code == 404
+        assert stored.status_code == 304
+        assert not etag_matches(None, '"a"')
@@ -0,0 +1,89 @@
+import gc
+
+import pytest
+
+from app.utils import indexes as indexes_module
+from app.utils.indexes import RecordIndex, index_for, index_scope
+from app.utils.snapshot import SnapshotCache
+
+AOIS = [
+    {"id": "recA1", "fields": {"id": "aoi1", "cities": ["recC1", "recC2"]}},
+    {"id": "recA2", "fields": {"id": "aoi2", "cities": ["recC1"]}},
+    {"id": "recA3", "fields": {"id": "aoi3"}},
+]
+
+
+# Test Cases
+@pytest.mark.unit
+class TestRecordIndex:
+    def test_lookups_by_record_id_and_business_id(self):
+        index = RecordIndex(AOIS)
+
+        assert index.get("recA2") is AOIS[1]
+        assert index.get("missing") is None
+        assert index.unique("id")["aoi3"] is AOIS[2]
+        assert index.field_map("cities") == {
+            "recA1": ["recC1", "recC2"],
+            "recA2": ["recC1"],
+        }
+
+    def test_resolve_keeps_link_order(self):
+        index = RecordIndex(AOIS)
+
+        assert index.resolve(["recA3", "missing", "recA1"]) == ["aoi3", "aoi1"]
+        assert index.resolve(["recA2"], field="cities") == [["recC1"]]
+        assert index.resolve(None) == []
+
+    def test_group_reverses_links_in_record_order(self):
+        groups = RecordIndex(AOIS).group("cities")
+
+        assert groups["recC1"] == [AOIS[0], AOIS[1]]
+        assert groups["recC2"] == [AOIS[0]]
+
+    def test_group_by_several_fields_uses_tuple_keys(self):
+        values = [
+            {"id": "v1", "fields": {"cities_id": ["c1"], "aoi": ["a1"]}},
+            {"id": "v2", "fields": {"cities_id": ["c1"], "aoi": ["a2"]}},
+        ]
+
+        groups = RecordIndex(values).group("cities_id", "aoi")
+
+        assert groups == {("c1", "a1"): [values[0]], ("c1", "a2"): [values[1]]}
+
+    def test_maps_are_built_once_per_snapshot(self, mocker):
+        cache = SnapshotCache(default_ttl=60)
+        mocker.patch.object(indexes_module, "snapshot_cache", cache)
+        records = cache.get("Areas_of_interest", ("all", None), lambda: list(AOIS))
+        builds = []
+
+        def build(rows):
+            builds.append(rows)
+            return len(rows)
+
+        assert index_for(records).derive("count", build) == 3
+        assert index_for(records).derive("count", build) == 3
+        assert len(builds) == 1
+        assert cache.entry_for(records).index is index_for(records)
+
+    def test_lists_outside_the_cache_are_not_kept(self, mocker):
+        cache = SnapshotCache(default_ttl=60)
+        mocker.patch.object(indexes_module, "snapshot_cache", cache)
+        records = cache.get("Areas_of_interest", ("all", None), lambda: list(AOIS))
+        index_for(records)
+
+        cache.invalidate()
+        gc.collect()
+
+        assert cache.entry_for(records) is None
+        assert index_for(records) is not index_for(records)
+
+    def test_derived_lists_share_an_index_for_a_scope(self):
+        derived = [record for record in AOIS if record["fields"]["id"]]
+
+        with index_scope():
+            inside = index_for(derived)
+            with index_scope():
+                assert index_for(derived) is inside
+            assert index_for(derived) is inside
+
+        assert index_for(derived) is not inside
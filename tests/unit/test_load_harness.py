@@ -0,0 +1,114 @@
+import asyncio
+
+import httpx
+import pytest
+
+from tests.fake_airtable import FakeBase
+from tests.load.mix import DEFAULT_MIX, TrafficMix, parse_mix
+from tests.load.runner import LoadTest, format_report, percentile
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture(scope="module")
+def base():
+    return FakeBase.load()
+
+
+# Test Cases
+@pytest.mark.unit
+class TestTrafficMix:
+    def test_parse_mix(self):
+        assert parse_mix("city=3, layer=1,scenarios") == {
+            "city": 3.0,
+            "layer": 1.0,
+            "scenarios": 1.0,
+        }
+
+    @pytest.mark.parametrize("spec", ["nowhere=1", "city=0", ""])
+    def test_parse_mix_rejects(self, spec):
+        with pytest.raises(ValueError):
+            parse_mix(spec)
+
+    def test_draws_paths_of_existing_records(self, base):
+        mix = TrafficMix(base, DEFAULT_MIX, seed=1)
+
+        drawn = [mix.next() for _ in range(500)]
+
+        assert {endpoint for endpoint, _ in drawn} == set(DEFAULT_MIX)
+        for endpoint, path in drawn:
+            if endpoint == "layer":
+                _, _, layer_id, city_id = path.split("/")
+                assert layer_id in mix.layer_ids and city_id in mix.city_ids
+            if endpoint == "scenarios":
+                assert path in {
+                    f"/scenarios/{city}/{aoi}/{category}"
+                    for city, aoi, category in mix.scenarios
+                }
+
+    def test_only_draws_weighted_endpoints(self, base):
+        mix = TrafficMix(base, {"city": 1, "layer": 0}, seed=1)
+
+        assert {mix.next()[0] for _ in range(50)} == {"city"}
+
+
+@pytest.mark.unit
+class TestLoadTest:
+    def test_percentile(self):
+        values = [float(n) for n in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.5) == 0.0
+
+    def test_reports_errors_and_airtable_calls_per_request(self, base):
+        stats = [
+            {"requests": 10, "throttled": 1, "requests_by_table": {"Cities": 10}},
+            {"requests": 16, "throttled": 3, "requests_by_table": {"Cities": 16}},
+        ]
+
+        def app_handler(request):
+            if request.url.path.startswith("/layers/"):
+                return httpx.Response(500)
+            return httpx.Response(200, json={})
+
+        app = httpx.AsyncClient(
+            base_url="http://app", transport=httpx.MockTransport(app_handler)
+        )
+        airtable = httpx.AsyncClient(
+            base_url="http://airtable",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=stats.pop(0))
+            ),
+        )
+        mix = TrafficMix(base, {"city": 1, "layer": 1}, seed=1)
+
+        report = run(
+            LoadTest(app, mix, duration=0.2, concurrency=2, airtable=airtable).run()
+        )
+
+        layer, city = report["endpoints"]["layer"], report["endpoints"]["city"]
+        assert report["requests"] == layer["requests"] + city["requests"] > 0
+        assert layer["error_rate"] == 1.0 and city["error_rate"] == 0.0
+        assert report["errors"] == layer["requests"]
+        assert report["airtable"]["requests"] == 6
+        assert report["airtable"]["throttled"] == 2
+        assert report["airtable"]["requests_by_table"] == {"Cities": 6}
+        assert report["airtable"]["calls_per_request"] == round(
+            6 / report["requests"], 3
+        )
+        assert "Airtable: 6 calls" in format_report(report)
+
+    def test_open_loop_sends_at_the_rate(self, base):
+        app = httpx.AsyncClient(
+            base_url="http://app",
+            transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+        )
+        mix = TrafficMix(base, {"cities": 1}, seed=1)
+
+        report = run(LoadTest(app, mix, duration=0.5, rate=40).run())
+
+        assert report["requests"] in (20, 21)
+        assert "airtable" not in report
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.services import cities_service
+from app.services.cities_service import _build_city_views
+from app.utils.materialized import MaterializedView, served_stale
+
+
+# Test Cases
+@pytest.mark.unit
+class TestMaterializedView:
+    def test_rebuilds_only_when_a_source_changes(self):
+        builds = []
+        view = MaterializedView("sizes", lambda a, b: builds.append(1) or len(a + b))
+        cities, projects = [1, 2], [3]
+
+        assert view.get(cities, projects) == 3
+        assert view.get(cities, projects) == 3
+        assert view.get(cities, [3, 4]) == 4
+        assert len(builds) == 2
+
+    def test_async_rebuilds_off_the_loop_and_serves_the_previous_view(self):
+        rebuilding, release = threading.Event(), threading.Event()
+        threads = []
+
+        def build(a):
+            threads.append(threading.current_thread())
+            if len(threads) > 1:
+                rebuilding.set()
+                release.wait(timeout=5)
+            return len(a)
+
+        view = MaterializedView("size", build)
+        old, new = [1], [1, 2]
+
+        async def scenario():
+            first = await view.aget(old)
+            stale = await view.aget(new)
+            was_stale = served_stale()
+            await asyncio.to_thread(rebuilding.wait, 5)
+            release.set()
+            # Waits for the worker's build instead of building again
+            rebuilt = view.get(new)
+            return first, stale, was_stale, rebuilt, await view.aget(new)
+
+        assert asyncio.run(scenario()) == (1, 1, True, 2, 2)
+        assert len(threads) == 2 and threading.main_thread() not in threads
+
+
+@pytest.mark.unit
+class TestCityDocuments:
+    def test_documents_are_scoped_per_application(self):
+        cities = [
+            {
+                "id": "recC1",
+                "fields": {"id": "city1", "name": "One", "projects": ["recP1"]},
+            }
+        ]
+        projects = [
+            {"id": "recP1", "fields": {"id": "proj1", "application_id": ["cid"]}}
+        ]
+        aois = [
+            {
+                "id": "recA1",
+                "fields": {"id": "aoi1", "cities": ["recC1"], "application_id": "ccl"},
+            }
+        ]
+
+        documents = _build_city_views(cities, projects, [], aois).documents
+        cid = json.loads(documents[("city1", "cid")])
+        ccl = json.loads(documents[("city1", "ccl")])
+        unscoped = json.loads(documents[("city1", None)])
+
+        assert cid["name"] == "One"
+        assert cid["projects"] == ["proj1"] and "area_of_interests" not in cid
+        assert ccl["projects"] == [] and ccl["area_of_interests"] == ["aoi1"]
+        assert unscoped["projects"] == ["proj1"]
+        assert unscoped["area_of_interests"] == ["aoi1"]
+
+    def test_city_lists_filter_by_project_and_country(self):
+        cities = [
+            {
+                "id": f"recC{n}",
+                "fields": {"id": f"city{n}", "projects": links, "country_code_iso3": c},
+            }
+            for n, links, c in [
+                (1, ["recP1", "recP2"], "USA"),
+                (2, ["recP2"], "BRA"),
+                (3, ["recP1"], "USA"),
+            ]
+        ]
+        projects = [
+            {"id": "recP1", "fields": {"id": "proj1", "application_id": ["cid"]}},
+            {"id": "recP2", "fields": {"id": "proj2", "application_id": ["ccl"]}},
+        ]
+
+        lists = _build_city_views(cities, projects, [], []).lists
+
+        def ids(rows):
+            return [json.loads(row)["id"] for row in rows]
+
+        assert ids(lists[None].select(None, None)) == ["city1", "city2", "city3"]
+        assert ids(lists[None].select(None, "US")) == ["city1", "city3"]
+        assert ids(lists["ccl"].select(None, None)) == ["city1", "city2"]
+        assert lists["ccl"].select(["proj1"], None) is None
+        selected = lists[None].select(["proj2"], "USA")
+        assert [json.loads(row)["projects"] for row in selected] == [["proj2"]]
+
+    def test_cities_without_projects_are_not_listed(self):
+        cities = [
+            {"id": "recC1", "fields": {"id": "city1", "projects": ["recP1"]}},
+            {"id": "recC2", "fields": {"id": "city2"}},
+        ]
+        projects = [
+            {"id": "recP1", "fields": {"id": "proj1", "application_id": ["cid"]}}
+        ]
+
+        lists = _build_city_views(cities, projects, [], []).lists
+
+        def ids(rows):
+            return [json.loads(row)["id"] for row in rows]
+
+        assert ids(lists[None].select(None, None)) == ["city1"]
+        assert ids(lists["cid"].select(["proj1"], None)) == ["city1"]
+        assert lists["ccl"].select(None, None) is None
+        assert lists[None].select(None, "BRA") == []
+
+    def test_a_failing_city_only_loses_its_own_document(self, mocker):
+        cities = [
+            {"id": "recC1", "fields": {"id": "city1", "projects": ["recP1"]}},
+            {"id": "recC2", "fields": {"id": "city2"}},
+            {"id": "recC3", "fields": {"id": "city3", "projects": ["recP1"]}},
+        ]
+        projects = [{"id": "recP1", "fields": {"id": "proj1"}}]
+        build_city_detail = cities_service._build_city_detail
+
+        def build(city_id, *args):
+            if city_id == "city3":
+                raise ValueError("malformed record")
+            return build_city_detail(city_id, *args)
+
+        mocker.patch.object(cities_service, "_build_city_detail", side_effect=build)
+
+        documents = _build_city_views(cities, projects, [], []).documents
+
+        assert json.loads(documents[("city1", None)])["projects"] == ["proj1"]
+        assert json.loads(documents[("city2", None)])["projects"] == []
+        assert ("city3", None) not in documents
+        assert ("NOPE", None) not in documents
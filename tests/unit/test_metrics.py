@@ -0,0 +1,40 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.utils.metrics import airtable_table_label, observe_airtable_response
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+# Test Cases
+@pytest.mark.unit
+class TestMetrics:
+    def test_table_label_comes_from_the_url_path(self):
+        assert airtable_table_label("/v0/appB/Cities") == "Cities"
+        assert airtable_table_label("/v0/appB/Indicators%20values/rec1") == (
+            "Indicators values"
+        )
+        assert airtable_table_label("/v0/bases/appB/webhooks") == "_meta"
+        assert airtable_table_label("/v0/meta/bases/appB/tables") == "_meta"
+
+    def test_only_listing_responses_count_as_pages(self):
+        pages = sample("airtable_pages_fetched_total", table="Layers")
+        size = sample("airtable_response_bytes_total", table="Layers")
+        calls = sample(
+            "airtable_request_duration_seconds_count", table="Layers", status="200"
+        )
+
+        observe_airtable_response("GET", "/v0/appB/Layers", 200, 0.1, 100)
+        observe_airtable_response("POST", "/v0/appB/Layers/listRecords", 200, 0.1, 50)
+        observe_airtable_response("GET", "/v0/appB/Layers/rec1", 200, 0.1, 10)
+
+        assert sample("airtable_pages_fetched_total", table="Layers") == pages + 2
+        assert sample("airtable_response_bytes_total", table="Layers") == size + 160
+        assert (
+            sample(
+                "airtable_request_duration_seconds_count", table="Layers", status="200"
+            )
+            == calls + 3
+        )
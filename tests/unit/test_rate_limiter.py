@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pyairtable.api.retrying import retry_strategy
+
+from app.utils.rate_limiter import RateLimitedAdapter, RateLimiter
+
+
+# Test Cases
+@pytest.mark.unit
+class TestRateLimiter:
+    @patch("app.utils.rate_limiter.time.time", return_value=1000.0)
+    def test_delays_calls_beyond_the_window(self, _mock_time):
+        limiter = RateLimiter(calls=5, period=1)
+
+        delays = [limiter.reserve() for _ in range(7)]
+
+        assert delays[:5] == [0.0] * 5
+        assert delays[5] == pytest.approx(1.0)
+        assert delays[6] == pytest.approx(1.0)
+
+    @patch("app.utils.rate_limiter.time.time", return_value=1000.0)
+    def test_shared_state_file_spans_limiter_instances(self, _mock_time, tmp_path):
+        state_path = str(tmp_path / "airtable-app.ratelimit")
+        worker_a = RateLimiter(calls=2, period=1, state_path=state_path)
+        worker_b = RateLimiter(calls=2, period=1, state_path=state_path)
+
+        assert worker_a.reserve() == 0.0
+        assert worker_b.reserve() == 0.0
+        assert worker_a.reserve() == pytest.approx(1.0)
+
+    @patch("app.utils.rate_limiter.time.time", return_value=1000.0)
+    def test_stats_report_wait_time(self, _mock_time):
+        limiter = RateLimiter(calls=1, period=2)
+
+        limiter.reserve()
+        limiter.reserve()
+        stats = limiter.stats()
+
+        assert stats["calls"] == 2
+        assert stats["waited_calls"] == 1
+        assert stats["wait_seconds_total"] == pytest.approx(2.0)
+        assert stats["wait_seconds_max"] == pytest.approx(2.0)
+
+    def test_adapter_retries_take_a_slot(self):
+        limiter = MagicMock(spec=RateLimiter)
+        adapter = RateLimitedAdapter(
+            limiter, max_retries=retry_strategy(total=3, backoff_factor=0)
+        )
+
+        retry = adapter.max_retries.increment(method="GET", url="/v0/app/Cities")
+        retry.sleep()
+
+        assert retry.total == 2
+        assert retry.status_forcelist == (429,)
+        limiter.acquire.assert_called_once_with()
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import readiness_service
+from app.services.readiness_service import Prewarm
+from app.utils.snapshot import SnapshotCache
+
+
+# Fixtures
+@pytest.fixture
+def cache(mocker):
+    cache = SnapshotCache(default_ttl=60)
+    mocker.patch.object(readiness_service, "snapshot_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def services(mocker, cache):
+    def load_cities(*args):
+        cache.get("Cities", ("all", None), lambda: [{"id": "rec1"}, {"id": "rec2"}])
+
+    async def load_cities_async(*args):
+        load_cities()
+
+    for name in (
+        "cities_service.get_city_list_document_async",
+        "datasets_service.list_datasets_async",
+        "indicators_service.list_indicators_async",
+    ):
+        mocker.patch(f"app.services.{name}", side_effect=load_cities_async)
+    for name in (
+        "indicators_service.list_indicators_themes",
+        "interventions_service.list_interventions",
+        "projects_service.list_projects",
+    ):
+        mocker.patch(f"app.services.{name}", side_effect=load_cities)
+
+
+# Test Cases
+@pytest.mark.unit
+@pytest.mark.usefixtures("services")
+class TestPrewarm:
+    def test_is_ready_once_warmed_up(self):
+        prewarm = Prewarm(max_age=60)
+        before = prewarm.readiness()
+
+        asyncio.run(prewarm.run())
+        after = prewarm.readiness()
+
+        assert before["status"] == "warming" and before["tables"] == {}
+        assert after["status"] == "ready"
+        assert after["tables"]["Cities"]["records"] == 2
+        assert after["tables"]["Cities"]["entries"] == 1
+
+    def test_old_data_is_not_ready(self, cache):
+        prewarm = Prewarm(max_age=60)
+        asyncio.run(prewarm.run())
+        cache._entries[("Cities", ("all", None))].fetched_at = time.time() - 120
+
+        assert prewarm.readiness()["status"] == "stale"
+
+    def test_fresh_filtered_queries_do_not_hide_a_stale_table(self, cache):
+        prewarm = Prewarm(max_age=60)
+        asyncio.run(prewarm.run())
+        cache.get("Cities", ("all", "filtered"), lambda: [])
+        cache._entries[("Cities", ("all", None))].fetched_at = time.time() - 120
+
+        assert prewarm.readiness()["status"] == "stale"
+
+    def test_expired_data_stays_ready(self, cache):
+        prewarm = Prewarm(max_age=60)
+        asyncio.run(prewarm.run())
+
+        cache.expire()
+
+        assert prewarm.readiness()["status"] == "ready"
+        assert prewarm.readiness()["tables"]["Cities"]["age_seconds"] < 60
+
+    def test_failed_warm_up_is_not_ready(self, mocker):
+        mocker.patch(
+            "app.services.projects_service.list_projects",
+            side_effect=RuntimeError("Airtable is down"),
+        )
+        prewarm = Prewarm(max_age=60)
+
+        asyncio.run(prewarm.run())
+
+        assert prewarm.readiness()["status"] == "failed"
+        assert prewarm.error == "Airtable is down"
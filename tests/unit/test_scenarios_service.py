@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.services.scenarios_service import (
+    get_scenario_by_city_id_aoi_id_intervention_category,
+)
+
+
+# Fixtures
+@pytest.fixture
+def mock_scenarios():
+    return [
+        {
+            "id": "recS1",
+            "fields": {"id": "scenario1", "layers": [], "Interventions": ["recI1"]},
+        }
+    ]
+
+
+# Test Cases
+@pytest.mark.unit
+class TestGetScenarios:
+    @patch("app.services.scenarios_service.fetch_first_city", return_value=None)
+    @patch("app.services.scenarios_service.fetch_layers", return_value=[])
+    @patch("app.services.scenarios_service.fetch_indicators", return_value=[])
+    @patch("app.services.scenarios_service.fetch_indicator_values", return_value=[])
+    @patch("app.services.scenarios_service.fetch_scenarios")
+    @patch("app.services.scenarios_service.fetch_interventions", return_value=[])
+    def test_no_interventions_returns_no_scenarios(
+        self,
+        mock_fetch_interventions,
+        mock_fetch_scenarios,
+        mock_fetch_indicator_values,
+        mock_fetch_indicators,
+        mock_fetch_layers,
+        mock_fetch_first_city,
+        mock_scenarios,
+    ):
+        mock_fetch_scenarios.return_value = mock_scenarios
+
+        result = get_scenario_by_city_id_aoi_id_intervention_category("NOPE", "x", "y")
+
+        assert result == []
@@ -0,0 +1,302 @@
+import asyncio
+import copy
+import importlib
+import json
+
+import pytest
+
+from app.schemas.common_schema import ApplicationIdParam
+from app.services import (
+    cities_service,
+    datasets_service,
+    indicators_service,
+    scenarios_service,
+)
+from tests.fake_airtable import FakeBase
+
+# Repository functions the services import, by name: (table, op)
+REPOSITORY_FUNCTIONS = {
+    "fetch_areas_of_interest": ("Areas_of_interest", "all"),
+    "fetch_cities": ("Cities", "all"),
+    "fetch_first_city": ("Cities", "first"),
+    "fetch_datasets": ("Datasets", "all"),
+    "fetch_indicators": ("Indicators", "all"),
+    "fetch_first_indicator": ("Indicators", "first"),
+    "fetch_indicator_values": ("Indicators_values", "all"),
+    "fetch_interventions": ("Interventions", "all"),
+    "fetch_layers": ("Layers", "all"),
+    "fetch_first_layer": ("Layers", "first"),
+    "fetch_projects": ("Projects", "all"),
+    "fetch_scenarios": ("Scenarios", "all"),
+}
+
+SERVICE_MODULES = [
+    "app.services.cities_service",
+    "app.services.datasets_service",
+    "app.services.indicators_service",
+    "app.services.scenarios_service",
+]
+
+CID, CCL = ApplicationIdParam("cid"), ApplicationIdParam("ccl")
+FLORIANOPOLIS = "BRA-Florianopolis"
+MONTERREY = "MEX-Monterrey"
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def ids(records):
+    return [record["id"] for record in records]
+
+
+def link(base, table, record_id, field, *links):
+    """Append links to a field of a fixture record, e.g. to deleted records."""
+    record = next(r for r in base.tables[table] if r["id"] == record_id)
+    record["fields"].setdefault(field, []).extend(links)
+
+
+@pytest.fixture
+def base():
+    # Each test gets its own copy, so it can break links in it.
+    return FakeBase(copy.deepcopy(FakeBase.load().tables))
+
+
+@pytest.fixture
+def repository(base, monkeypatch):
+    """Serve the repository functions from ``base``, as Airtable would.
+
+    A query returns the same list every time, as a warm snapshot cache does,
+    so the materialized city views are built once per test.
+    """
+    results = {}
+
+    def query(table, op, formula, fields):
+        key = (table, op, formula, tuple(fields or ()))
+        if key not in results:
+            max_records = 1 if op == "first" else None
+            records = base.select(table, formula, fields, max_records=max_records)
+            if op == "first":
+                records = records[0] if records else None
+            results[key] = records
+        return results[key]
+
+    def function(table, op, is_async):
+        def fetch(filter_formula=None, fields=None):
+            return query(table, op, filter_formula, fields)
+
+        async def fetch_async(filter_formula=None, fields=None):
+            return query(table, op, filter_formula, fields)
+
+        return fetch_async if is_async else fetch
+
+    for module in map(importlib.import_module, SERVICE_MODULES):
+        for name, (table, op) in REPOSITORY_FUNCTIONS.items():
+            for is_async, attribute in ((False, name), (True, f"{name}_async")):
+                if hasattr(module, attribute):
+                    monkeypatch.setattr(
+                        module, attribute, function(table, op, is_async)
+                    )
+    monkeypatch.setattr(cities_service.snapshot_cache, "enabled", True)
+    cities_service.city_views.invalidate()
+    yield base
+    cities_service.city_views.invalidate()
+
+
+# Test Cases
+@pytest.mark.unit
+@pytest.mark.usefixtures("repository")
+class TestCities:
+    def test_list_joins_projects_areas_and_values(self):
+        cities = {
+            city["id"]: city for city in cities_service.list_cities(None, None, None)
+        }
+
+        florianopolis = cities[FLORIANOPOLIS]
+        assert list(cities) == [FLORIANOPOLIS, "BRA-Teresina", "IND-Pune", MONTERREY]
+        assert florianopolis["projects"] == ["urbanshift", "coolcities"]
+        assert florianopolis["area_of_interests"] == [
+            "BRA-Florianopolis-urban_extent",
+            "BRA-Florianopolis-accelerator_area",
+        ]
+        assert florianopolis["indicator_values"]["BRA-Florianopolis-urban_extent"] == {
+            "ACC_1_OpenSpaceHectaresper1000people2022": 13.7,
+            "HEA_4_HighLSTdaysperyear": 43.3,
+        }
+
+    def test_list_is_scoped_to_the_application(self):
+        cities = cities_service.list_cities(CCL, None, "BRA")
+
+        assert ids(cities) == [FLORIANOPOLIS]
+        assert cities[0]["projects"] == ["coolcities"]
+        assert cities[0]["area_of_interests"] == ["BRA-Florianopolis-accelerator_area"]
+
+    def test_unknown_filters_find_nothing(self):
+        assert cities_service.list_cities(None, None, "XXX") == []
+        assert cities_service.list_cities(None, ["nowhere"], None) is None
+        assert cities_service.get_city_by_city_id(None, "NOPE") is None
+        assert (
+            run(cities_service.get_city_list_document_async(None, None, "XXX")) is None
+        )
+        assert run(cities_service.get_city_document_async(None, "NOPE")) is None
+
+    @pytest.mark.parametrize("application_id", [None, CID, CCL])
+    def test_documents_match_the_per_request_responses(self, application_id):
+        for city in cities_service.list_cities(None, None, None):
+            document = run(
+                cities_service.get_city_document_async(application_id, city["id"])
+            )
+            expected = cities_service.get_city_by_city_id(application_id, city["id"])
+            assert json.loads(document) == expected
+
+        for projects, country in [(None, None), (["urbanshift"], None), (None, "BRA")]:
+            document = run(
+                cities_service.get_city_list_document_async(
+                    application_id, projects, country
+                )
+            )
+            expected = cities_service.list_cities(application_id, projects, country)
+            # No matching project or city is a 404 either way.
+            listed = json.loads(document)["cities"] if document else []
+            assert listed == (expected or [])
+
+    def test_city_without_projects(self, repository):
+        repository.tables["Cities"][3]["fields"].pop("projects")
+
+        listed = run(cities_service.get_city_list_document_async(None, None, None))
+        document = run(cities_service.get_city_document_async(None, MONTERREY))
+
+        assert MONTERREY not in ids(json.loads(listed)["cities"])
+        assert ids(cities_service.list_cities(None, None, None)) == ids(
+            json.loads(listed)["cities"]
+        )
+        assert json.loads(document)["projects"] == []
+        assert run(cities_service.get_city_document_async(None, FLORIANOPOLIS))
+        assert run(cities_service.get_city_document_async(None, "NOPE")) is None
+
+    def test_links_to_deleted_records_are_skipped(self, repository):
+        link(repository, "Cities", "recC1", "projects", "recGONE")
+        link(repository, "Areas_of_interest", "recA1", "cities", "recGONE")
+
+        city = cities_service.get_city_by_city_id(None, FLORIANOPOLIS)
+        document = run(cities_service.get_city_document_async(None, FLORIANOPOLIS))
+
+        assert city["projects"] == ["urbanshift", "coolcities"]
+        assert json.loads(document) == city
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("repository")
+class TestDatasets:
+    def test_list_resolves_indicators_and_layers(self):
+        datasets = datasets_service.list_datasets(None, None)
+
+        assert ids(datasets) == ["open_space", "lst", "tree_cover"]
+        assert datasets[2]["indicators"] == ["GRE_3_PercentTreeCover"]
+        assert datasets[2]["layers"] == ["tree_cover", "tree_planting"]
+        assert datasets[2]["city_ids"] == ["BRA-Teresina", "IND-Pune"]
+
+    def test_filters_by_city_and_layer(self):
+        assert ids(datasets_service.list_datasets(CID, "IND-Pune")) == [
+            "open_space",
+            "tree_cover",
+        ]
+        assert ids(datasets_service.list_datasets(None, None, ["tree_planting"])) == [
+            "tree_cover"
+        ]
+        assert datasets_service.list_datasets(None, "NOPE") == []
+
+    def test_links_to_deleted_records_are_skipped(self, repository):
+        link(repository, "Datasets", "recD3", "indicators", "recGONE")
+        link(repository, "Datasets", "recD3", "layers", "recGONE")
+
+        dataset = datasets_service.list_datasets(None, None)[2]
+
+        assert dataset["indicators"] == ["GRE_3_PercentTreeCover"]
+        assert dataset["layers"] == ["tree_cover", "tree_planting"]
+        assert run(datasets_service.list_datasets_async(None, None))[2] == dataset
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("repository")
+class TestIndicators:
+    def test_list_resolves_links(self):
+        indicators = indicators_service.list_indicators()
+
+        open_space = indicators[0]
+        assert ids(indicators) == [
+            "ACC_1_OpenSpaceHectaresper1000people2022",
+            "HEA_4_HighLSTdaysperyear",
+            "GRE_3_PercentTreeCover",
+        ]
+        assert open_space["projects"] == ["urbanshift", "deepdive"]
+        assert open_space["data_sources_link"] == ["OpenStreetMap open space"]
+        assert open_space["layers"] == [
+            {"id": "open_space", "legend": "Open space", "name": "Open space"}
+        ]
+
+    def test_filters_by_application_and_city(self):
+        assert ids(indicators_service.list_indicators(CCL)) == [
+            "HEA_4_HighLSTdaysperyear"
+        ]
+        assert ids(indicators_service.list_indicators(city_id=["IND-Pune"])) == [
+            "ACC_1_OpenSpaceHectaresper1000people2022",
+            "GRE_3_PercentTreeCover",
+        ]
+        assert indicators_service.list_indicators(city_id=["NOPE"]) == []
+
+    def test_links_to_deleted_records_are_skipped(self, repository):
+        link(repository, "Indicators", "recI1", "projects", "recGONE")
+        link(repository, "Indicators", "recI1", "layers", "recGONE")
+
+        indicator = indicators_service.list_indicators()[0]
+
+        assert indicator["projects"] == ["urbanshift", "deepdive"]
+        assert [layer["id"] for layer in indicator["layers"]] == ["open_space"]
+        assert run(indicators_service.list_indicators_async())[0] == indicator
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("repository")
+class TestScenarios:
+    def get(self, city_id, aoi_id, category):
+        return scenarios_service.get_scenario_by_city_id_aoi_id_intervention_category(
+            city_id, aoi_id, category
+        )
+
+    def test_joins_interventions_values_and_layers(self):
+        scenarios = self.get(
+            FLORIANOPOLIS, "BRA-Florianopolis-urban_extent", "greening"
+        )
+
+        achievable = scenarios[0]
+        assert ids(scenarios) == ["trees_achievable", "trees_baseline"]
+        assert [layer["layer_id"] for layer in achievable["layers"]] == [
+            "tree_cover",
+            "tree_planting",
+        ]
+        assert [value["value"] for value in achievable["indicators"]] == [17.4, 47.0]
+
+    def test_links_to_deleted_records_are_skipped(self, repository):
+        link(repository, "Scenarios", "recS1", "layers", "recGONE")
+
+        scenarios = self.get(
+            FLORIANOPOLIS, "BRA-Florianopolis-urban_extent", "greening"
+        )
+
+        assert [layer["layer_id"] for layer in scenarios[0]["layers"]] == [
+            "tree_cover",
+            "tree_planting",
+        ]
+
+    def test_unknown_city_area_or_category_finds_nothing(self):
+        assert self.get("NOPE", "x", "y") == []
+        assert self.get(FLORIANOPOLIS, "BRA-Florianopolis-urban_extent", "roofs") == []
+        assert (
+            run(
+                scenarios_service.get_scenario_by_city_id_aoi_id_intervention_category_async(
+                    "NOPE", "x", "y"
+                )
+            )
+            == []
+        )
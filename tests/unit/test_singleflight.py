@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.utils.singleflight import SingleFlight, normalize_formula
+
+
+# Test Cases
+@pytest.mark.unit
+class TestNormalizeFormula:
+    def test_ignores_whitespace_outside_literals(self):
+        assert normalize_formula("AND({a} = 'x', {b}='y')") == normalize_formula(
+            "AND({a}='x',{b}='y')"
+        )
+
+    def test_keeps_whitespace_in_strings_and_field_names(self):
+        assert (
+            normalize_formula("SEARCH( 'New York', {city name} )")
+            == "SEARCH('New York',{city name})"
+        )
+
+    def test_empty_formula_is_no_formula(self):
+        assert normalize_formula("  ") is None
+        assert normalize_formula(None) is None
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    def test_concurrent_threads_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(1)
+            return ["record"]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [["record"]] * 5
+        assert flight.stats()["shared"] == 4
+
+    def test_concurrent_tasks_share_one_call_and_its_error(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.ado("k", fetch) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.stats()["in_flight"] == 0
+
+    def test_finished_calls_are_not_reused(self):
+        flight = SingleFlight()
+
+        assert flight.do("k", lambda: 1) == 1
+        assert flight.do("k", lambda: 2) == 2
@@ -0,0 +1,131 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.utils import snapshot as snapshot_module
+from app.utils.snapshot import SnapshotCache, snapshot
+
+
+# Fixtures
+@pytest.fixture
+def cache():
+    return SnapshotCache(default_ttl=60, table_ttls={"Layers": 0})
+
+
+# Test Cases
+@pytest.mark.unit
+class TestSnapshotCache:
+    def test_miss_loads_and_hit_serves_snapshot(self, cache):
+        loader = MagicMock(return_value=[{"id": "rec1"}])
+
+        first = cache.get("Cities", ("all", None), loader)
+        second = cache.get("Cities", ("all", None), loader)
+
+        assert first == [{"id": "rec1"}]
+        assert second is first
+        loader.assert_called_once()
+
+    def test_keys_are_cached_separately(self, cache):
+        loader = MagicMock(side_effect=[["all"], ["filtered"]])
+
+        assert cache.get("Cities", ("all", None), loader) == ["all"]
+        assert cache.get("Cities", ("all", "{id}='x'"), loader) == ["filtered"]
+
+    def test_stale_entry_is_served_while_refreshing(self, cache):
+        refreshed = threading.Event()
+
+        def refresh_loader():
+            refreshed.set()
+            return ["new"]
+
+        assert cache.get("Layers", ("all", None), lambda: ["old"]) == ["old"]
+        assert cache.get("Layers", ("all", None), refresh_loader) == ["old"]
+        assert refreshed.wait(timeout=5)
+
+        for _ in range(100):
+            if cache.get("Layers", ("all", None), refresh_loader) == ["new"]:
+                break
+            time.sleep(0.01)
+        assert cache.get("Layers", ("all", None), refresh_loader) == ["new"]
+
+    def test_invalidate_drops_table_entries(self, cache):
+        loader = MagicMock(return_value=["records"])
+        cache.get("Cities", ("all", None), loader)
+        cache.get("Projects", ("all", None), loader)
+
+        cache.invalidate("Cities")
+        cache.get("Cities", ("all", None), loader)
+        cache.get("Projects", ("all", None), loader)
+
+        assert loader.call_count == 3
+
+    def test_least_recently_read_entries_are_evicted(self):
+        evicted = []
+        cache = SnapshotCache(default_ttl=60, max_entries=2, on_evict=evicted.append)
+        loader = MagicMock(side_effect=lambda: ["records"])
+
+        cache.get("Cities", ("all", "a"), loader)
+        cache.get("Cities", ("all", "b"), loader)
+        cache.get("Cities", ("all", "a"), loader)
+        cache.get("Cities", ("all", "c"), loader)
+        cache.get("Cities", ("all", "a"), loader)
+
+        assert evicted == [("Cities", ("all", "b"))]
+        assert loader.call_count == 3
+        assert cache.table_stats()["Cities"].entries == 2
+
+    def test_table_age_is_the_age_of_its_oldest_entry(self):
+        cache = SnapshotCache(default_ttl=60)
+        cache.get("Cities", ("all", None), lambda: ["whole table"])
+        cache.get("Cities", ("all", "filtered"), lambda: ["filtered"])
+        cache._entries[("Cities", ("all", None))].fetched_at = time.time() - 7200
+
+        assert cache.table_stats()["Cities"].age >= 7200
+
+    def test_disabled_cache_always_loads(self):
+        cache = SnapshotCache(default_ttl=60, enabled=False)
+        loader = MagicMock(return_value=["records"])
+
+        cache.get("Cities", ("all", None), loader)
+        cache.get("Cities", ("all", None), loader)
+
+        assert loader.call_count == 2
+
+    def test_seeded_tables_serve_whole_table_queries_then_refresh(self, cache):
+        cache.seed(
+            {"Cities": [{"id": "rec1", "fields": {"id": "city1", "name": "One"}}]},
+            fetched_at=time.time(),
+        )
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return ["fresh"]
+
+        seeded = cache.get("Cities", ("all", None, ("id",)), loader)
+
+        assert seeded == [{"id": "rec1", "fields": {"id": "city1"}}]
+        assert refreshed.wait(timeout=5)
+        assert cache.get("Cities", ("all", "{id}='x'", None), lambda: []) == []
+
+    def test_records_are_normalized_once_on_ingest(self, cache, mocker):
+        mocker.patch.object(snapshot_module, "snapshot_cache", cache)
+        fetch = MagicMock(
+            return_value=[
+                {"id": "rec1", "fields": {"name": " One ", "tags": [" a", {"b": "b "}]}}
+            ]
+        )
+
+        @snapshot("Cities")
+        def fetch_cities(filter_formula=None, fields=None):
+            return fetch(filter_formula, fields)
+
+        records = fetch_cities()
+
+        assert records == [
+            {"id": "rec1", "fields": {"name": "One", "tags": ["a", {"b": "b"}]}}
+        ]
+        assert fetch_cities() is records
+        assert fetch.call_count == 1
@@ -0,0 +1,47 @@
+import pytest
+
+from app.utils import snapshot_store
+from app.utils.snapshot_store import (
+    BaseSnapshot,
+    prune_snapshots,
+    read_snapshot,
+    snapshot_files,
+    write_snapshot,
+)
+
+TABLES = {"Cities": [{"id": "rec1", "fields": {"id": "city1"}}]}
+
+
+# Test Cases
+@pytest.mark.unit
+class TestSnapshotStore:
+    def test_write_and_read_round_trip(self, tmp_path):
+        path = write_snapshot(BaseSnapshot("appB", 1700000000.0, TABLES), tmp_path)
+
+        assert path.name == "airtable-snapshot-20231114T221320Z.json.gz"
+        assert read_snapshot(path) == BaseSnapshot("appB", 1700000000.0, TABLES)
+
+    def test_prune_keeps_newest_files(self, tmp_path):
+        for fetched_at in (1000.0, 2000.0, 3000.0):
+            write_snapshot(BaseSnapshot("appB", fetched_at, TABLES), tmp_path)
+
+        prune_snapshots(tmp_path, keep=2)
+
+        assert [read_snapshot(p).fetched_at for p in snapshot_files(tmp_path)] == [
+            2000.0,
+            3000.0,
+        ]
+
+    def test_load_latest_seeds_cache_from_newest_file_of_base(self, tmp_path, mocker):
+        seed = mocker.patch.object(snapshot_store.snapshot_cache, "seed")
+        write_snapshot(BaseSnapshot("appB", 1000.0, TABLES), tmp_path)
+        write_snapshot(BaseSnapshot("appOther", 2000.0, {}), tmp_path)
+        (tmp_path / "airtable-snapshot-29991231T000000Z.json.gz").write_bytes(b"x")
+
+        loaded = snapshot_store.load_latest_snapshot(tmp_path, base_id="appB")
+
+        assert loaded.fetched_at == 1000.0
+        seed.assert_called_once_with(TABLES, 1000.0)
+
+    def test_missing_directory_is_a_cold_start(self, tmp_path):
+        assert snapshot_store.load_latest_snapshot(tmp_path / "none", "appB") is None
@@ -0,0 +1,89 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from app.utils.executor import UpstreamExecutor
+from app.utils.telemetry import (
+    FunctionTimings,
+    record_span,
+    span,
+    start_request_timings,
+    timed,
+)
+
+
+@timed
+def fetch_cities():
+    with span("airtable"):
+        return []
+
+
+# Test Cases
+@pytest.mark.unit
+class TestRequestTimings:
+    def test_spans_are_summed_per_name_into_server_timing(self):
+        def request():
+            timings = start_request_timings()
+            record_span("airtable", 1.5)
+            record_span("airtable", 2.5)
+            record_span("f.<locals>.g", 1)
+            return timings.server_timing()
+
+        header = contextvars.copy_context().run(request)
+
+        assert header == 'airtable;dur=4.00;desc="2 calls", f._locals_.g;dur=1.00'
+
+    def test_spans_of_executor_threads_and_tasks_reach_the_request(self):
+        executor = UpstreamExecutor(max_workers=2)
+
+        async def request():
+            timings = start_request_timings()
+            await asyncio.gather(asyncio.to_thread(fetch_cities), asyncio.sleep(0))
+            executor.submit(fetch_cities).result()
+            return timings.server_timing()
+
+        header = asyncio.run(request())
+        executor.shutdown()
+
+        assert header.startswith("airtable;dur=")
+        assert "airtable;dur=" in header and 'desc="2 calls"' in header
+        assert "fetch_cities;dur=" in header
+
+    def test_spans_outside_a_request_are_dropped(self):
+        contextvars.Context().run(record_span, "airtable", 1.0)
+
+
+@pytest.mark.unit
+class TestFunctionTimings:
+    def test_percentiles_merge_the_histograms_of_every_thread(self):
+        timings = FunctionTimings()
+        durations = [float(ms) for ms in range(1, 101)]
+
+        def record():
+            for duration in durations:
+                timings.record("list_cities", duration)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = timings.stats()["timings"]["list_cities"]
+
+        assert stats["count"] == 400 and stats["max_ms"] == 100.0
+        assert stats["mean_ms"] == 50.5
+        # Percentiles are bucket bounds, at most one bucket (19%) above.
+        assert 50 <= stats["p50_ms"] <= 50 * 1.19
+        assert 90 <= stats["p90_ms"] <= 90 * 1.19
+        assert 99 <= stats["p99_ms"] <= 100
+
+    def test_reset_starts_a_new_interval(self):
+        timings = FunctionTimings()
+        timings.record("list_cities", 1.0)
+
+        assert timings.stats(reset=True)["timings"]["list_cities"]["count"] == 1
+        timings.record("list_projects", 2.0)
+
+        assert list(timings.stats()["timings"]) == ["list_projects"]